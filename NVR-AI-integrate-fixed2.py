@@ -1,7 +1,6 @@
 import cv2
 import face_recognition
 import sqlite3
-import pickle
 import os
 import yaml
 import threading
@@ -10,8 +9,8 @@ import time
 import traceback
 from datetime import datetime
 import numpy as np
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+
+from face_engine import GalleryManager
 
 # Load config
 def load_config():
@@ -27,31 +26,14 @@ DEBOUNCE_SECONDS = config["debounce_seconds"]
 EVIDENCE_DIR = config["evidence_dir"]
 PROCESS_EVERY_N_FRAMES = config["process_every_n_frames"]
 
-# Load known encodings
-def load_encodings():
-    try:
-        with open(ENCODINGS_FILE, "rb") as f:
-            data = pickle.load(f)
-        print(f"Loaded {len(data)} encodings.")
-        print(f"Known faces: {', '.join(list(data.keys()))}")
-        return data
-    except FileNotFoundError:
-        print("Error: Encodings file not found.")
-        exit(1)
-
-known_faces = load_encodings()
-
-# Watch for changes to encodings
-class EncodingChangeHandler(FileSystemEventHandler):
-    def on_modified(self, event):
-        global known_faces
-        if event.src_path.endswith(ENCODINGS_FILE):
-            print("Encodings file changed. Reloading...")
-            known_faces = load_encodings()
-
-observer = Observer()
-observer.schedule(EncodingChangeHandler(), path=".", recursive=False)
-observer.start()
+# Load known encodings (gallery file or legacy pickle) as a versioned snapshot;
+# the manager reloads it off-thread when the file changes
+gallery_manager = GalleryManager(ENCODINGS_FILE)
+if not gallery_manager.gallery:
+    print("Error: Encodings file not found.")
+    exit(1)
+print(f"Known faces: {', '.join(gallery_manager.gallery.person_names)}")
+gallery_manager.watch()
 
 # Setup database
 conn = sqlite3.connect(DB_FILE, check_same_thread=False)
@@ -270,20 +252,17 @@ def face_recognition_processor():
                         
                         # Get face encodings for each face detected
                         face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+                        gallery = gallery_manager.gallery  # one known-face snapshot for the whole frame
                         
                         for face_encoding, face_location in zip(face_encodings, face_locations):
                             name = "Unknown"
                             min_distance = 1.0
                             
                             # Compare with known faces
-                            if len(known_faces) > 0:
-                                distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
-                                min_distance = min(distances) if len(distances) > 0 else 1.0
-                                matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.6)
-                                
-                                if True in matches:
-                                    index = matches.index(True)
-                                    name = list(known_faces.keys())[index]
+                            if len(gallery) > 0:
+                                match_name, min_distance = gallery.identify([face_encoding], tolerance=0.6)[0]
+                                if match_name is not None:
+                                    name = match_name
                             
                             # Only process recognized faces or include Unknown faces too
                             # if name != "Unknown":  # Uncomment to ignore unknown faces
@@ -388,8 +367,7 @@ try:
 except:
     pass
 
-observer.stop()
-observer.join(timeout=3)
+gallery_manager.stop()
 conn.close()
 cv2.destroyAllWindows()
 print("Shutdown complete.")
@@ -1,7 +1,6 @@
 import cv2
 import face_recognition
 import sqlite3
-import pickle
 import os
 import yaml
 import threading
@@ -10,10 +9,10 @@ import time
 import traceback
 from datetime import datetime
 import numpy as np
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 import shutil
 
+from face_engine import GalleryManager
+
 # Load config
 def load_config():
     with open("config.yaml", "r") as f:
@@ -34,31 +33,14 @@ if not os.path.exists(TEMP_DIR):
     os.makedirs(TEMP_DIR)
     print(f"Created temporary face storage: {TEMP_DIR}")
 
-# Load known encodings
-def load_encodings():
-    try:
-        with open(ENCODINGS_FILE, "rb") as f:
-            data = pickle.load(f)
-        print(f"Loaded {len(data)} encodings.")
-        print(f"Known faces: {', '.join(list(data.keys()))}")
-        return data
-    except FileNotFoundError:
-        print("Error: Encodings file not found.")
-        exit(1)
-
-known_faces = load_encodings()
-
-# Watch for changes to encodings
-class EncodingChangeHandler(FileSystemEventHandler):
-    def on_modified(self, event):
-        global known_faces
-        if event.src_path.endswith(ENCODINGS_FILE):
-            print("Encodings file changed. Reloading...")
-            known_faces = load_encodings()
-
-observer = Observer()
-observer.schedule(EncodingChangeHandler(), path=".", recursive=False)
-observer.start()
+# Load known encodings (gallery file or legacy pickle) as a versioned snapshot;
+# the manager reloads it off-thread when the file changes
+gallery_manager = GalleryManager(ENCODINGS_FILE)
+if not gallery_manager.gallery:
+    print("Error: Encodings file not found.")
+    exit(1)
+print(f"Known faces: {', '.join(gallery_manager.gallery.person_names)}")
+gallery_manager.watch()
 
 # Setup database
 conn = sqlite3.connect(DB_FILE, check_same_thread=False)
@@ -285,19 +267,16 @@ def face_recognition_processor():
                     continue
                 
                 face_encoding = face_encodings[0]
+                gallery = gallery_manager.gallery  # one known-face snapshot for this face
                 
                 # Compare with known faces
                 name = "Unknown"
                 min_distance = 1.0
                 
-                if len(known_faces) > 0:
-                    distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
-                    min_distance = min(distances) if len(distances) > 0 else 1.0
-                    matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.6)
-                    
-                    if True in matches:
-                        index = matches.index(True)
-                        name = list(known_faces.keys())[index]
+                if len(gallery) > 0:
+                    match_name, min_distance = gallery.identify([face_encoding], tolerance=0.6)[0]
+                    if match_name is not None:
+                        name = match_name
                         detected_count += 1
                 
                 # Only process recognized faces or include Unknown faces too
@@ -415,8 +394,7 @@ try:
 except:
     pass
 
-observer.stop()
-observer.join(timeout=3)
+gallery_manager.stop()
 conn.close()
 cv2.destroyAllWindows()
 
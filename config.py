@@ -13,8 +13,29 @@ CROP_HORIZONTAL_REGION_PERCENT = (0.33, 0.66)
 # === System Configuration ===
 # Set to False to run in "headless" mode without displaying camera windows
 SHOW_WINDOWS = True 
-# Model for face detection: 'hog' is faster, 'cnn' is more accurate but CPU-intensive
+# Model for face detection (see face_engine/detectors.py):
+#   'hog'   - dlib HOG, the default
+#   'cnn'   - dlib CNN, more accurate but CPU-intensive
+#   'haar'  - OpenCV Haar cascade, fastest, more false positives
+#   'yunet' - OpenCV DNN YuNet, fast and finds small faces; needs
+#             models/face_detection_yunet_2023mar.onnx (from opencv_zoo)
 FACE_DETECTION_MODEL = "hog" 
+# Training keeps one encoding per photo so pose and lighting variety is not
+# averaged away; set FACE_ENCODINGS_PER_PERSON > 0 to reduce each person's
+# encodings to that many k-means centroids (0 keeps all of them).
+FACE_ENCODINGS_PER_PERSON = 0
+# A person's match distance is the mean over their FACE_MATCH_TOP_K closest
+# encodings (1 = the single closest photo). Run
+# `python -m face_engine.benchmark_multi` to compare the options.
+FACE_MATCH_TOP_K = 1
+# Known-face galleries with at least this many encodings get an IVF index
+# (face_engine/ann.py) so a face only scans a few cells instead of every
+# encoding; FACE_GALLERY_ANN_NPROBE cells are scanned per face (more = higher
+# recall, slower). Below ~50k encodings brute force, which scores all faces
+# of a frame in one matrix product, is as fast or faster at nprobe 16.
+# Run `python -m face_engine.benchmark_ann` to tune.
+FACE_GALLERY_ANN_MIN_SIZE = 50000
+FACE_GALLERY_ANN_NPROBE = 16
 # Process every Nth frame from the central queue to save CPU (increased for RTSP)
 PROCESS_EVERY_N_FRAMES = 15  # Increased from 5 to 15 for better performance
 # Time in seconds to wait before logging the same person again
@@ -23,7 +44,18 @@ DEBOUNCE_SECONDS = 10
 RECONNECT_DELAY_SECONDS = 5
 
 # === File & Directory Paths ===
+# Known-face gallery written by training (face_engine/store.py format); the
+# legacy ENCODINGS_FILE pickle is still read when it does not exist yet.
+# Migrate with `python -m face_engine.migrate_gallery face_encodings.pkl`.
+GALLERY_FILE = "face_gallery.fgal"
 ENCODINGS_FILE = "face_encodings.pkl"
+# Per-photo encodings keyed by photo content hash (face_engine/trainer.py), so
+# training only encodes new or changed photos. Safe to delete (forces a full
+# re-encode on the next training).
+FACE_EMBEDDING_CACHE = "face_embedding_cache.npz"
+# Processes that decode and encode new photos in parallel during training
+# (0 = one per CPU core, 1 = encode in the training thread).
+FACE_TRAINING_WORKERS = 0
 DB_FILE = "tracking.db"
 EVIDENCE_DIR = "evidence"
 
@@ -5,6 +5,8 @@ import pickle
 import os
 import time
 
+from face_engine import FaceGallery
+
 # Load the face encodings
 def load_encodings():
     try:
@@ -12,7 +14,7 @@ def load_encodings():
             data = pickle.load(f)
         print(f"Loaded {len(data)} known faces.")
         print(f"Known names: {list(data.keys())}")
-        return data
+        return FaceGallery.from_dict(data)
     except FileNotFoundError:
         print("Error: Encodings file not found.")
         exit(1)
@@ -45,13 +47,10 @@ if os.path.exists(test_folder):
                 # Check against known faces
                 for face_encoding, face_location in zip(face_encodings, face_locations):
                     if len(known_faces) > 0:
-                        distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
-                        min_distance = min(distances) if len(distances) > 0 else 1.0
-                        matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.6)
+                        match_name, min_distance = known_faces.identify([face_encoding], tolerance=0.6)[0]
                         name = "Unknown"
-                        if True in matches:
-                            index = matches.index(True)
-                            name = list(known_faces.keys())[index]
+                        if match_name is not None:
+                            name = match_name
                         
                         print(f"Match: {name}, Distance: {min_distance:.3f}")
                         
@@ -96,13 +95,10 @@ while True:
         
         for face_encoding, face_location in zip(face_encodings, face_locations):
             if len(known_faces) > 0:
-                distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
-                min_distance = min(distances) if len(distances) > 0 else 1.0
-                matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.6)
+                match_name, min_distance = known_faces.identify([face_encoding], tolerance=0.6)[0]
                 name = "Unknown"
-                if True in matches:
-                    index = matches.index(True)
-                    name = list(known_faces.keys())[index]
+                if match_name is not None:
+                    name = match_name
                 
                 # Scale back the face location
                 top, right, bottom, left = [coord * 4 for coord in face_location]
@@ -26,6 +26,13 @@ How to run
 4. Open the browser at:
    http://127.0.0.1:5001/
 5. Click the ⚙️ icon to configure RTSP cameras
+
+Set UNIFACE_INGEST_BACKEND=process to decode each camera in its own worker
+process (frames are shared through shared memory) instead of a thread.
+
+Worker processes (ingest, face training) are spawned, and spawn re-imports
+this script in each of them: keep importing it free of side effects and of
+heavy model libraries, and do startup work under `if __name__ == "__main__":`.
 """
 
 from __future__ import annotations
@@ -34,9 +41,10 @@ import json
 import queue
 import threading
 import time
+from contextlib import ExitStack, contextmanager, nullcontext
 from datetime import datetime
-from typing import Dict, Generator, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Generator, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 
 import base64
 import io
@@ -45,23 +53,30 @@ import pickle
 import sys
 
 import numpy as np
-import face_recognition
 import cv2
 from flask import Flask, Response, jsonify, render_template, render_template_string, request
 from flask_mail import Mail, Message
 
-from config import ENCODINGS_FILE
+from config import (
+    ENCODINGS_FILE, FACE_DETECTION_MODEL, FACE_EMBEDDING_CACHE, FACE_ENCODINGS_PER_PERSON,
+    FACE_GALLERY_ANN_MIN_SIZE, FACE_GALLERY_ANN_NPROBE, FACE_MATCH_TOP_K, FACE_TRAINING_WORKERS,
+    GALLERY_FILE,
+)
 import socket
 import concurrent.futures
 import uuid
 from datetime import timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 
 app = Flask(__name__)
 
 # Import Person Detection from local package
-from human_detection.realtime_person_detection import UltraFastDetector
-import onnxruntime as ort # Ensure onnxruntime is available
+from human_detection.realtime_person_detection import DetectorPool, int8_model_path
+from human_detection.nms import batched_nms, nms
+from human_detection.sort_tracker import Sort
+from face_engine import GalleryManager, IncrementalTrainer, create_face_detector, save_gallery
+from rtsp_ingest_worker import DecodePacer, MotionDetector, backoff_delay
+import psutil
 
 
 # ---------------------------------------------------------------------------
@@ -74,10 +89,6 @@ KNOWN_FACES_DIR = os.path.join(os.path.dirname(__file__), "known_faces")
 PERSONS_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "persons_config.json")
 ZONES_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "zones_config.json")
 
-# Ensure directories exist
-os.makedirs(SNAPSHOTS_DIR, exist_ok=True)
-os.makedirs(KNOWN_FACES_DIR, exist_ok=True)
-
 
 @dataclass
 class DetectionEvent:
@@ -281,7 +292,8 @@ class PersonManager:
                         "name": folder.replace("_", " "),
                         "authorized": True,  # Default to authorized
                         "photo_count": len(photos),
-                        "trained": os.path.exists(os.path.join(os.path.dirname(__file__), "face_encodings.pkl")),
+                        "trained": any(os.path.exists(os.path.join(os.path.dirname(__file__), f))
+                                       for f in (GALLERY_FILE, ENCODINGS_FILE)),
                         "created_at": datetime.now().isoformat()
                     }
         self._save_persons()
@@ -417,6 +429,8 @@ class ModelCameraManager:
     """Manages camera configurations for each detection model."""
     
     MODEL_TYPES = ["unauthorized", "restricted", "ppe", "evacuation", "live_tracking"]
+    # Models that run the person detector and accept a per-camera "input_size"
+    PERSON_MODEL_TYPES = ["evacuation", "live_tracking"]
     
     def __init__(self):
         self._config: Dict[str, dict] = {
@@ -461,7 +475,7 @@ class ModelCameraManager:
     
     def add_camera_to_model(self, model_type: str, camera_id: int, name: str = "", 
                             enabled: bool = True, is_restricted: bool = False,
-                            is_smoking_zone: bool = False) -> dict:
+                            is_smoking_zone: bool = False, input_size: int = None) -> dict:
         """Add a camera configuration to a model."""
         cam_key = str(camera_id)
         
@@ -481,6 +495,8 @@ class ModelCameraManager:
                 config["is_restricted"] = is_restricted
             elif model_type == "evacuation":
                 config["is_evacuation_zone"] = is_smoking_zone # Reuse parameter for compatibility or mapped
+            if input_size is not None and model_type in self.PERSON_MODEL_TYPES:
+                config["input_size"] = int(input_size)
             
             self._config[model_type][cam_key] = config
             self._save_config()
@@ -488,7 +504,8 @@ class ModelCameraManager:
     
     def update_camera_in_model(self, model_type: str, camera_id: int, 
                                name: str = None, enabled: bool = None, 
-                               is_restricted: bool = None, is_smoking_zone: bool = None) -> dict:
+                               is_restricted: bool = None, is_smoking_zone: bool = None,
+                               input_size: int = None) -> dict:
         """Update a camera configuration in a model."""
         cam_key = str(camera_id)
         
@@ -506,6 +523,8 @@ class ModelCameraManager:
                 self._config[model_type][cam_key]["is_restricted"] = is_restricted
             if is_smoking_zone is not None and model_type == "evacuation":
                 self._config[model_type][cam_key]["is_evacuation_zone"] = is_smoking_zone
+            if input_size is not None and model_type in self.PERSON_MODEL_TYPES:
+                self._config[model_type][cam_key]["input_size"] = int(input_size)
             
             self._save_config()
             return self._config[model_type][cam_key]
@@ -540,6 +559,23 @@ class ModelCameraManager:
                 return self._config["restricted"][cam_key].get("is_restricted", False)
             return False
     
+    def get_person_model_size(self, camera_id: Optional[int], model_type: str = "evacuation") -> int:
+        """Person-detector input size configured for a camera (default model size if unset)."""
+        if camera_id is None:
+            return DEFAULT_PERSON_MODEL_SIZE
+        with self._lock:
+            cfg = self._config.get(model_type, {}).get(str(camera_id), {})
+            return int(cfg.get("input_size", DEFAULT_PERSON_MODEL_SIZE))
+    
+    def get_person_model_sizes(self) -> Dict[str, Dict[str, int]]:
+        """Configured person-detector input size per camera for each person model."""
+        with self._lock:
+            return {
+                model_type: {cam_key: int(cfg.get("input_size", DEFAULT_PERSON_MODEL_SIZE))
+                             for cam_key, cfg in self._config[model_type].items()}
+                for model_type in self.PERSON_MODEL_TYPES
+            }
+    
     def get_restricted_cameras(self) -> List[int]:
         """Get list of camera IDs that are marked as restricted."""
         with self._lock:
@@ -693,13 +729,282 @@ FRAME_WIDTH = 1280
 FRAME_HEIGHT = 720
 TARGET_FPS = 25
 JPEG_QUALITY = 85
-RECONNECT_DELAY = 3  # seconds
+RECONNECT_DELAY = 3  # seconds, first retry delay (doubles per consecutive failure)
+RECONNECT_MAX_DELAY = 60.0   # cap of the reconnect backoff
+RECONNECT_JITTER = 0.3       # +/- fraction so cameras don't retry in lockstep after an NVR reboot
+MAX_CONCURRENT_CONNECTS = 2  # simultaneous capture opens across all cameras
+# Longest a capture open may block (OpenCV's FFMPEG default is 30 s). Kept below
+# the 3 s an ingest worker gets to exit in ProcessRTSPStream.stop(), so a worker
+# is never killed while it holds a connect slot.
+CAPTURE_OPEN_TIMEOUT = 2.0
+HEALTH_HISTORY_SIZE = 20     # connection events kept per camera
 BUFFER_SIZE = 2  # frames to buffer
+FRAME_RING_SLOTS = 4  # preallocated decode buffers per camera
+# Downscaled levels cached per decoded frame; each consumer takes the smallest
+# level at least as wide as it needs (see FramePyramid)
+PYRAMID_WIDTHS = (640, 320)
+FACE_DETECTION_WIDTH = 640    # face detection (FACE_DETECTION_MODEL backend)
+# Faces of detected persons are searched only in the head region of each
+# person box: its top PERSON_HEAD_FRACTION, widened by PERSON_HEAD_MARGIN per side
+PERSON_HEAD_FRACTION = 0.5
+PERSON_HEAD_MARGIN = 0.15
+MIN_FACE_ROI_SIZE = 24        # px on the face detection level; smaller regions are skipped
+PPE_DETECTION_WIDTH = 416     # YOLO hardhat blob size
+
+# Motion gate: every decoded frame gets an activity score from a tiny grayscale
+# thumbnail; detections on a camera without motion reuse their last result.
+MOTION_THUMB_SIZE = (64, 36)
+MOTION_PIXEL_THRESHOLD = 15        # gray-level change counted as a changed pixel
+MOTION_ACTIVITY_THRESHOLD = 0.004  # fraction of changed pixels that counts as motion
+MOTION_BACKGROUND_RATE = 0.05      # running-average background update rate
+MOTION_MAX_REUSE_SECONDS = 60.0    # re-run detection at least this often anyway
+# Only decode (retrieve) packets at the governed rate (see below) or when a consumer has
+# asked for a fresh frame; grab() keeps running either way.
+DECODE_ON_DEMAND = True
+DEMAND_WAIT_TIMEOUT = 0.5  # seconds a consumer waits for a fresh decode
+
+# Frame-rate governor: RTSPStreamManager sets each camera's decode rate from
+# its consumers and scales every camera down while the host CPU is saturated.
+GOVERNOR_INTERVAL = 1.0      # seconds between governor updates
+VIEWER_FPS = TARGET_FPS      # a /video_feed viewer is attached
+DETECTION_FPS = 2.0          # only detection endpoints are polling
+IDLE_FPS = 0.2               # nobody is consuming the camera
+DETECTION_ACTIVE_WINDOW = 10.0  # seconds a fresh-frame request counts as polling
+GOVERNOR_CPU_HIGH = 85.0     # back off above this CPU %
+GOVERNOR_CPU_LOW = 60.0      # recover below this CPU %
+GOVERNOR_BACKOFF = 0.7       # factor multiplier per update while CPU is high
+GOVERNOR_RECOVER = 1.2       # factor multiplier per update while CPU is low
+GOVERNOR_MIN_FACTOR = 0.2
+
+# Ingest backend: "thread" runs every camera in a thread of this process,
+# "process" runs each camera in its own worker process (see rtsp_ingest_worker.py)
+INGEST_BACKEND = os.environ.get("UNIFACE_INGEST_BACKEND", "thread").lower()
+INGEST_MAX_WIDTH = 1920   # shared memory slot size for the process backend
+INGEST_MAX_HEIGHT = 1080
+FFMPEG_CAPTURE_OPTIONS = "rtsp_transport;tcp|buffer_size;1024000"
+# Set once: FFMPEG reads it on every open, and mutating os.environ from several
+# stream threads at once is not safe
+os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = FFMPEG_CAPTURE_OPTIONS
+
+# Dual ingest: when a camera has a "sub_url", the low-res sub-stream is ingested
+# continuously and the main stream is only opened while high-res frames are
+# requested (face recognition, evidence snapshots).
+MAIN_STREAM_HOLD_SECONDS = 10.0   # close the main stream after this much idle time
+# A main-stream frame only stands in for a sub-stream frame decoded at most this
+# far apart (2 frame intervals); requests never wait for the connect itself
+MAIN_STREAM_MAX_SKEW = 2.0 / TARGET_FPS
+# Faces moved onto a main-stream frame are detected again in their box widened
+# by this fraction per side, so a subject that moved in between is still cut right
+HIGH_RES_FACE_PADDING = 0.5
+
+
+def derive_substream_url(url: str) -> Optional[str]:
+    """Derive the sub-stream URL for a main-stream URL (Hikvision / Dahua)."""
+    import re
+    
+    # Hikvision: /Streaming/Channels/101 (main) -> /Streaming/Channels/102 (sub)
+    match = re.search(r"(/Streaming/Channels/\d*?)01(\b|$)", url, re.IGNORECASE)
+    if match:
+        return url[:match.start()] + match.group(1) + "02" + url[match.end():]
+    # Dahua: subtype=0 (main) -> subtype=1 (sub)
+    if "subtype=0" in url:
+        return url.replace("subtype=0", "subtype=1")
+    return None
+
+
+def _create_motion_detector() -> MotionDetector:
+    return MotionDetector(MOTION_THUMB_SIZE, MOTION_PIXEL_THRESHOLD,
+                          MOTION_ACTIVITY_THRESHOLD, MOTION_BACKGROUND_RATE)
+
+
+def _governed_fps(viewers: int, last_demand_time: float, factor: float) -> float:
+    """Decode rate for a camera given its consumers and the governor's load factor."""
+    if viewers > 0:
+        fps = VIEWER_FPS
+    elif time.time() - last_demand_time < DETECTION_ACTIVE_WINDOW:
+        fps = DETECTION_FPS
+    else:
+        fps = IDLE_FPS
+    return fps * factor
 
 # ---------------------------------------------------------------------------
 # RTSP Stream Handler (Threaded)
 # ---------------------------------------------------------------------------
 
+class FrameLease:
+    """
+    A reader's hold on one FrameRing slot: `frame` (read-only view) and its
+    `frame_id` stay valid until release(), the writer never decodes into a
+    leased slot. Use it as a context manager, or release() in a finally.
+    frame is None (frame_id 0) when there was no frame to lease. `timestamp`
+    is the time.time() the frame was decoded.
+    """
+    
+    __slots__ = ("frame", "frame_id", "timestamp", "_release")
+    
+    def __init__(self, frame: Optional[np.ndarray] = None, frame_id: int = 0, timestamp: float = 0.0,
+                 release: Optional[Callable[[], None]] = None):
+        self.frame = frame
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self._release = release
+    
+    def release(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+    
+    def __enter__(self) -> "FrameLease":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class FrameRing:
+    """
+    Preallocated ring of frame buffers shared by one writer and many readers.
+
+    The grab thread decodes straight into the next slot and then publishes it
+    under a new frame id. Readers lease the newest slot (acquire()) and get a
+    read-only view of it plus its frame id without copying, so they can hold
+    the view for the whole inference call; the lease count is kept under the
+    ring lock. A leased slot is never overwritten: the writer gives it up and
+    the decoder allocates a fresh buffer in its place, so readers never see a
+    half-written frame. A view must not be used after its lease is released.
+    """
+
+    def __init__(self, slots: int = FRAME_RING_SLOTS):
+        self._buffers: List[Optional[np.ndarray]] = [None] * slots
+        self._views: List[Optional[np.ndarray]] = [None] * slots
+        self._slot_ids: List[int] = [0] * slots
+        self._slot_times: List[float] = [0.0] * slots
+        self._leases: List[int] = [0] * slots
+        # Bumped when a leased slot is given up, so late releases of its old
+        # buffer do not count against the buffer that replaces it
+        self._generations: List[int] = [0] * slots
+        self._write_idx = 0
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def next_slot(self) -> Optional[np.ndarray]:
+        """Return the buffer the writer should decode into next.
+
+        Returns None until the ring is sized by the first frame, or when a
+        reader still leases the slot; the decoder then allocates a new array
+        which `publish()` adopts as the slot.
+        """
+        idx = (self._write_idx + 1) % len(self._buffers)
+        with self._lock:
+            # Invalidate the slot before it gets overwritten
+            self._slot_ids[idx] = 0
+            if self._leases[idx]:
+                self._leases[idx] = 0
+                self._generations[idx] += 1
+                self._buffers[idx] = None
+                self._views[idx] = None
+            return self._buffers[idx]
+
+    def publish(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """Publish the frame written into the next slot and return its frame id.
+
+        `timestamp` is when the frame was decoded (default: now).
+        """
+        idx = (self._write_idx + 1) % len(self._buffers)
+        with self._lock:
+            if frame is not self._buffers[idx]:
+                # New slot buffer (first frame, leased slot or resolution change)
+                self._buffers[idx] = frame
+                view = frame.view()
+                view.flags.writeable = False
+                self._views[idx] = view
+            self._last_id += 1
+            self._slot_ids[idx] = self._last_id
+            self._slot_times[idx] = time.time() if timestamp is None else timestamp
+            self._write_idx = idx
+            return self._last_id
+
+    def acquire(self) -> FrameLease:
+        """Lease the newest frame (an empty lease before the first frame)."""
+        with self._lock:
+            idx = self._write_idx
+            frame_id = self._slot_ids[idx]
+            if not frame_id:
+                return FrameLease()
+            self._leases[idx] += 1
+            generation = self._generations[idx]
+            return FrameLease(self._views[idx], frame_id, self._slot_times[idx],
+                              lambda: self._release(idx, generation))
+
+    def _release(self, idx: int, generation: int) -> None:
+        with self._lock:
+            if self._generations[idx] == generation and self._leases[idx] > 0:
+                self._leases[idx] -= 1
+
+    def copy_latest(self) -> Tuple[Optional[np.ndarray], int]:
+        """(private copy, frame id) of the newest frame, safe to keep."""
+        with self.acquire() as lease:
+            if lease.frame is None:
+                return None, 0
+            return lease.frame.copy(), lease.frame_id
+
+    def is_current(self, frame_id: int) -> bool:
+        """Check that `frame_id` is still held by the ring."""
+        return frame_id > 0 and frame_id in self._slot_ids
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+
+class FramePyramid:
+    """
+    Downscaled copies of one decoded frame, shared by every consumer of it.
+    
+    Levels (PYRAMID_WIDTHS) are resized once, lazily, from the next larger
+    level and cached with the frame id, so detectors working on the same frame
+    never repeat a resize. All levels are read-only. `timestamp` is when the
+    frame was decoded (0 if unknown, e.g. an uploaded image).
+    """
+    
+    def __init__(self, frame: np.ndarray, frame_id: int = 0, timestamp: float = 0.0):
+        self.full = frame
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self._levels: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+    
+    def level(self, min_width: int) -> np.ndarray:
+        """Smallest level at least `min_width` pixels wide (the full frame if none is)."""
+        full_width = self.full.shape[1]
+        width = full_width
+        for level_width in PYRAMID_WIDTHS:
+            if min_width <= level_width < width:
+                width = level_width
+        if width == full_width:
+            return self.full
+        
+        level = self._levels.get(width)
+        if level is None:
+            with self._lock:
+                level = self._levels.get(width)
+                if level is None:
+                    # Resize from the next larger level that is already built
+                    source = self.full
+                    for built_width, built in self._levels.items():
+                        if width < built_width < source.shape[1]:
+                            source = built
+                    height = max(1, round(self.full.shape[0] * width / full_width))
+                    level = cv2.resize(source, (width, height), interpolation=cv2.INTER_AREA)
+                    level.flags.writeable = False
+                    self._levels[width] = level
+        return level
+    
+    def to_full_scale(self, image: np.ndarray) -> Tuple[float, float]:
+        """(sx, sy) factors mapping coordinates on a level back to the full frame."""
+        return (self.full.shape[1] / image.shape[1], self.full.shape[0] / image.shape[0])
+
+
 @dataclass
 class StreamStats:
     fps: float = 0.0
@@ -707,26 +1012,350 @@ class StreamStats:
     last_frame_time: float = 0.0
     connected: bool = False
     error: Optional[str] = None
+    decode_fps: float = 0.0
+    skipped_count: int = 0
+
+
+def _open_rtsp_capture(url: str, timeout: float = CAPTURE_OPEN_TIMEOUT) -> cv2.VideoCapture:
+    """Open an RTSP URL with FFMPEG (TCP transport), falling back to the default backend."""
+    params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(timeout * 1000)]
+    cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG, params)
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(url, cv2.CAP_ANY, params)
+    return cap
+
+
+@dataclass
+class CameraHealth:
+    """
+    Connection health of one camera, kept by the ReconnectScheduler.
+    
+    Updated from the stream threads and read by the stats API, so every
+    update and to_dict() runs under the record's own lock.
+    """
+    connect_attempts: int = 0
+    consecutive_failures: int = 0
+    total_failures: int = 0
+    disconnects: int = 0
+    last_connect_seconds: float = 0.0   # time the last successful open took
+    connected_since: float = 0.0        # 0 while disconnected
+    total_uptime: float = 0.0           # uptime of earlier (closed) sessions
+    next_retry_time: float = 0.0
+    history: deque = field(default_factory=lambda: deque(maxlen=HEALTH_HISTORY_SIZE))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    def _close_session(self, now: float) -> None:
+        if self.connected_since:
+            self.total_uptime += now - self.connected_since
+            self.connected_since = 0.0
+    
+    def record_connected(self, connect_seconds: float) -> None:
+        with self._lock:
+            now = time.time()
+            self._close_session(now)
+            self.connect_attempts += 1
+            self.consecutive_failures = 0
+            self.last_connect_seconds = connect_seconds
+            self.connected_since = now
+            self.history.append({"time": now, "event": "connected",
+                                 "connect_seconds": round(connect_seconds, 2)})
+    
+    def record_failure(self, reason: str) -> None:
+        with self._lock:
+            now = time.time()
+            self.connect_attempts += 1
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            self._close_session(now)
+            self.history.append({"time": now, "event": "connect_failed", "reason": reason})
+    
+    def record_disconnect(self, reason: str) -> None:
+        with self._lock:
+            now = time.time()
+            self.disconnects += 1
+            self._close_session(now)
+            self.history.append({"time": now, "event": "disconnected", "reason": reason})
+    
+    def schedule_retry(self, base: float, max_delay: float, jitter: float) -> float:
+        """Backoff delay for the next attempt (from consecutive_failures); sets next_retry_time."""
+        with self._lock:
+            delay = backoff_delay(self.consecutive_failures, base, max_delay, jitter)
+            self.next_retry_time = time.time() + delay
+            return delay
+    
+    def to_dict(self) -> dict:
+        with self._lock:
+            return self._to_dict()
+    
+    def _to_dict(self) -> dict:
+        now = time.time()
+        session = now - self.connected_since if self.connected_since else 0.0
+        return {
+            "connect_attempts": self.connect_attempts,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "disconnects": self.disconnects,
+            "last_connect_seconds": round(self.last_connect_seconds, 2),
+            "uptime_seconds": round(session, 1),
+            "total_uptime_seconds": round(self.total_uptime + session, 1),
+            "next_retry_in": round(max(0.0, self.next_retry_time - now), 1),
+            "history": list(self.history),
+        }
+
+
+class ReconnectScheduler:
+    """
+    Central connection policy shared by all camera streams.
+    
+    Caps the number of capture opens in flight (MAX_CONCURRENT_CONNECTS) so a
+    rebooting NVR is not hit by every camera at once, hands out jittered
+    exponential backoff delays and keeps a CameraHealth record per camera.
+    """
+    
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_CONNECTS):
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._process_slots = None
+        self._health: Dict[int, CameraHealth] = {}
+        self._lock = threading.Lock()
+    
+    def health(self, camera_index: int) -> CameraHealth:
+        with self._lock:
+            health = self._health.get(camera_index)
+            if health is None:
+                health = self._health[camera_index] = CameraHealth()
+            return health
+    
+    def process_slots(self):
+        """Connect semaphore shared with ingest worker processes (process backend)."""
+        import multiprocessing
+        
+        with self._lock:
+            if self._process_slots is None:
+                ctx = multiprocessing.get_context("spawn")
+                self._process_slots = ctx.BoundedSemaphore(self.max_concurrent)
+            return self._process_slots
+    
+    @contextmanager
+    def connect_slot(self, should_continue: Callable[[], bool]):
+        """
+        Hold one of the max_concurrent connect slots (the ones shared with the
+        ingest worker processes once the process backend created them).
+        Yields False if should_continue() turned False while waiting.
+        """
+        slots = self._process_slots or self._slots
+        while not slots.acquire(timeout=0.5):
+            if not should_continue():
+                yield False
+                return
+        try:
+            yield True
+        finally:
+            slots.release()
+    
+    def open_capture(self, camera_index: int, url: str,
+                     should_continue: Callable[[], bool]) -> Optional[cv2.VideoCapture]:
+        """Open a capture once a connect slot is free; None if it failed or was cancelled."""
+        health = self.health(camera_index)
+        with self.connect_slot(should_continue) as acquired:
+            if not acquired:
+                return None
+            try:
+                start = time.time()
+                cap = _open_rtsp_capture(url)
+                if cap.isOpened():
+                    health.record_connected(time.time() - start)
+                    return cap
+                cap.release()
+                health.record_failure("Failed to open stream")
+                return None
+            except Exception as e:
+                health.record_failure(str(e))
+                raise
+    
+    def record_disconnect(self, camera_index: int, reason: str) -> None:
+        self.health(camera_index).record_disconnect(reason)
+    
+    def retry_delay(self, camera_index: int) -> float:
+        """Backoff delay before the camera's next connection attempt."""
+        return self.health(camera_index).schedule_retry(RECONNECT_DELAY, RECONNECT_MAX_DELAY,
+                                                        RECONNECT_JITTER)
+
+
+class MainStreamGrabber:
+    """
+    On-demand reader for a camera's high-resolution main stream.
+    
+    The capture is opened in the background on the first request (through
+    the scheduler's connect cap), kept live (grab only) while requests keep
+    coming, decodes a packet only when a frame was requested and is closed
+    again after MAIN_STREAM_HOLD_SECONDS without requests. Requests never
+    wait for the connect: until the stream is open they get no frame.
+    """
+    
+    def __init__(self, camera_index: int, url: str, scheduler: ReconnectScheduler):
+        self.camera_index = camera_index
+        self.url = url
+        self._scheduler = scheduler
+        
+        self._ring = FrameRing(slots=2)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._running = True
+        self._opened = False
+        self._last_request = 0.0
+        self._decode_requested = threading.Event()
+        self._frame_ready = threading.Condition()
+        
+        self.decoded_count = 0
+        self.open_count = 0
+    
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+    
+    def request_decode(self) -> None:
+        """
+        Have the next main-stream packet decoded if the stream is open, without
+        waiting (and without opening it). Called when the sub-stream frame is
+        taken, so the frame get_frame() picks up later was decoded close to it.
+        """
+        if self._opened:
+            self._decode_requested.set()
+    
+    def get_frame(self, near: Optional[float] = None,
+                  max_skew: float = MAIN_STREAM_MAX_SKEW) -> Optional[np.ndarray]:
+        """
+        A copy of a high-res frame decoded within max_skew seconds of `near`
+        (a time.time(), default now), or None. Opens the stream in the
+        background if needed (returns None meanwhile); while it is open, waits
+        at most max_skew for a fresh decode.
+        """
+        now = time.time()
+        near = now if near is None else near
+        self._last_request = now
+        with self._lock:
+            if self._thread is None and self._running:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if not self._opened:
+            return None
+        
+        # A decode requested with request_decode() may already be close enough
+        with self._ring.acquire() as lease:
+            if lease.frame is not None and abs(lease.timestamp - near) <= max_skew:
+                return lease.frame.copy()
+            start_id = lease.frame_id
+        if now - near > max_skew:
+            return None  # anything decoded from now on is too late
+        self._decode_requested.set()
+        with self._frame_ready:
+            self._frame_ready.wait_for(
+                lambda: self._ring.last_id != start_id or not self._running,
+                timeout=max_skew - (now - near)
+            )
+        with self._ring.acquire() as lease:
+            if (lease.frame is not None and lease.frame_id != start_id
+                    and abs(lease.timestamp - near) <= max_skew):
+                return lease.frame.copy()
+        return None
+    
+    def _run(self) -> None:
+        """Keep the main stream open while high-res frames are being requested."""
+        print(f"[RTSP-{self.camera_index}] Opening main stream for high-res frames")
+        self.open_count += 1
+        cap = None
+        failures = 0
+        try:
+            with self._scheduler.connect_slot(lambda: self._running) as acquired:
+                if acquired:
+                    cap = _open_rtsp_capture(self.url)
+            while True:
+                # Decide to exit under the lock, clearing _thread at once: a
+                # get_frame() from then on starts a new reader instead of
+                # waiting for this one, which is about to close
+                with self._lock:
+                    if not (self._running and cap is not None and cap.isOpened() and failures < 10
+                            and time.time() - self._last_request < MAIN_STREAM_HOLD_SECONDS):
+                        self._opened = False
+                        self._thread = None
+                        break
+                    self._opened = True
+                if not cap.grab():
+                    failures += 1
+                    continue
+                failures = 0
+                if not self._decode_requested.is_set():
+                    continue
+                self._decode_requested.clear()
+                
+                slot = self._ring.next_slot()
+                ret, frame = cap.retrieve(slot) if slot is not None else cap.retrieve()
+                if ret and frame is not None:
+                    self._ring.publish(frame)
+                    self.decoded_count += 1
+                    with self._frame_ready:
+                        self._frame_ready.notify_all()
+        except Exception as e:
+            print(f"[RTSP-{self.camera_index}] Main stream error: {e}")
+        finally:
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._opened = False
+                    self._thread = None
+            if cap is not None:
+                cap.release()
+            print(f"[RTSP-{self.camera_index}] Main stream closed")
+    
+    def stop(self) -> None:
+        """Close the main stream."""
+        self._running = False
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        thread = self._thread
+        if thread:
+            thread.join(timeout=2.0)
 
 
 class RTSPStream:
     """Threaded RTSP stream handler for smooth video capture."""
     
-    def __init__(self, camera_index: int, url: str, name: str):
+    def __init__(self, camera_index: int, url: str, name: str, sub_url: Optional[str] = None,
+                 scheduler: Optional[ReconnectScheduler] = None):
         self.camera_index = camera_index
         self.url = url
         self.name = name
+        self.sub_url = sub_url
+        self._scheduler = scheduler or ReconnectScheduler()
+        # Continuously ingested URL (the sub-stream when dual ingest is configured)
+        self.ingest_url = sub_url or url
+        self._main = MainStreamGrabber(camera_index, url, self._scheduler) if sub_url else None
         
         self._cap: Optional[cv2.VideoCapture] = None
-        self._frame: Optional[np.ndarray] = None
-        self._frame_lock = threading.Lock()
+        self._ring = FrameRing()
         self._running = False
         self._thread: Optional[threading.Thread] = None
         
         self.stats = StreamStats()
         self._fps_frames = 0
+        self._fps_decoded = 0
         self._fps_start_time = time.time()
         
+        # Decode-on-demand state
+        self._viewers = 0
+        self._viewers_lock = threading.Lock()
+        self._decode_requested = threading.Event()
+        self._frame_ready = threading.Condition()
+        
+        # Frame-rate governor state (factor is set by RTSPStreamManager)
+        self.fps_factor = 1.0
+        self._last_demand_time = 0.0
+        self._pacer = DecodePacer()
+        
+        self._pyramid: Optional[FramePyramid] = None
+        self._pyramid_lock = threading.Lock()
+        self._motion = _create_motion_detector()
+        
     def _configure_capture(self, cap: cv2.VideoCapture) -> None:
         """Configure capture for optimal RTSP streaming."""
         cap.set(cv2.CAP_PROP_BUFFERSIZE, BUFFER_SIZE)
@@ -744,17 +1373,12 @@ class RTSPStream:
                 except:
                     pass
             
-            print(f"[RTSP-{self.camera_index}] Connecting to {self.url}...")
+            print(f"[RTSP-{self.camera_index}] Connecting to {self.ingest_url}...")
             
-            # Set RTSP transport to TCP for reliability
-            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;tcp|buffer_size;1024000"
+            self._cap = self._scheduler.open_capture(self.camera_index, self.ingest_url,
+                                                     lambda: self._running)
             
-            self._cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG)
-            
-            if not self._cap.isOpened():
-                self._cap = cv2.VideoCapture(self.url)
-            
-            if self._cap.isOpened():
+            if self._cap is not None:
                 self._configure_capture(self._cap)
                 self.stats.connected = True
                 self.stats.error = None
@@ -778,6 +1402,29 @@ class RTSPStream:
         while time.time() < end_time and self._running:
             time.sleep(0.1)  # Check every 100ms
     
+    def _should_decode(self) -> bool:
+        """Decide whether the packet just grabbed needs to be decoded."""
+        if not DECODE_ON_DEMAND:
+            return True
+        if self._ring.last_id == 0:
+            return True  # Always have at least one frame available
+        if self._decode_requested.is_set():
+            return True
+        return self._pacer.due(self.target_fps, time.time())
+    
+    def _update_fps(self, decoded: bool) -> None:
+        """Update grab/decode rate statistics."""
+        self._fps_frames += 1
+        if decoded:
+            self._fps_decoded += 1
+        elapsed = time.time() - self._fps_start_time
+        if elapsed >= 1.0:
+            self.stats.fps = self._fps_frames / elapsed
+            self.stats.decode_fps = self._fps_decoded / elapsed
+            self._fps_frames = 0
+            self._fps_decoded = 0
+            self._fps_start_time = time.time()
+    
     def _grab_frames(self) -> None:
         """Background thread for grabbing frames continuously."""
         consecutive_failures = 0
@@ -786,7 +1433,7 @@ class RTSPStream:
         while self._running:
             if self._cap is None or not self._cap.isOpened():
                 if not self._connect():
-                    self._interruptible_sleep(RECONNECT_DELAY)
+                    self._interruptible_sleep(self._scheduler.retry_delay(self.camera_index))
                     continue
             
             try:
@@ -798,32 +1445,44 @@ class RTSPStream:
                         print(f"[RTSP-{self.camera_index}] Too many failures, reconnecting...")
                         self.stats.connected = False
                         self.stats.error = "Stream disconnected"
+                        self._scheduler.record_disconnect(self.camera_index, "Stream disconnected")
                         if self._cap:
                             self._cap.release()
                         self._cap = None
                         consecutive_failures = 0
-                        self._interruptible_sleep(RECONNECT_DELAY)
+                        self._interruptible_sleep(self._scheduler.retry_delay(self.camera_index))
                     continue
                 
-                ret, frame = self._cap.retrieve()
+                # Keep the connection live, but only decode when someone needs it
+                if not self._should_decode():
+                    consecutive_failures = 0
+                    self.stats.skipped_count += 1
+                    self.stats.connected = True
+                    self._update_fps(decoded=False)
+                    continue
+                self._decode_requested.clear()
+                self._pacer.decoded(self.target_fps, time.time())
+                
+                # Decode straight into the next ring slot (no per-frame allocation)
+                slot = self._ring.next_slot()
+                if slot is not None:
+                    ret, frame = self._cap.retrieve(slot)
+                else:
+                    ret, frame = self._cap.retrieve()
                 
                 if ret and frame is not None:
                     consecutive_failures = 0
                     
-                    with self._frame_lock:
-                        self._frame = frame
+                    self._ring.publish(frame)
+                    self._motion.update(frame, time.time())
+                    with self._frame_ready:
+                        self._frame_ready.notify_all()
                     
                     self.stats.frame_count += 1
                     self.stats.last_frame_time = time.time()
                     self.stats.connected = True
                     self.stats.error = None
-                    
-                    self._fps_frames += 1
-                    elapsed = time.time() - self._fps_start_time
-                    if elapsed >= 1.0:
-                        self.stats.fps = self._fps_frames / elapsed
-                        self._fps_frames = 0
-                        self._fps_start_time = time.time()
+                    self._update_fps(decoded=True)
                 else:
                     consecutive_failures += 1
                     
@@ -848,6 +1507,10 @@ class RTSPStream:
     def stop(self) -> None:
         """Stop the stream capture thread."""
         self._running = False
+        if self.stats.connected:
+            self._scheduler.record_disconnect(self.camera_index, "Stream stopped")
+        if self._main:
+            self._main.stop()
         if self._thread:
             self._thread.join(timeout=2.0)
         if self._cap:
@@ -855,17 +1518,444 @@ class RTSPStream:
             self._cap = None
         print(f"[RTSP-{self.camera_index}] Stream stopped")
     
-    def get_frame(self) -> Optional[np.ndarray]:
-        """Get the latest frame (thread-safe)."""
-        with self._frame_lock:
-            if self._frame is not None:
-                return self._frame.copy()
-        return None
+    def get_frame(self, fresh: bool = True) -> Optional[np.ndarray]:
+        """Get a copy of the latest frame; see lease_frame() for the zero-copy read."""
+        return self.get_frame_with_id(fresh)[0]
+    
+    def get_frame_with_id(self, fresh: bool = True) -> Tuple[Optional[np.ndarray], int]:
+        """Get (copy, frame id) of the latest frame, safe to keep."""
+        with self.lease_frame(fresh) as lease:
+            if lease.frame is None:
+                return None, 0
+            return lease.frame.copy(), lease.frame_id
+    
+    def lease_frame(self, fresh: bool = True) -> FrameLease:
+        """Lease (read-only view, frame id) of the latest frame without copying.
+        
+        Consumers can compare the id with the last one they processed to skip
+        frames they have already seen. With fresh=True (the default for every
+        frame getter) the call asks the grab thread to decode the next packet
+        and waits for it (up to DEMAND_WAIT_TIMEOUT) unless the latest frame is
+        within the camera's governed frame interval. fresh=False only reads
+        the latest published frame (MJPEG viewers, which keep decoding on
+        through add_viewer()). Release the lease when done with the view.
+        """
+        if fresh:
+            self._last_demand_time = time.time()
+            if DECODE_ON_DEMAND and self.stats.connected:
+                if time.time() - self.stats.last_frame_time > 1.0 / self.target_fps:
+                    self.request_frame()
+        return self._ring.acquire()
+    
+    def request_frame(self, timeout: float = DEMAND_WAIT_TIMEOUT) -> bool:
+        """Ask for the next packet to be decoded and wait until it is published."""
+        start_id = self._ring.last_id
+        self._decode_requested.set()
+        with self._frame_ready:
+            return self._frame_ready.wait_for(
+                lambda: self._ring.last_id != start_id or not self._running,
+                timeout=timeout
+            )
+    
+    def get_pyramid(self, fresh: bool = True) -> Optional[FramePyramid]:
+        """Get a FramePyramid of a copy of the latest frame, safe to keep."""
+        with self.lease_frame(fresh) as lease:
+            if lease.frame is None:
+                return None
+            return FramePyramid(lease.frame.copy(), lease.frame_id, lease.timestamp)
+    
+    @contextmanager
+    def lease_pyramid(self, fresh: bool = True) -> Iterator[Optional[FramePyramid]]:
+        """The FramePyramid of the leased latest frame (shared by all consumers of that frame)."""
+        with self.lease_frame(fresh) as lease:
+            if lease.frame is None:
+                yield None
+                return
+            pyramid = self._pyramid
+            if pyramid is None or pyramid.frame_id != lease.frame_id:
+                with self._pyramid_lock:
+                    pyramid = self._pyramid
+                    if pyramid is None or pyramid.frame_id != lease.frame_id:
+                        pyramid = FramePyramid(lease.frame, lease.frame_id, lease.timestamp)
+                        self._pyramid = pyramid
+            yield pyramid
+    
+    def get_high_res_frame(self, near: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        A main-stream frame decoded within MAIN_STREAM_MAX_SKEW of `near` (see
+        MainStreamGrabber.get_frame); None without dual ingest or when there is none.
+        """
+        return self._main.get_frame(near) if self._main is not None else None
+    
+    def request_high_res(self) -> None:
+        """Have the main stream decode its next packet, if it is open (no waiting)."""
+        if self._main is not None:
+            self._main.request_decode()
+    
+    @property
+    def main_stream_active(self) -> bool:
+        return self._main is not None and self._main.active
+    
+    def add_viewer(self) -> None:
+        """Register a continuous consumer (e.g. MJPEG viewer): decode at VIEWER_FPS."""
+        with self._viewers_lock:
+            self._viewers += 1
+    
+    def remove_viewer(self) -> None:
+        """Unregister a continuous consumer."""
+        with self._viewers_lock:
+            self._viewers = max(0, self._viewers - 1)
+    
+    @property
+    def viewer_count(self) -> int:
+        return self._viewers
+    
+    @property
+    def target_fps(self) -> float:
+        """Decode rate the governor currently allows for this camera."""
+        return _governed_fps(self._viewers, self._last_demand_time, self.fps_factor)
+    
+    def set_fps_factor(self, factor: float) -> None:
+        """Apply the governor's load factor."""
+        self.fps_factor = factor
+    
+    @property
+    def activity(self) -> float:
+        """Motion activity score of the latest decoded frame."""
+        return self._motion.activity
+    
+    @property
+    def last_motion_time(self) -> float:
+        return self._motion.last_motion_time
+    
+    def is_frame_current(self, frame_id: int) -> bool:
+        """Check that a frame obtained earlier has not been overwritten yet."""
+        return self._ring.is_current(frame_id)
     
     def is_connected(self) -> bool:
         """Check if stream is connected."""
         return self.stats.connected
 
+class ProcessRTSPStream:
+    """
+    RTSP stream decoded in a separate worker process.
+    
+    Same interface as RTSPStream. The worker publishes decoded frames into
+    shared memory slots; the first consumer of a new frame id copies it into a
+    local FrameRing and every other consumer shares that read-only view.
+    """
+    
+    def __init__(self, camera_index: int, url: str, name: str, sub_url: Optional[str] = None,
+                 scheduler: Optional[ReconnectScheduler] = None):
+        self.camera_index = camera_index
+        self.url = url
+        self.name = name
+        self.sub_url = sub_url
+        self.ingest_url = sub_url or url
+        self._scheduler = scheduler or ReconnectScheduler()
+        # Worker connection counters already recorded in the scheduler's CameraHealth
+        self._seen_attempts = 0
+        self._seen_failures = 0
+        self._seen_disconnects = 0
+        # The main stream is only opened briefly, so it stays in this process
+        self._main = MainStreamGrabber(camera_index, url, self._scheduler) if sub_url else None
+        
+        self._ring = FrameRing()
+        self._shared: Optional["SharedFrameRing"] = None
+        self._shm = None
+        self._process = None
+        self._read_lock = threading.Lock()
+        self._synced_id = 0  # newest shared memory frame id copied locally
+        self._viewers = 0
+        self._viewers_lock = threading.Lock()
+        self._stats = StreamStats()
+        self.fps_factor = 1.0
+        self._last_demand_time = 0.0
+        self._pyramid: Optional[FramePyramid] = None
+        self._pyramid_lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Create the shared memory ring and spawn the worker process."""
+        import multiprocessing
+        from multiprocessing import shared_memory
+        from rtsp_ingest_worker import SharedFrameRing, run_ingest_worker
+        
+        if self._process is not None:
+            return
+        
+        size = SharedFrameRing.required_size(FRAME_RING_SLOTS, INGEST_MAX_HEIGHT, INGEST_MAX_WIDTH)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._shared = SharedFrameRing(self._shm, FRAME_RING_SLOTS, INGEST_MAX_HEIGHT, INGEST_MAX_WIDTH)
+        self._shared.ctrl[:] = 0
+        self._publish_target_fps()
+        
+        settings = {
+            "buffer_size": BUFFER_SIZE,
+            "frame_width": FRAME_WIDTH,
+            "frame_height": FRAME_HEIGHT,
+            "target_fps": TARGET_FPS,
+            "reconnect_delay": RECONNECT_DELAY,
+            "reconnect_max_delay": RECONNECT_MAX_DELAY,
+            "reconnect_jitter": RECONNECT_JITTER,
+            "decode_on_demand": DECODE_ON_DEMAND,
+            "ffmpeg_options": FFMPEG_CAPTURE_OPTIONS,
+            "open_timeout": CAPTURE_OPEN_TIMEOUT,
+            "motion": {
+                "size": MOTION_THUMB_SIZE,
+                "pixel_threshold": MOTION_PIXEL_THRESHOLD,
+                "activity_threshold": MOTION_ACTIVITY_THRESHOLD,
+                "background_rate": MOTION_BACKGROUND_RATE,
+            },
+        }
+        # spawn: workers must not inherit Flask threads or loaded models (the
+        # child re-imports this script, see the module docstring)
+        ctx = multiprocessing.get_context("spawn")
+        self._process = ctx.Process(
+            target=run_ingest_worker,
+            args=(self.camera_index, self.ingest_url, self._shm.name, FRAME_RING_SLOTS,
+                  INGEST_MAX_HEIGHT, INGEST_MAX_WIDTH, settings, self._scheduler.process_slots()),
+            name=f"rtsp-ingest-{self.camera_index}",
+            daemon=True
+        )
+        self._process.start()
+        print(f"[RTSP-{self.camera_index}] Ingest process started (pid {self._process.pid})")
+    
+    def stop(self) -> None:
+        """Stop the worker process and release the shared memory."""
+        from rtsp_ingest_worker import CTRL_CONNECT_SLOT, CTRL_STOP
+        
+        if self._process is None:
+            return
+        if self._main:
+            self._main.stop()
+        self.poll_health()
+        if self.stats.connected:
+            self._scheduler.record_disconnect(self.camera_index, "Stream stopped")
+        self._shared.ctrl[CTRL_STOP] = 1
+        self._process.join(timeout=3.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+            if self._shared.ctrl[CTRL_CONNECT_SLOT]:
+                # Killed while opening: its finally never ran, hand the slot back
+                try:
+                    self._scheduler.process_slots().release()
+                except ValueError:
+                    pass
+        self._process = None
+        
+        self._shared = None
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except Exception as e:
+            print(f"[RTSP-{self.camera_index}] Failed to release shared memory: {e}")
+        self._shm = None
+        print(f"[RTSP-{self.camera_index}] Stream stopped")
+    
+    @property
+    def stats(self) -> StreamStats:
+        """Stream statistics read from the worker's control block."""
+        from rtsp_ingest_worker import (CTRL_CONNECTED, CTRL_DECODE_FPS, CTRL_ERROR, CTRL_FPS,
+                                        CTRL_FRAME_COUNT, CTRL_LAST_FRAME_TIME, CTRL_SKIPPED,
+                                        ERROR_MESSAGES)
+        
+        if self._shared is not None:
+            ctrl = self._shared.ctrl
+            self._stats.connected = bool(ctrl[CTRL_CONNECTED])
+            self._stats.fps = float(ctrl[CTRL_FPS])
+            self._stats.decode_fps = float(ctrl[CTRL_DECODE_FPS])
+            self._stats.frame_count = int(ctrl[CTRL_FRAME_COUNT])
+            self._stats.skipped_count = int(ctrl[CTRL_SKIPPED])
+            self._stats.last_frame_time = float(ctrl[CTRL_LAST_FRAME_TIME])
+            self._stats.error = ERROR_MESSAGES.get(int(ctrl[CTRL_ERROR]))
+        return self._stats
+    
+    def poll_health(self) -> None:
+        """Record the worker's new connection events in the scheduler's CameraHealth."""
+        from rtsp_ingest_worker import (CTRL_CONNECT_ATTEMPTS, CTRL_CONNECT_FAILURES,
+                                        CTRL_CONNECT_SECONDS, CTRL_DISCONNECTS)
+        
+        shared = self._shared
+        if shared is None:
+            return
+        ctrl = shared.ctrl
+        attempts = int(ctrl[CTRL_CONNECT_ATTEMPTS])
+        failures = int(ctrl[CTRL_CONNECT_FAILURES])
+        disconnects = int(ctrl[CTRL_DISCONNECTS])
+        health = self._scheduler.health(self.camera_index)
+        
+        for _ in range(disconnects - self._seen_disconnects):
+            health.record_disconnect("Stream disconnected")
+        for _ in range(failures - self._seen_failures):
+            health.record_failure("Failed to open stream")
+        for _ in range((attempts - self._seen_attempts) - (failures - self._seen_failures)):
+            health.record_connected(float(ctrl[CTRL_CONNECT_SECONDS]))
+        self._seen_attempts, self._seen_failures, self._seen_disconnects = attempts, failures, disconnects
+    
+    def _sync_latest(self) -> None:
+        """Copy the worker's newest frame into the local ring if it is new."""
+        from rtsp_ingest_worker import CTRL_LAST_FRAME_TIME
+        
+        shared = self._shared
+        if shared is None or shared.last_id == self._synced_id:
+            return
+        with self._read_lock:
+            if shared.last_id == self._synced_id:
+                return
+            frame, frame_id = shared.copy_latest(self._ring.next_slot())
+            if frame is not None:
+                # The worker's decode time of its newest frame (this one, or at
+                # worst the one published right after it)
+                self._ring.publish(frame, float(shared.ctrl[CTRL_LAST_FRAME_TIME]) or None)
+                self._synced_id = frame_id
+    
+    def get_frame(self, fresh: bool = True) -> Optional[np.ndarray]:
+        """Get a copy of the latest frame."""
+        return self.get_frame_with_id(fresh)[0]
+    
+    def get_frame_with_id(self, fresh: bool = True) -> Tuple[Optional[np.ndarray], int]:
+        """Get (copy, frame id) of the latest frame, safe to keep."""
+        with self.lease_frame(fresh) as lease:
+            if lease.frame is None:
+                return None, 0
+            return lease.frame.copy(), lease.frame_id
+    
+    def lease_frame(self, fresh: bool = True) -> FrameLease:
+        """Lease (read-only view, frame id) of the latest frame (`fresh` as in RTSPStream)."""
+        if fresh:
+            self._last_demand_time = time.time()
+            self._publish_target_fps()
+            if DECODE_ON_DEMAND and self.stats.connected:
+                if time.time() - self._stats.last_frame_time > 1.0 / self.target_fps:
+                    self.request_frame()
+        self._sync_latest()
+        return self._ring.acquire()
+    
+    def is_frame_current(self, frame_id: int) -> bool:
+        """Check that a frame obtained earlier has not been overwritten yet."""
+        return self._ring.is_current(frame_id)
+    
+    def request_frame(self, timeout: float = DEMAND_WAIT_TIMEOUT) -> bool:
+        """Ask the worker to decode the next packet and wait until it is published."""
+        from rtsp_ingest_worker import CTRL_DEMAND
+        
+        shared = self._shared
+        if shared is None:
+            return False
+        start_id = shared.last_id
+        shared.ctrl[CTRL_DEMAND] = 1
+        end_time = time.time() + timeout
+        while time.time() < end_time:
+            if shared.last_id != start_id:
+                return True
+            time.sleep(0.005)
+        return False
+    
+    def get_pyramid(self, fresh: bool = True) -> Optional[FramePyramid]:
+        """Get a FramePyramid of a copy of the latest frame, safe to keep."""
+        with self.lease_frame(fresh) as lease:
+            if lease.frame is None:
+                return None
+            return FramePyramid(lease.frame.copy(), lease.frame_id, lease.timestamp)
+    
+    @contextmanager
+    def lease_pyramid(self, fresh: bool = True) -> Iterator[Optional[FramePyramid]]:
+        """The FramePyramid of the leased latest frame (shared by all consumers of that frame)."""
+        with self.lease_frame(fresh) as lease:
+            if lease.frame is None:
+                yield None
+                return
+            pyramid = self._pyramid
+            if pyramid is None or pyramid.frame_id != lease.frame_id:
+                with self._pyramid_lock:
+                    pyramid = self._pyramid
+                    if pyramid is None or pyramid.frame_id != lease.frame_id:
+                        pyramid = FramePyramid(lease.frame, lease.frame_id, lease.timestamp)
+                        self._pyramid = pyramid
+            yield pyramid
+    
+    def get_high_res_frame(self, near: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        A main-stream frame decoded within MAIN_STREAM_MAX_SKEW of `near` (see
+        MainStreamGrabber.get_frame); None without dual ingest or when there is none.
+        """
+        return self._main.get_frame(near) if self._main is not None else None
+    
+    def request_high_res(self) -> None:
+        """Have the main stream decode its next packet, if it is open (no waiting)."""
+        if self._main is not None:
+            self._main.request_decode()
+    
+    @property
+    def main_stream_active(self) -> bool:
+        return self._main is not None and self._main.active
+    
+    def add_viewer(self) -> None:
+        """Register a continuous consumer (e.g. MJPEG viewer): decode at VIEWER_FPS."""
+        self._set_viewers(+1)
+    
+    def remove_viewer(self) -> None:
+        """Unregister a continuous consumer."""
+        self._set_viewers(-1)
+    
+    def _set_viewers(self, delta: int) -> None:
+        from rtsp_ingest_worker import CTRL_VIEWERS
+        
+        with self._viewers_lock:
+            self._viewers = max(0, self._viewers + delta)
+            if self._shared is not None:
+                self._shared.ctrl[CTRL_VIEWERS] = self._viewers
+        self._publish_target_fps()
+    
+    @property
+    def viewer_count(self) -> int:
+        return self._viewers
+    
+    @property
+    def target_fps(self) -> float:
+        """Decode rate the governor currently allows for this camera."""
+        return _governed_fps(self._viewers, self._last_demand_time, self.fps_factor)
+    
+    def set_fps_factor(self, factor: float) -> None:
+        """Apply the governor's load factor and pass the new rate to the worker."""
+        self.fps_factor = factor
+        self._publish_target_fps()
+    
+    @property
+    def activity(self) -> float:
+        """Motion activity score of the latest decoded frame (computed by the worker)."""
+        from rtsp_ingest_worker import CTRL_ACTIVITY
+        
+        shared = self._shared
+        return float(shared.ctrl[CTRL_ACTIVITY]) if shared is not None else 0.0
+    
+    @property
+    def last_motion_time(self) -> float:
+        from rtsp_ingest_worker import CTRL_MOTION_TIME
+        
+        shared = self._shared
+        return float(shared.ctrl[CTRL_MOTION_TIME]) if shared is not None else 0.0
+    
+    def _publish_target_fps(self) -> None:
+        from rtsp_ingest_worker import CTRL_TARGET_FPS
+        
+        shared = self._shared
+        if shared is not None:
+            shared.ctrl[CTRL_TARGET_FPS] = self.target_fps
+    
+    def is_connected(self) -> bool:
+        """Check if stream is connected."""
+        return self.stats.connected
+
+
+def _create_stream(camera_index: int, url: str, name: str, sub_url: Optional[str] = None,
+                   scheduler: Optional[ReconnectScheduler] = None):
+    """Create a stream for the configured ingest backend."""
+    if INGEST_BACKEND == "process":
+        return ProcessRTSPStream(camera_index, url, name, sub_url, scheduler)
+    return RTSPStream(camera_index, url, name, sub_url, scheduler)
+
 
 # ---------------------------------------------------------------------------
 # RTSP Stream Manager
@@ -875,10 +1965,19 @@ class RTSPStreamManager:
     """Manages multiple RTSP streams with dynamic configuration."""
     
     def __init__(self):
-        self.streams: Dict[int, RTSPStream] = {}
+        self.streams: Dict[int, "RTSPStream | ProcessRTSPStream"] = {}
         self._initialized = False
         self._lock = threading.Lock()
         
+        # Shared connection policy (backoff, concurrent opens, health history)
+        self.reconnect = ReconnectScheduler()
+        
+        # Frame-rate governor
+        self.fps_factor = 1.0
+        self.cpu_percent = 0.0
+        self._governor_thread: Optional[threading.Thread] = None
+        self._governor_stop = threading.Event()
+        
     def initialize(self) -> None:
         """Initialize all configured RTSP streams."""
         with self._lock:
@@ -887,15 +1986,57 @@ class RTSPStreamManager:
             
             for cam_idx, cam_info in RTSP_CAMERAS.items():
                 if cam_info.get('enabled', True):
-                    stream = RTSPStream(cam_idx, cam_info['url'], cam_info['name'])
+                    stream = _create_stream(cam_idx, cam_info['url'], cam_info['name'],
+                                            cam_info.get('sub_url'), self.reconnect)
                     self.streams[cam_idx] = stream
                     stream.start()
                 
             self._initialized = True
-            print(f"[INFO] Initialized {len(self.streams)} RTSP streams")
+            self._start_governor()
+            print(f"[INFO] Initialized {len(self.streams)} RTSP streams ({INGEST_BACKEND} backend)")
+    
+    # -- Frame-rate governor ------------------------------------------------
     
-    def add_camera(self, camera_index: int, url: str, name: str, enabled: bool = True) -> bool:
-        """Add or update a camera."""
+    def _start_governor(self) -> None:
+        if self._governor_thread is not None and self._governor_thread.is_alive():
+            return
+        self._governor_stop.clear()
+        psutil.cpu_percent(interval=None)  # prime the measurement
+        self._governor_thread = threading.Thread(target=self._governor_loop, daemon=True,
+                                                 name="rtsp-governor")
+        self._governor_thread.start()
+    
+    def _governor_loop(self) -> None:
+        """Periodically adapt the load factor and push it to every stream."""
+        while not self._governor_stop.wait(GOVERNOR_INTERVAL):
+            try:
+                self.update_governor()
+                # Worker processes report connection events through shared memory
+                for stream in list(self.streams.values()):
+                    if isinstance(stream, ProcessRTSPStream):
+                        stream.poll_health()
+            except Exception as e:
+                print(f"[WARN] Frame-rate governor update failed: {e}")
+    
+    def update_governor(self) -> None:
+        """Back off all cameras while CPU is above GOVERNOR_CPU_HIGH, recover below GOVERNOR_CPU_LOW."""
+        self.cpu_percent = psutil.cpu_percent(interval=None)
+        factor = self.fps_factor
+        if self.cpu_percent > GOVERNOR_CPU_HIGH:
+            factor = max(GOVERNOR_MIN_FACTOR, factor * GOVERNOR_BACKOFF)
+        elif self.cpu_percent < GOVERNOR_CPU_LOW:
+            factor = min(1.0, factor * GOVERNOR_RECOVER)
+        
+        if factor != self.fps_factor:
+            print(f"[INFO] Governor: CPU {self.cpu_percent:.0f}%, frame-rate factor "
+                  f"{self.fps_factor:.2f} -> {factor:.2f}")
+            self.fps_factor = factor
+        for stream in list(self.streams.values()):
+            stream.set_fps_factor(self.fps_factor)
+    
+    def add_camera(self, camera_index: int, url: str, name: str, enabled: bool = True,
+                   sub_url: Optional[str] = None) -> bool:
+        """Add or update a camera (sub_url enables sub/main dual ingest)."""
         global RTSP_CAMERAS
         
         with self._lock:
@@ -910,11 +2051,13 @@ class RTSPStreamManager:
                 "url": url,
                 "enabled": enabled
             }
+            if sub_url:
+                RTSP_CAMERAS[camera_index]["sub_url"] = sub_url
             save_camera_config(RTSP_CAMERAS)
             
             # Start new stream if enabled
             if enabled:
-                stream = RTSPStream(camera_index, url, name)
+                stream = _create_stream(camera_index, url, name, sub_url, self.reconnect)
                 self.streams[camera_index] = stream
                 stream.start()
             
@@ -959,7 +2102,8 @@ class RTSPStreamManager:
             
             if enabled and camera_index not in self.streams:
                 cam_info = RTSP_CAMERAS[camera_index]
-                stream = RTSPStream(camera_index, cam_info['url'], cam_info['name'])
+                stream = _create_stream(camera_index, cam_info['url'], cam_info['name'],
+                                        cam_info.get('sub_url'), self.reconnect)
                 self.streams[camera_index] = stream
                 stream.start()
             elif not enabled and camera_index in self.streams:
@@ -981,29 +2125,70 @@ class RTSPStreamManager:
                 del self.streams[camera_index]
             
             if cam_info.get('enabled', True):
-                stream = RTSPStream(camera_index, cam_info['url'], cam_info['name'])
+                stream = _create_stream(camera_index, cam_info['url'], cam_info['name'],
+                                        cam_info.get('sub_url'), self.reconnect)
                 self.streams[camera_index] = stream
                 stream.start()
             
             return True
     
     def get_frame(self, camera_index: int) -> Optional[np.ndarray]:
-        """Get frame from a specific camera."""
+        """Get a fresh frame (a copy) from a specific camera."""
+        return self.get_frame_with_id(camera_index, fresh=True)[0]
+    
+    def get_frame_with_id(self, camera_index: int, 
+                          fresh: bool = True) -> Tuple[Optional[np.ndarray], int]:
+        """Get (frame copy, frame id) from a specific camera (see RTSPStream.get_frame_with_id)."""
+        with self.lease_frame(camera_index, fresh) as lease:
+            if lease.frame is None:
+                return None, 0
+            return lease.frame.copy(), lease.frame_id
+    
+    def lease_frame(self, camera_index: int, fresh: bool = True) -> FrameLease:
+        """Lease a camera's latest frame without copying (see RTSPStream.lease_frame)."""
+        stream = self._stream_or_fallback(camera_index)
+        return stream.lease_frame(fresh) if stream else FrameLease()
+    
+    def get_pyramid(self, camera_index: int, fresh: bool = True) -> Optional[FramePyramid]:
+        """Get a FramePyramid of a copy of a camera's latest frame."""
+        stream = self._stream_or_fallback(camera_index)
+        return stream.get_pyramid(fresh) if stream else None
+    
+    def lease_pyramid(self, camera_index: int, fresh: bool = True):
+        """Context manager: the shared FramePyramid of a camera's leased latest frame (or None)."""
+        stream = self._stream_or_fallback(camera_index)
+        return stream.lease_pyramid(fresh) if stream else nullcontext(None)
+    
+    def _stream_or_fallback(self, camera_index: int) -> Optional["RTSPStream | ProcessRTSPStream"]:
+        """The camera's stream, or the first available one if it does not exist."""
         self.initialize()
         
         stream = self.streams.get(camera_index)
         if stream:
-            return stream.get_frame()
+            return stream
         
         # Fallback to first available camera
         if camera_index != 0 and self.streams:
             first_key = next(iter(self.streams))
             print(f"[WARN] Camera {camera_index} not found, falling back to camera {first_key}")
-            return self.streams[first_key].get_frame()
-            
+            return self.streams[first_key]
+        
         return None
     
-    def get_stream(self, camera_index: int) -> Optional[RTSPStream]:
+    def get_high_res_frame(self, camera_index: int, near: Optional[float] = None) -> Optional[np.ndarray]:
+        """Get a main-stream frame from a camera decoded near `near` (None if it has none)."""
+        self.initialize()
+        
+        stream = self.streams.get(camera_index)
+        return stream.get_high_res_frame(near) if stream else None
+    
+    def request_high_res(self, camera_index: int) -> None:
+        """Have a camera's open main stream decode its next packet (see MainStreamGrabber.request_decode)."""
+        stream = self.streams.get(camera_index)
+        if stream:
+            stream.request_high_res()
+    
+    def get_stream(self, camera_index: int) -> Optional["RTSPStream | ProcessRTSPStream"]:
         """Get stream object for a camera."""
         self.initialize()
         return self.streams.get(camera_index)
@@ -1015,6 +2200,7 @@ class RTSPStreamManager:
                 stream.stop()
             self.streams.clear()
             self._initialized = False
+        self._governor_stop.set()
     
     def get_all_stats(self) -> Dict[int, dict]:
         """Get stats for all streams."""
@@ -1029,6 +2215,17 @@ class RTSPStreamManager:
                     "connected": stream.stats.connected,
                     "fps": round(stream.stats.fps, 1),
                     "frame_count": stream.stats.frame_count,
+                    "decode_fps": round(stream.stats.decode_fps, 1),
+                    "decoded_frames": stream.stats.frame_count,
+                    "skipped_frames": stream.stats.skipped_count,
+                    "viewers": stream.viewer_count,
+                    "target_fps": round(stream.target_fps, 2),
+                    "activity": round(stream.activity, 4),
+                    "governor_factor": round(stream.fps_factor, 2),
+                    "cpu_percent": self.cpu_percent,
+                    "sub_url": cam_info.get('sub_url'),
+                    "main_stream_active": stream.main_stream_active,
+                    "health": self.reconnect.health(cam_idx).to_dict(),
                     "error": stream.stats.error
                 }
             else:
@@ -1039,6 +2236,17 @@ class RTSPStreamManager:
                     "connected": False,
                     "fps": 0,
                     "frame_count": 0,
+                    "decode_fps": 0,
+                    "decoded_frames": 0,
+                    "skipped_frames": 0,
+                    "viewers": 0,
+                    "target_fps": 0,
+                    "activity": 0,
+                    "governor_factor": round(self.fps_factor, 2),
+                    "cpu_percent": self.cpu_percent,
+                    "sub_url": cam_info.get('sub_url'),
+                    "main_stream_active": False,
+                    "health": self.reconnect.health(cam_idx).to_dict(),
                     "error": "Stream not started" if cam_info.get('enabled', True) else "Disabled"
                 }
         return result
@@ -1058,25 +2266,288 @@ def _get_camera_frame(camera_index: int, fallback_to_zero: bool = True) -> Optio
     return frame
 
 
+def _get_camera_frame_hires(camera_index: int, near: Optional[float] = None) -> Optional[np.ndarray]:
+    """Get a high-resolution (main-stream) frame for recognition or evidence decoded near `near`, or None."""
+    return _stream_manager.get_high_res_frame(camera_index, near)
+
+
+def _scale_face_locations(face_locations: List[tuple], sx: float, sy: float) -> List[tuple]:
+    """Scale (top, right, bottom, left) face boxes by the given factors."""
+    return [(int(top * sy), int(right * sx), int(bottom * sy), int(left * sx))
+            for top, right, bottom, left in face_locations]
+
+
+# Face detector backend from config.FACE_DETECTION_MODEL (hog / cnn / haar / yunet)
+_face_detector = None
+_face_detector_lock = threading.Lock()
+
+
+def _get_face_detector():
+    global _face_detector
+    with _face_detector_lock:
+        if _face_detector is None:
+            _face_detector = create_face_detector(FACE_DETECTION_MODEL)
+            print(f"[INFO] Face detector: {_face_detector.name}")
+        return _face_detector
+
+
+def _locate_faces(pyramid: FramePyramid, person_boxes: Optional[list] = None) -> List[tuple]:
+    """
+    Detect faces on the FACE_DETECTION_WIDTH level; boxes in full-frame coordinates.
+    
+    With person_boxes (x1, y1, x2, y2, ... in full-frame coordinates), only the
+    head region of each person is searched; without them, or when the list is
+    empty, the whole frame is.
+    """
+    if not person_boxes:
+        small = pyramid.level(FACE_DETECTION_WIDTH)
+        sx, sy = pyramid.to_full_scale(small)
+        return _scale_face_locations(_get_face_detector().detect(small), sx, sy)
+    
+    regions = []
+    for box in person_boxes:
+        x1, y1, x2, y2 = box[:4]
+        margin = (x2 - x1) * PERSON_HEAD_MARGIN
+        regions.append((x1 - margin, y1, x2 + margin, y1 + (y2 - y1) * PERSON_HEAD_FRACTION))
+    return _locate_faces_in_regions(pyramid, regions)
+
+
+def _locate_faces_in_regions(pyramid: FramePyramid, regions: List[tuple]) -> List[tuple]:
+    """
+    Detect faces inside (left, top, right, bottom) full-frame regions, on the
+    FACE_DETECTION_WIDTH level; boxes in full-frame coordinates.
+    """
+    detector = _get_face_detector()
+    small = pyramid.level(FACE_DETECTION_WIDTH)
+    sx, sy = pyramid.to_full_scale(small)
+    h, w = small.shape[:2]
+    face_locations = []
+    for x1, y1, x2, y2 in regions:
+        left, right = max(0, int(x1 / sx)), min(w, int(x2 / sx))
+        top, bottom = max(0, int(y1 / sy)), min(h, int(y2 / sy))
+        if right - left < MIN_FACE_ROI_SIZE or bottom - top < MIN_FACE_ROI_SIZE:
+            continue
+        
+        roi = np.ascontiguousarray(small[top:bottom, left:right])
+        for f_top, f_right, f_bottom, f_left in detector.detect(roi):
+            face_locations.append((f_top + top, f_right + left, f_bottom + top, f_left + left))
+    
+    # Overlapping regions (e.g. persons' head regions) find the same face: drop duplicates
+    if len(face_locations) > 1:
+        boxes = np.array([(l, t, r, b) for t, r, b, l in face_locations], dtype=np.float32)
+        keep = nms(boxes, boxes[:, 2] - boxes[:, 0], 0.3)
+        face_locations = [face_locations[i] for i in sorted(keep)]
+    return _scale_face_locations(face_locations, sx, sy)
+
+
+def _scale_person_boxes(boxes: np.ndarray, sx: float, sy: float) -> list:
+    """Scale an (N, 5) x1, y1, x2, y2, conf detector array into (x1, y1, x2, y2, conf) tuples."""
+    coords = (boxes[:, :4] * np.array([sx, sy, sx, sy])).astype(np.int32)
+    return list(zip(*coords.T.tolist(), boxes[:, 4].tolist()))
+
+
+def _locate_and_encode_faces(camera_index: Optional[int], pyramid: FramePyramid,
+                             encode: bool = True) -> tuple:
+    """
+    Find faces on a frame and encode them on the camera's main-stream frame.
+    
+    Returns (frame, face_locations, encodings) with locations in the returned
+    frame's coordinates; encodings is empty when `encode` is False.
+    """
+    if camera_index is not None:
+        # An open main stream decodes a frame next to this one while we detect
+        _stream_manager.request_high_res(camera_index)
+    face_locations = _locate_faces(pyramid)
+    if not face_locations:
+        return pyramid.full, face_locations, []
+    
+    # Faces are found on the sub-stream, recognized on the main stream
+    frame, face_locations = _faces_to_high_res(camera_index, pyramid, face_locations)
+    import face_recognition
+    
+    encodings = face_recognition.face_encodings(frame, face_locations) if encode else []
+    if frame is pyramid.full:
+        frame = frame.copy()  # kept by the motion gate after the camera frame's lease ends
+    return frame, face_locations, encodings
+
+
+def _faces_to_high_res(camera_index: Optional[int], pyramid: FramePyramid,
+                       face_locations: List[tuple]) -> tuple:
+    """
+    Move faces found on a (sub-stream) frame onto the camera's main-stream frame.
+    
+    Only a main-stream frame decoded within MAIN_STREAM_MAX_SKEW of the
+    sub-stream frame is used, and the faces are detected again on it inside
+    their scaled boxes widened by HIGH_RES_FACE_PADDING, so the boxes cut
+    the face even if the subject moved in between.
+    
+    Returns (frame, face_locations) in main-stream coordinates, or the
+    sub-stream frame and the input locations when there is no such main-stream
+    frame (no separate main stream, not open yet, too far apart) or the faces
+    are not found on it.
+    """
+    if camera_index is None or not face_locations:
+        return pyramid.full, face_locations
+    hires = _get_camera_frame_hires(camera_index, pyramid.timestamp or None)
+    if hires is None:
+        return pyramid.full, face_locations
+    
+    located = _locate_faces_in_regions(FramePyramid(hires), _high_res_face_regions(face_locations, pyramid.full, hires))
+    if not located:
+        return pyramid.full, face_locations
+    return hires, located
+
+
+def _high_res_face_regions(face_locations: List[tuple], frame: np.ndarray, hires: np.ndarray) -> List[tuple]:
+    """
+    Search regions on `hires` for faces found on `frame`: each box scaled and
+    widened by HIGH_RES_FACE_PADDING per side, as (left, top, right, bottom).
+    """
+    sx = hires.shape[1] / frame.shape[1]
+    sy = hires.shape[0] / frame.shape[0]
+    regions = []
+    for top, right, bottom, left in face_locations:
+        pad_x = (right - left) * HIGH_RES_FACE_PADDING
+        pad_y = (bottom - top) * HIGH_RES_FACE_PADDING
+        regions.append(((left - pad_x) * sx, (top - pad_y) * sy, (right + pad_x) * sx, (bottom + pad_y) * sy))
+    return regions
+
+
+# ---------------------------------------------------------------------------
+# Motion Gate
+# ---------------------------------------------------------------------------
+
+class MotionGate:
+    """
+    Reuses the last detection result of a (camera, model) pair while the
+    camera shows no motion.
+    
+    Detection runs again when the camera's activity score is at or above
+    MOTION_ACTIVITY_THRESHOLD, when motion was seen since the frame the cached
+    result was detected on was decoded, or when that frame is older than
+    MOTION_MAX_REUSE_SECONDS.
+    """
+    
+    def __init__(self):
+        self._results: Dict[Tuple[int, str], Tuple[float, object]] = {}
+        self._counters: Dict[Tuple[int, str], Dict[str, int]] = defaultdict(lambda: {"runs": 0, "reused": 0})
+        self._lock = threading.Lock()
+    
+    def run(self, camera_index: Optional[int], model_type: str, frame_time: float,
+            detect: Callable[[], object]):
+        """
+        Return detect() or the cached result for this camera and model.
+        frame_time is the decode time of the frame detect() works on
+        (FramePyramid.timestamp).
+        """
+        hit, result = self.lookup(camera_index, model_type)
+        if hit:
+            return result
+        result = detect()
+        self.store(camera_index, model_type, result, frame_time)
+        return result
+    
+    def lookup(self, camera_index: Optional[int], model_type: str) -> Tuple[bool, object]:
+        """(True, cached result) if the result can be reused, else (False, None)."""
+        stream = _stream_manager.get_stream(camera_index) if camera_index is not None else None
+        if stream is None:
+            return False, None  # uploaded image or camera fallback: nothing to gate on
+        
+        key = (camera_index, model_type)
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is not None:
+            cached_time, cached_result = cached
+            if (stream.activity < MOTION_ACTIVITY_THRESHOLD
+                    and stream.last_motion_time < cached_time
+                    and time.time() - cached_time < MOTION_MAX_REUSE_SECONDS):
+                with self._lock:
+                    self._counters[key]["reused"] += 1
+                return True, cached_result
+        return False, None
+    
+    def store(self, camera_index: Optional[int], model_type: str, result: object,
+              frame_time: float) -> None:
+        """
+        Cache a fresh result; frame_time is when the frame it was detected on
+        was decoded (not cached when unknown, i.e. 0).
+        """
+        if not frame_time or camera_index is None or _stream_manager.get_stream(camera_index) is None:
+            return
+        key = (camera_index, model_type)
+        with self._lock:
+            self._results[key] = (frame_time, result)
+            self._counters[key]["runs"] += 1
+    
+    def get_stats(self) -> dict:
+        """Run/reuse counters per camera and model, plus totals."""
+        with self._lock:
+            counters = {key: dict(c) for key, c in self._counters.items()}
+        
+        per_camera: Dict[int, dict] = defaultdict(dict)
+        runs = reused = 0
+        for (camera_index, model_type), c in sorted(counters.items()):
+            total = c["runs"] + c["reused"]
+            per_camera[camera_index][model_type] = {
+                **c, "hit_rate": round(c["reused"] / total, 3) if total else 0.0
+            }
+            runs += c["runs"]
+            reused += c["reused"]
+        return {
+            "runs": runs,
+            "reused": reused,
+            "hit_rate": round(reused / (runs + reused), 3) if runs + reused else 0.0,
+            "cameras": dict(per_camera),
+        }
+
+
+_motion_gate = MotionGate()
+
+
 def _generate_camera_stream(camera_index: int) -> Generator[bytes, None, None]:
     """Generate MJPEG stream from RTSP camera."""
     _stream_manager.initialize()
     
+    # Register as a viewer so the stream decodes every frame while we watch
+    stream = _stream_manager.get_stream(camera_index)
+    if stream:
+        stream.add_viewer()
+    try:
+        yield from _mjpeg_frames(camera_index)
+    finally:
+        if stream:
+            stream.remove_viewer()
+
+
+def _mjpeg_frames(camera_index: int) -> Generator[bytes, None, None]:
+    """Encode frames from an RTSP camera as MJPEG parts."""
+    last_frame_id = 0
+    
     while True:
-        frame = _get_camera_frame(camera_index, fallback_to_zero=False)
-        
-        if frame is None:
-            # Send a placeholder frame
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(frame, f"RTSP Camera {camera_index}", (30, 200),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-            cv2.putText(frame, "Connecting...", (30, 240),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (128, 128, 128), 1)
-            cv2.putText(frame, "Please wait or check configuration", (30, 280),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 100, 100), 1)
-        
-        # Encode frame as JPEG
-        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        # Viewers keep the stream decoding (add_viewer), so don't ask for a decode
+        with _stream_manager.lease_frame(camera_index, fresh=False) as lease:
+            frame, frame_id = lease.frame, lease.frame_id
+            if frame is not None and frame_id == last_frame_id:
+                ret = None  # nothing new since the last JPEG
+            else:
+                last_frame_id = frame_id
+                if frame is None:
+                    # Send a placeholder frame
+                    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+                    cv2.putText(frame, f"RTSP Camera {camera_index}", (30, 200),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+                    cv2.putText(frame, "Connecting...", (30, 240),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (128, 128, 128), 1)
+                    cv2.putText(frame, "Please wait or check configuration", (30, 280),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 100, 100), 1)
+                
+                # Encode frame as JPEG (while the camera frame is leased)
+                ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        
+        if ret is None:
+            # Don't re-encode the same frame
+            time.sleep(1.0 / TARGET_FPS)
+            continue
         if ret:
             yield (b'--frame\r\n'
                    b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
@@ -1131,8 +2602,31 @@ def _load_ppe_model() -> bool:
             return False
 
 
-def detect_hardhat(frame: np.ndarray, confidence_threshold: float = 0.5) -> tuple:
-    """Detect hardhat in frame using YOLO model."""
+def _decode_ppe_outputs(outputs: list, confidence_threshold: float,
+                        iou_threshold: float = 0.4) -> tuple:
+    """
+    Decode YOLOv3 PPE outputs into (boxes, class_ids, confidences), with
+    per-class NMS applied; boxes are x1, y1, x2, y2 relative to the input.
+    """
+    detections = np.concatenate([out.reshape(-1, out.shape[-1]) for out in outputs])
+    class_scores = detections[:, 5:]
+    class_ids = class_scores.argmax(axis=1)
+    confidences = class_scores[np.arange(len(class_ids)), class_ids]
+    
+    mask = confidences > confidence_threshold
+    detections, class_ids, confidences = detections[mask], class_ids[mask], confidences[mask]
+    
+    boxes = np.empty((len(detections), 4), dtype=np.float32)
+    boxes[:, :2] = detections[:, :2] - detections[:, 2:4] / 2
+    boxes[:, 2:] = detections[:, :2] + detections[:, 2:4] / 2
+    
+    keep = batched_nms(boxes, confidences, class_ids, iou_threshold)
+    return boxes[keep], class_ids[keep], confidences[keep]
+
+
+def detect_hardhat(frame: np.ndarray, confidence_threshold: float = 0.5,
+                   pyramid: Optional[FramePyramid] = None) -> tuple:
+    """Detect hardhat in frame using YOLO model (on the pyramid level nearest 416)."""
     global _ppe_net, _ppe_output_layers
     
     if _ppe_net is None or _ppe_output_layers is None:
@@ -1143,21 +2637,19 @@ def detect_hardhat(frame: np.ndarray, confidence_threshold: float = 0.5) -> tupl
         return False, 0.0
     
     try:
-        frame_copy = np.ascontiguousarray(frame)
+        if pyramid is None:
+            pyramid = FramePyramid(frame)
+        frame_copy = np.ascontiguousarray(pyramid.level(PPE_DETECTION_WIDTH))
         blob = cv2.dnn.blobFromImage(frame_copy, 1/255.0, (416, 416), (0, 0, 0), swapRB=True, crop=False)
         
         with _ppe_inference_lock:
             _ppe_net.setInput(blob)
             outputs = _ppe_net.forward(_ppe_output_layers)
         
-        for out in outputs:
-            for detection in out:
-                scores = detection[5:]
-                class_id = int(np.argmax(scores))
-                confidence = float(scores[class_id])
-                
-                if class_id == 0 and confidence > confidence_threshold:
-                    return True, float(confidence)
+        _, class_ids, confidences = _decode_ppe_outputs(outputs, confidence_threshold)
+        hardhat = confidences[class_ids == 0]
+        if len(hardhat):
+            return True, float(hardhat.max())
         
         return False, 0.0
     except Exception as e:
@@ -1173,13 +2665,31 @@ def detect_hardhat(frame: np.ndarray, confidence_threshold: float = 0.5) -> tupl
 _tracking_model = None
 _tracking_model_loaded = False
 _tracking_model_lock = threading.Lock()
-_tracking_inference_lock = threading.Lock()
+
+# Exported person-model input sizes (human_detection/weights/model_<size>.onnx).
+# Cameras pick one with an "input_size" key in model_camera_config.json:
+# far-field views need more pixels per person, close-range rooms can go smaller.
+PERSON_MODEL_SIZES = (192, 256, 320, 416)
+DEFAULT_PERSON_MODEL_SIZE = 256
 
 # Path to ONNX model - relative to this file
-TRACKING_MODEL_PATH = os.path.join(os.path.dirname(__file__), "human_detection", "weights", "model_256.onnx")
+PERSON_MODEL_DIR = os.path.join(os.path.dirname(__file__), "human_detection", "weights")
+TRACKING_MODEL_PATH = os.path.join(PERSON_MODEL_DIR, f"model_{DEFAULT_PERSON_MODEL_SIZE}.onnx")
+
+# Loaded detector pools by input size (the default size is _tracking_model)
+_person_detectors: Dict[int, DetectorPool] = {}
+_person_detector_missing: set = set()
+
+# Detector session pool: the CPU budget is split between sessions so several
+# cameras can run inference concurrently. 0 = derive from the core count
+# (cores // 4 sessions, cores // sessions threads each).
+DETECTOR_SESSIONS = int(os.environ.get("UNIFACE_DETECTOR_SESSIONS", "0"))
+DETECTOR_THREADS = int(os.environ.get("UNIFACE_DETECTOR_THREADS", "0"))
+# Use the INT8 model (human_detection/quantize_model.py) instead of FP32
+DETECTOR_INT8 = os.environ.get("UNIFACE_DETECTOR_INT8", "0") == "1"
 
 def _load_tracking_model() -> bool:
-    """Load UltraFastDetector model for person detection."""
+    """Load the pool of UltraFastDetector sessions for person detection."""
     global _tracking_model, _tracking_model_loaded
     
     with _tracking_model_lock:
@@ -1193,7 +2703,8 @@ def _load_tracking_model() -> bool:
                 _tracking_model_loaded = True
                 return False
 
-            _tracking_model = UltraFastDetector(TRACKING_MODEL_PATH, input_size=256, conf=0.5)
+            _tracking_model = _create_detector_pool(TRACKING_MODEL_PATH, DEFAULT_PERSON_MODEL_SIZE)
+            _person_detectors[DEFAULT_PERSON_MODEL_SIZE] = _tracking_model
             _tracking_model_loaded = True
             print(f"[INFO] Person Detection model loaded successfully!")
             return True
@@ -1205,7 +2716,113 @@ def _load_tracking_model() -> bool:
             return False
 
 
-def detect_persons_only(frame: np.ndarray) -> dict:
+def _create_detector_pool(model_path: str, input_size: int) -> DetectorPool:
+    """Detector session pool for one exported model (INT8 variant if enabled and present)."""
+    int8 = DETECTOR_INT8
+    if int8 and not os.path.exists(int8_model_path(model_path)):
+        print(f"[WARN] INT8 model not found at {int8_model_path(model_path)}, using FP32")
+        int8 = False
+    
+    return DetectorPool(
+        model_path, input_size=input_size, conf=0.5,
+        sessions=DETECTOR_SESSIONS or None,
+        threads_per_session=DETECTOR_THREADS or None,
+        int8=int8,
+    )
+
+
+def _get_person_detector(input_size: Optional[int] = None) -> Optional[DetectorPool]:
+    """
+    Detector pool for the given input size, loaded on first use. Falls back to
+    the default model when that size is unknown or was not exported.
+    """
+    if input_size is None or input_size == DEFAULT_PERSON_MODEL_SIZE:
+        return _tracking_model
+    
+    detector = _person_detectors.get(input_size)
+    if detector is not None or input_size in _person_detector_missing:
+        return detector or _tracking_model
+    
+    with _tracking_model_lock:
+        if input_size in _person_detectors:
+            return _person_detectors[input_size]
+        if input_size in _person_detector_missing:
+            return _tracking_model
+        
+        model_path = os.path.join(PERSON_MODEL_DIR, f"model_{input_size}.onnx")
+        if input_size not in PERSON_MODEL_SIZES or not os.path.exists(model_path):
+            print(f"[WARN] No person model for input size {input_size}, "
+                  f"using {DEFAULT_PERSON_MODEL_SIZE}")
+            _person_detector_missing.add(input_size)
+            return _tracking_model
+        
+        try:
+            print(f"[INFO] Loading {input_size}px person detection model...")
+            _person_detectors[input_size] = _create_detector_pool(model_path, input_size)
+            return _person_detectors[input_size]
+        except Exception as e:
+            print(f"[ERROR] Failed to load {input_size}px person model: {e}")
+            _person_detector_missing.add(input_size)
+            return _tracking_model
+
+
+def get_person_detector_stats() -> dict:
+    """Per-size detector pool stats and the input size each camera uses."""
+    return {
+        "pools": {str(size): pool.stats() for size, pool in sorted(_person_detectors.items())},
+        "camera_input_sizes": _model_camera_manager.get_person_model_sizes(),
+        # Configured sizes that fell back to the default model
+        "unavailable_sizes": sorted(_person_detector_missing),
+    }
+
+
+def _detect_persons(frame: np.ndarray, pyramid: Optional[FramePyramid] = None,
+                    input_size: Optional[int] = None) -> list:
+    """Run the person detector on the smallest pyramid level that covers its input size."""
+    detector = _get_person_detector(input_size)
+    if pyramid is None:
+        pyramid = FramePyramid(frame)
+    small = pyramid.level(detector.input_size)
+    
+    # (N, 5) x1, y1, x2, y2, conf in `small` coordinates
+    detections = detector.detect_boxes(small)
+    sx, sy = pyramid.to_full_scale(small)
+    return _scale_person_boxes(detections, sx, sy)
+
+
+def detect_persons_batch(pyramids: List[FramePyramid], input_size: Optional[int] = None) -> List[dict]:
+    """
+    Evacuation System: head count for several cameras with one batched
+    inference call (all on the `input_size` model). Returns one
+    detect_persons_only()-style result per pyramid.
+    """
+    results = [{"person_count": 0, "persons_boxes": []} for _ in pyramids]
+    if not pyramids:
+        return results
+    
+    if _tracking_model is None:
+        if not _load_tracking_model():
+            return results
+    
+    try:
+        detector = _get_person_detector(input_size)
+        smalls = [p.level(detector.input_size) for p in pyramids]
+        batch = detector.detect_boxes_batch(smalls)
+        
+        for result, pyramid, small, detections in zip(results, pyramids, smalls, batch):
+            sx, sy = pyramid.to_full_scale(small)
+            result["persons_boxes"] = _scale_person_boxes(detections, sx, sy)
+            result["person_count"] = len(detections)
+    except Exception as e:
+        print(f"[ERROR] Batched person detection failed: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    return results
+
+
+def detect_persons_only(frame: np.ndarray, pyramid: Optional[FramePyramid] = None,
+                        input_size: Optional[int] = None) -> dict:
     """
     Evacuation System: Detect persons only (no face recognition).
     Fast and reliable for head count per camera.
@@ -1226,9 +2843,7 @@ def detect_persons_only(frame: np.ndarray) -> dict:
             
     try:
         # Detect persons using UltraFastDetector
-        # Returns [(x1,y1,x2,y2,conf), ...]
-        with _tracking_inference_lock:
-            detections = _tracking_model.detect(frame)
+        detections = _detect_persons(frame, pyramid, input_size)
         
         result["person_count"] = len(detections)
         result["persons_boxes"] = detections
@@ -1357,10 +2972,212 @@ def get_person_summary() -> dict:
     return result
 
 
-def detect_and_identify(frame: np.ndarray) -> dict:
+# Identity cache per person track: face recognition runs for new tracks and
+# then only every IDENTITY_REFRESH_SECONDS (UNKNOWN_RETRY_SECONDS while a track
+# has no recognized face yet)
+IDENTITY_REFRESH_SECONDS = 30.0
+UNKNOWN_RETRY_SECONDS = 6.0
+TRACK_MAX_AGE = 3                  # detection runs a track may go unmatched before it is dropped
+FACE_MATCH_TOLERANCE = 0.45
+
+
+class TrackIdentityCache:
+    """
+    SORT tracks over one camera's person boxes with a cached identity per
+    track, so a person standing in view is recognized once instead of on
+    every detection run.
+    """
+    
+    def __init__(self):
+        self.tracker = Sort(max_age=TRACK_MAX_AGE)
+        self.lock = threading.Lock()   # one detection run per camera at a time
+        # track_id -> {"name", "confidence", "face" (bbox relative to the person box), "checked"}
+        self._identities: Dict[int, dict] = {}
+        self._boxes: Dict[int, tuple] = {}
+        self.recognition_runs = 0
+        self.recognition_skipped = 0
+    
+    def update(self, person_boxes: list) -> List[int]:
+        """Assign track ids to this run's person boxes (one id per box)."""
+        track_ids = [int(t) for t in self.tracker.update(person_boxes)]
+        for track_id in self.tracker.expired:
+            self._identities.pop(track_id, None)
+        self._boxes = {t: box[:4] for t, box in zip(track_ids, person_boxes)}
+        return track_ids
+    
+    def needs_recognition(self, now: float) -> bool:
+        """True if any current track is new or its identity is due for a refresh."""
+        for track_id in self._boxes:
+            identity = self._identities.get(track_id)
+            if identity is None:
+                return True
+            refresh = IDENTITY_REFRESH_SECONDS if identity["name"] != "Unknown" else UNKNOWN_RETRY_SECONDS
+            if now - identity["checked"] >= refresh:
+                return True
+        return False
+    
+    def assign_faces(self, faces: List[dict], now: float) -> None:
+        """Attach recognized faces to the tracks whose person box holds them."""
+        for track_id in self._boxes:
+            identity = self._identities.setdefault(
+                track_id, {"name": "Unknown", "confidence": 0.0, "face": None})
+            identity["checked"] = now
+        
+        for face in faces:
+            left, top, right, bottom = face["bbox"]
+            cx, cy = (left + right) / 2, (top + bottom) / 2
+            # Smallest person box containing the face center
+            owners = [(int((x2 - x1) * (y2 - y1)), t) for t, (x1, y1, x2, y2) in self._boxes.items()
+                      if x1 <= cx <= x2 and y1 <= cy <= y2]
+            if not owners:
+                continue
+            track_id = min(owners)[1]
+            x1, y1, x2, y2 = self._boxes[track_id]
+            w, h = max(x2 - x1, 1), max(y2 - y1, 1)
+            self._identities[track_id].update({
+                "name": face["name"],
+                "confidence": face["confidence"],
+                "face": ((left - x1) / w, (top - y1) / h, (right - x1) / w, (bottom - y1) / h),
+            })
+    
+    def face_details(self) -> List[dict]:
+        """Cached faces of the current tracks, boxes placed on this run's person boxes."""
+        details = []
+        for track_id, (x1, y1, x2, y2) in self._boxes.items():
+            identity = self._identities.get(track_id)
+            if identity is None or identity["face"] is None:
+                continue
+            fl, ft, fr, fb = identity["face"]
+            w, h = x2 - x1, y2 - y1
+            details.append({
+                "name": identity["name"],
+                "confidence": identity["confidence"],
+                "bbox": [int(x1 + fl * w), int(y1 + ft * h), int(x1 + fr * w), int(y1 + fb * h)],
+                "track_id": track_id,
+            })
+        return details
+
+
+_track_identities: Dict[int, TrackIdentityCache] = {}
+_track_identities_lock = threading.Lock()
+
+
+def _get_track_identities(camera_index: int) -> TrackIdentityCache:
+    with _track_identities_lock:
+        cache = _track_identities.get(camera_index)
+        if cache is None:
+            cache = _track_identities[camera_index] = TrackIdentityCache()
+        return cache
+
+
+def get_tracking_stats() -> dict:
+    """Face-recognition runs vs. runs answered from the per-track identity cache."""
+    with _track_identities_lock:
+        caches = dict(_track_identities)
+    return {
+        str(cam): {
+            "active_tracks": len(cache.tracker.tracks),
+            "recognition_runs": cache.recognition_runs,
+            "recognition_skipped": cache.recognition_skipped,
+        }
+        for cam, cache in sorted(caches.items())
+    }
+
+
+def _recognize_faces(frame: np.ndarray, pyramid: FramePyramid,
+                     hires_source: Optional[Callable[[], Optional[np.ndarray]]],
+                     result: dict, person_boxes: Optional[list] = None,
+                     face_locations: Optional[List[tuple]] = None) -> List[dict]:
+    """
+    Find and recognize faces; returns [{"name", "confidence", "bbox"}] with
+    boxes in `frame` coordinates. Sets result["evidence_frame"] when the
+    high-res frame was used. With person_boxes (in `frame` coordinates) faces
+    are only searched in the persons' head regions. face_locations (in `frame`
+    coordinates) are faces already found on `pyramid`: they are not searched
+    for again, only re-detected around their boxes on the high-res frame.
+    """
+    # Known-face snapshot for this frame (the manager is defined later in the file)
+    gallery = _gallery_manager.gallery
+    
+    # Recognize faces on the high-res main stream when available
+    face_pyramid = pyramid
+    if hires_source is not None:
+        hires = hires_source()
+        if hires is not None:
+            face_pyramid = FramePyramid(hires)
+    
+    # Find faces on a downscaled level (the detector is fast enough on CPU there),
+    # encode them on the full-resolution frame
+    if face_locations is None:
+        sx = frame.shape[1] / face_pyramid.full.shape[1]
+        sy = frame.shape[0] / face_pyramid.full.shape[0]
+        if person_boxes:
+            person_boxes = [(x1 / sx, y1 / sy, x2 / sx, y2 / sy) for x1, y1, x2, y2, *_ in person_boxes]
+        face_locations = _locate_faces(face_pyramid, person_boxes=person_boxes)
+    elif face_pyramid is not pyramid:
+        located = _locate_faces_in_regions(face_pyramid, _high_res_face_regions(face_locations, frame, face_pyramid.full))
+        if located:
+            face_locations = located
+        else:
+            face_pyramid = pyramid  # not found there: recognize them where they were found
+    if face_pyramid is not pyramid:
+        result["evidence_frame"] = face_pyramid.full
+    if not face_locations:
+        return []
+    
+    face_frame = face_pyramid.full
+    sx = frame.shape[1] / face_frame.shape[1]
+    sy = frame.shape[0] / face_frame.shape[0]
+    rgb_frame = face_frame[:, :, ::-1]  # BGR to RGB
+    
+    import face_recognition
+    
+    faces = []
+    encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+    display_locations = _scale_face_locations(face_locations, sx, sy)
+    # Match every face of the frame against the gallery in one pass
+    best_indices, best_distances = gallery.match_persons(encodings, FACE_MATCH_TOP_K)
+    for face_loc, best_idx, best_distance in zip(display_locations, best_indices, best_distances):
+        top, right, bottom, left = face_loc
+        name = "Unknown"
+        confidence = 0.0
+        
+        if best_idx >= 0:
+            # Convert distance to confidence (lower distance = higher confidence)
+            confidence = max(0.0, 1.0 - float(best_distance))
+            
+            if best_distance <= FACE_MATCH_TOLERANCE:
+                folder_name = gallery.person_names[best_idx]
+                name = NAME_MAPPING.get(folder_name, folder_name)
+        
+        faces.append({
+            "name": name,
+            "confidence": round(confidence, 2),
+            "bbox": [left, top, right, bottom]
+        })
+    return faces
+
+
+def detect_and_identify(frame: np.ndarray,
+                        hires_source: Optional[Callable[[], Optional[np.ndarray]]] = None,
+                        pyramid: Optional[FramePyramid] = None,
+                        input_size: Optional[int] = None,
+                        camera_index: Optional[int] = None) -> dict:
     """
     Live Tracking System: Detect persons AND identify them using face recognition.
     Returns person count plus identified person names with confidence.
+    
+    hires_source, if given, is called only when persons (or, without persons,
+    faces) are found and returns a main-stream frame of the same scene; faces
+    are then recognized on it and their boxes mapped back to `frame` coordinates.
+    
+    Faces are searched in the head regions of the detected persons; when no
+    person is found, the whole frame is searched instead, so a face the
+    person detector missed is still recognized.
+    
+    With a camera_index, persons are tracked across calls (result["track_ids"],
+    one per person box) and face recognition only runs when a track is new or
+    its cached identity is due for a refresh.
     """
     global _tracking_model
     
@@ -1382,61 +3199,57 @@ def detect_and_identify(frame: np.ndarray) -> dict:
             
     try:
         # Detect persons using UltraFastDetector
-        with _tracking_inference_lock:
-            detections = _tracking_model.detect(frame)
+        if pyramid is None:
+            pyramid = FramePyramid(frame)
+        detections = _detect_persons(frame, pyramid, input_size)
         
         result["person_count"] = len(detections)
         result["persons_boxes"] = detections
         
-        # Only do face recognition if persons are detected
-        if len(detections) > 0:
-            try:
-                # Lazy load known faces (this function is defined later in the file)
-                _load_known_faces()
-                
-                # Find faces in the frame
-                rgb_frame = frame[:, :, ::-1]  # BGR to RGB
-                
-                # Use HOG model for faster face detection on CPU
-                face_locations = face_recognition.face_locations(rgb_frame, model='hog')
-                
+        tracks = _get_track_identities(camera_index) if camera_index is not None else None
+        with (tracks.lock if tracks is not None else nullcontext()):
+            if tracks is not None:
+                result["track_ids"] = tracks.update(detections)
+            
+            # Face recognition in the persons' head regions (when tracking, only
+            # if some track has no fresh identity); full frame if there are none
+            now = time.time()
+            faces = []
+            if len(detections) > 0:
+                if tracks is None or tracks.needs_recognition(now):
+                    try:
+                        faces = _recognize_faces(frame, pyramid, hires_source, result,
+                                                 person_boxes=detections)
+                    except Exception as e:
+                        print(f"[WARN] Face recognition failed (non-critical): {e}")
+                        # Face recognition failure is non-critical - we still have person count
+                    if tracks is not None:
+                        tracks.recognition_runs += 1
+                        tracks.assign_faces(faces, now)
+                else:
+                    tracks.recognition_skipped += 1
+                if tracks is not None:
+                    faces = tracks.face_details()
+            else:
+                # No person found but maybe a face on the (sub-stream) frame, e.g. a
+                # face close to the camera the person detector missed: recognize the
+                # faces found, high-res only now that there is a face
+                face_locations = _locate_faces(pyramid)
                 if face_locations:
-                    encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-                    tolerance = 0.45
-                    
-                    for i, (enc, face_loc) in enumerate(zip(encodings, face_locations)):
-                        top, right, bottom, left = face_loc
-                        name = "Unknown"
-                        confidence = 0.0
-                        
-                        if _known_face_encodings and len(_known_face_encodings) > 0:
-                            distances = face_recognition.face_distance(_known_face_encodings, enc)
-                            best_idx = int(np.argmin(distances))
-                            best_distance = distances[best_idx]
-                            
-                            # Convert distance to confidence (lower distance = higher confidence)
-                            confidence = max(0, 1 - best_distance)
-                            
-                            if best_distance <= tolerance:
-                                folder_name = _known_face_names[best_idx]
-                                name = NAME_MAPPING.get(folder_name, folder_name)
-                        
-                        face_detail = {
-                            "name": name,
-                            "confidence": round(confidence, 2),
-                            "bbox": [left, top, right, bottom]
-                        }
-                        result["face_details"].append(face_detail)
-                        
-                        if name != "Unknown":
-                            if name not in result["identified_persons"]:
-                                result["identified_persons"].append(name)
-                        else:
-                            result["unknown_count"] += 1
-                            
-            except Exception as e:
-                print(f"[WARN] Face recognition failed (non-critical): {e}")
-                # Face recognition failure is non-critical - we still have person count
+                    try:
+                        faces = _recognize_faces(frame, pyramid, hires_source, result,
+                                                 face_locations=face_locations)
+                    except Exception as e:
+                        print(f"[WARN] Face recognition failed (non-critical): {e}")
+        
+        for face_detail in faces:
+            result["face_details"].append(face_detail)
+            name = face_detail["name"]
+            if name != "Unknown":
+                if name not in result["identified_persons"]:
+                    result["identified_persons"].append(name)
+            else:
+                result["unknown_count"] += 1
                         
     except Exception as e:
         print(f"[ERROR] Live tracking detection failed: {e}")
@@ -1457,9 +3270,6 @@ def detect_and_track(frame: np.ndarray) -> dict:
     }
 
 
-# Initialize person logs on module load
-_load_person_logs()
-
 # ---------------------------------------------------------------------------
 # Old Smoking Logic (Removed)
 # ---------------------------------------------------------------------------
@@ -2001,9 +3811,14 @@ def send_smoking_alert_email(detection_type: str = "smoke", frame: np.ndarray |
 # Face Recognition for Unauthorized Person Detection
 # ---------------------------------------------------------------------------
 
-_known_face_encodings: List[np.ndarray] = []
-_known_face_names: List[str] = []
-_faces_loaded = False
+# Versioned known-face gallery: readers take one snapshot per frame, reloads
+# (file change, API, training) build the next version off-thread
+_gallery_manager = GalleryManager(
+    os.path.join(os.path.dirname(__file__), GALLERY_FILE),
+    os.path.join(os.path.dirname(__file__), ENCODINGS_FILE),
+    ann_min_size=FACE_GALLERY_ANN_MIN_SIZE,
+    nprobe=FACE_GALLERY_ANN_NPROBE,
+)
 
 NAME_MAPPING: Dict[str, str] = {
     "Abdelrahman_Ahmed": "Abdelrahman Ahmed",
@@ -2013,74 +3828,10 @@ NAME_MAPPING: Dict[str, str] = {
     "Gamila": "Gamila",
     "Hagar": "Hagar",
     "Mahmoud_Ahmed": "Mahmoud Ahmed",
-    "mohamed_ragab": "Mohamed Ragab",
-    "Obama": "Obama",
-    "yousef": "Yousef",
-}
-
-
-def _load_known_faces() -> None:
-    """Load known faces from the encodings file."""
-    global _faces_loaded, _known_face_encodings, _known_face_names
-    if _faces_loaded:
-        return
-
-    path = os.path.join(os.path.dirname(__file__), ENCODINGS_FILE)
-    if not os.path.exists(path):
-        _faces_loaded = True
-        return
-
-    try:
-        if "numpy._core" not in sys.modules:
-            sys.modules["numpy._core"] = np
-        try:
-            core = np.core
-            if "numpy._core.multiarray" not in sys.modules:
-                sys.modules["numpy._core.multiarray"] = core.multiarray
-        except Exception:
-            pass
-
-        with open(path, "rb") as f:
-            data = pickle.load(f)
-    except Exception:
-        _faces_loaded = True
-        return
-
-    encodings: List[np.ndarray] = []
-    names: List[str] = []
-
-    if isinstance(data, dict) and "encodings" in data and "names" in data:
-        encodings = [np.array(e) for e in data.get("encodings", [])]
-        names = [str(n) for n in data.get("names", [])]
-    elif isinstance(data, dict):
-        for name, value in data.items():
-            arr = np.array(value)
-            if arr.ndim == 1:
-                encodings.append(arr)
-                names.append(str(name))
-            elif arr.ndim == 2:
-                for row in arr:
-                    encodings.append(np.array(row))
-                    names.append(str(name))
-    elif isinstance(data, list):
-        for item in data:
-            try:
-                name, enc = item
-            except Exception:
-                continue
-            arr = np.array(enc)
-            if arr.ndim == 1:
-                encodings.append(arr)
-                names.append(str(name))
-            elif arr.ndim == 2:
-                for row in arr:
-                    encodings.append(np.array(row))
-                    names.append(str(name))
-
-    _known_face_encodings = encodings
-    _known_face_names = names
-    _faces_loaded = True
-    print(f"[INFO] Loaded {len(_known_face_encodings)} known face encodings")
+    "mohamed_ragab": "Mohamed Ragab",
+    "Obama": "Obama",
+    "yousef": "Yousef",
+}
 
 
 def _decode_image_from_request(payload: Dict) -> np.ndarray | None:
@@ -2679,6 +4430,10 @@ CONFIG_PAGE_TEMPLATE = """
                             <label>RTSP URL</label>
                             <input type="text" id="url_${id}" value="${cam.url}">
                         </div>
+                        <div class="form-group">
+                            <label>Sub-stream URL (optional)</label>
+                            <input type="text" id="sub_url_${id}" value="${cam.sub_url || ''}" placeholder="Low-res stream for dashboards/detection">
+                        </div>
                         <div class="camera-actions">
                             <button class="btn btn-success" onclick="updateCamera(${id})">💾 Save</button>
                             <button class="btn ${cam.enabled ? 'btn-warning' : 'btn-success'}" onclick="toggleCamera(${id}, ${!cam.enabled})">
@@ -2711,12 +4466,13 @@ CONFIG_PAGE_TEMPLATE = """
         async function updateCamera(id) {
             const name = document.getElementById(`name_${id}`).value;
             const url = document.getElementById(`url_${id}`).value;
+            const sub_url = document.getElementById(`sub_url_${id}`).value.trim();
             
             try {
                 const response = await fetch('/api/rtsp/cameras', {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ id, name, url, enabled: cameras[id].enabled })
+                    body: JSON.stringify({ id, name, url, sub_url, enabled: cameras[id].enabled })
                 });
                 
                 if (response.ok) {
@@ -4288,6 +6044,17 @@ MANAGEMENT_PAGE_TEMPLATE = '''
             loadPersons();
         }
         
+        function renderTrainLogs(logsDiv, logs) {
+            logsDiv.innerHTML = logs.map(log => {
+                let cls = '';
+                if (log.includes('✓') || log.includes('✅')) cls = 'success';
+                else if (log.includes('✗') || log.includes('❌')) cls = 'error';
+                else if (log.includes('⚠')) cls = 'warning';
+                return `<p class="${cls}">${log}</p>`;
+            }).join('');
+            logsDiv.scrollTop = logsDiv.scrollHeight;
+        }
+        
         async function trainFaces() {
             const btn = document.getElementById('trainBtn');
             const progressDiv = document.getElementById('trainProgress');
@@ -4300,55 +6067,46 @@ MANAGEMENT_PAGE_TEMPLATE = '''
             progressDiv.classList.add('active');
             logsDiv.innerHTML = '';
             
-            // Start progress polling
-            trainingInterval = setInterval(async () => {
-                try {
-                    const res = await fetch('/api/persons/train/progress');
-                    const progress = await res.json();
-                    
-                    progressBar.style.width = progress.percentage + '%';
-                    progressBar.textContent = progress.percentage + '%';
-                    
-                    if (progress.current_person) {
-                        progressStatus.textContent = `Processing: ${progress.current_person} (${progress.photos_done}/${progress.total_photos} photos)`;
-                    }
-                    
-                    // Update logs
-                    if (progress.logs && progress.logs.length > 0) {
-                        logsDiv.innerHTML = progress.logs.map(log => {
-                            let cls = '';
-                            if (log.includes('✓') || log.includes('✅')) cls = 'success';
-                            else if (log.includes('✗') || log.includes('❌')) cls = 'error';
-                            else if (log.includes('⚠')) cls = 'warning';
-                            return `<p class="${cls}">${log}</p>`;
-                        }).join('');
-                        logsDiv.scrollTop = logsDiv.scrollHeight;
-                    }
-                } catch (e) {}
-            }, 500);
-            
             try {
+                // Training runs in the background; the request returns a job id at once
                 const res = await fetch('/api/persons/train', { method: 'POST' });
-                const data = await res.json();
+                const job = await res.json();
+                if (!job.job_id) throw new Error(job.error || 'Could not start training');
+                if (!job.ok) showToast(job.error, true);  // already running: follow that job
                 
-                clearInterval(trainingInterval);
+                // Poll progress until the job is done
+                const data = await new Promise((resolve, reject) => {
+                    trainingInterval = setInterval(async () => {
+                        try {
+                            const res = await fetch('/api/persons/train/progress');
+                            const progress = await res.json();
+                            if (progress.job_id !== job.job_id) return;
+                            
+                            progressBar.style.width = progress.percentage + '%';
+                            progressBar.textContent = progress.percentage + '%';
+                            
+                            if (progress.current_person) {
+                                progressStatus.textContent = `Processing: ${progress.current_person} (${progress.photos_done}/${progress.total_photos} photos)`;
+                            }
+                            
+                            // Update logs
+                            if (progress.logs && progress.logs.length > 0) {
+                                renderTrainLogs(logsDiv, progress.logs);
+                            }
+                            
+                            if (progress.status !== 'running' && progress.result) {
+                                clearInterval(trainingInterval);
+                                resolve(progress.result);
+                            }
+                        } catch (e) {}
+                    }, 500);
+                });
                 
                 if (data.ok) {
                     progressBar.style.width = '100%';
                     progressBar.textContent = '100%';
                     progressStatus.textContent = 'Training complete!';
                     
-                    // Show final logs
-                    if (data.logs) {
-                        logsDiv.innerHTML = data.logs.map(log => {
-                            let cls = '';
-                            if (log.includes('✓') || log.includes('✅')) cls = 'success';
-                            else if (log.includes('✗') || log.includes('❌')) cls = 'error';
-                            else if (log.includes('⚠')) cls = 'warning';
-                            return `<p class="${cls}">${log}</p>`;
-                        }).join('');
-                    }
-                    
                     showToast(`Training complete! ${data.persons_count} persons, ${data.total_faces} faces`);
                     loadPersons();
                 } else {
@@ -4807,8 +6565,18 @@ def api_capture_person_photo(person_id: str) -> Response:
     return jsonify({"ok": False, "error": "Person not found"}), 404
 
 
-# Global training progress
+# Incremental trainer: per-photo encodings cached by content hash
+_face_trainer = IncrementalTrainer(
+    KNOWN_FACES_DIR,
+    os.path.join(os.path.dirname(__file__), FACE_EMBEDDING_CACHE),
+    max_per_person=FACE_ENCODINGS_PER_PERSON,
+    workers=FACE_TRAINING_WORKERS,
+)
+
+# Global training progress (of the current or last training job)
 _training_progress = {
+    "job_id": None,
+    "status": "idle",
     "is_training": False,
     "current_person": "",
     "current_photo": "",
@@ -4817,20 +6585,27 @@ _training_progress = {
     "photos_done": 0,
     "total_photos": 0,
     "logs": [],
-    "percentage": 0
+    "percentage": 0,
+    "result": None
 }
+_training_start_lock = threading.Lock()
 
 
 @app.route("/api/persons/train", methods=["POST"])
 def api_train_faces() -> Response:
-    """Train face encodings from all persons' photos."""
+    """Start training face encodings from all persons' photos in the background."""
     global _training_progress
     
-    try:
-        import pickle
+    with _training_start_lock:
+        if _training_progress["is_training"]:
+            return jsonify({"ok": False, "error": "Training already running",
+                            "job_id": _training_progress["job_id"]}), 409
         
         # Reset progress
+        job_id = uuid.uuid4().hex
         _training_progress = {
+            "job_id": job_id,
+            "status": "running",
             "is_training": True,
             "current_person": "",
             "current_photo": "",
@@ -4839,86 +6614,87 @@ def api_train_faces() -> Response:
             "photos_done": 0,
             "total_photos": 0,
             "logs": [],
-            "percentage": 0
+            "percentage": 0,
+            "result": None
         }
-        
+    
+    threading.Thread(target=_run_training_job, daemon=True, name=f"train-{job_id[:8]}").start()
+    return jsonify({"ok": True, "job_id": job_id, "status": "running",
+                    "progress_url": "/api/persons/train/progress"}), 202
+
+
+def _run_training_job() -> None:
+    """Training job started by api_train_faces; reports into _training_progress."""
+    progress = _training_progress
+    
+    try:
         def log(msg):
-            _training_progress["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
+            progress["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
             print(f"[TRAIN] {msg}")
         
         log("🚀 Starting face recognition training...")
         
-        encodings_dict = {}
-        total_faces = 0
-        failed_photos = []
-        
-        # Get all person folders
-        person_folders = [f for f in os.listdir(KNOWN_FACES_DIR) 
-                         if os.path.isdir(os.path.join(KNOWN_FACES_DIR, f))]
-        _training_progress["total_persons"] = len(person_folders)
-        
-        # Count total photos
-        total_photos = 0
-        for person_id in person_folders:
-            folder_path = os.path.join(KNOWN_FACES_DIR, person_id)
-            photos = [f for f in os.listdir(folder_path) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-            total_photos += len(photos)
-        _training_progress["total_photos"] = total_photos
-        
-        log(f"📊 Found {len(person_folders)} persons with {total_photos} photos")
-        
-        # Iterate through all person folders
-        for person_idx, person_id in enumerate(person_folders):
-            folder_path = os.path.join(KNOWN_FACES_DIR, person_id)
-            _training_progress["current_person"] = person_id
-            _training_progress["persons_done"] = person_idx
-            
-            log(f"👤 Processing: {person_id}")
-            
-            person_encodings = []
-            photos = [f for f in os.listdir(folder_path) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-            
-            for photo_idx, photo in enumerate(photos):
-                photo_path = os.path.join(folder_path, photo)
-                _training_progress["current_photo"] = photo
-                _training_progress["photos_done"] += 1
-                _training_progress["percentage"] = int((_training_progress["photos_done"] / total_photos) * 100)
-                
-                try:
-                    # Load image
-                    image = face_recognition.load_image_file(photo_path)
-                    
-                    # Get face encodings
-                    face_encs = face_recognition.face_encodings(image)
-                    if face_encs:
-                        person_encodings.append(face_encs[0])
-                        total_faces += 1
-                        log(f"   ✓ {photo} - Face detected")
-                    else:
-                        log(f"   ⚠ {photo} - No face found")
-                        failed_photos.append(f"{person_id}/{photo}")
-                except Exception as e:
-                    log(f"   ✗ {photo} - Error: {str(e)[:50]}")
-                    failed_photos.append(f"{person_id}/{photo}")
-                    continue
-            
-            if person_encodings:
-                # Average the encodings for better recognition
-                avg_encoding = np.mean(person_encodings, axis=0)
-                encodings_dict[person_id] = avg_encoding
-                log(f"   ✅ {person_id}: {len(person_encodings)} faces encoded")
+        photos = _face_trainer.scan()
+        total_photos = sum(len(files) for files in photos.values())
+        progress["total_persons"] = len(photos)
+        progress["total_photos"] = total_photos
+        
+        log(f"📊 Found {len(photos)} persons with {total_photos} photos")
+        
+        def on_photo(person_id, photo, status, error):
+            if progress["current_person"] != person_id:
+                progress["current_person"] = person_id
+                log(f"👤 Processing: {person_id}")
+            progress["current_photo"] = photo
+            progress["photos_done"] += 1
+            progress["percentage"] = int((progress["photos_done"] / total_photos) * 100)
+            # Cached photos are not logged one by one, only in the person summary
+            if status == "encoded":
+                log(f"   ✓ {photo} - Face detected")
+            elif status == "no_face":
+                log(f"   ⚠ {photo} - No face found")
+            elif status == "error":
+                log(f"   ✗ {photo} - Error: {str(error)[:50]}")
+        
+        def on_person(person_id, faces, person_photos):
+            progress["persons_done"] += 1
+            if faces:
+                log(f"   ✅ {person_id}: {faces}/{person_photos} photos with a face")
             else:
                 log(f"   ❌ {person_id}: No faces could be encoded!")
         
-        # Save encodings
-        log("💾 Saving encodings to file...")
-        encodings_path = os.path.join(os.path.dirname(__file__), "face_encodings.pkl")
-        with open(encodings_path, 'wb') as f:
-            pickle.dump(encodings_dict, f)
-        
-        # Reset loaded faces to force reload
-        global _faces_loaded
-        _faces_loaded = False
+        # Only new or changed photos are encoded; the rest come from the cache
+        result = _face_trainer.train(on_photo, on_person, photos)
+        encodings_dict = result.encodings
+        log(f"♻ {result.encoded} photos encoded, {result.cached} reused from cache, "
+            f"{result.removed} deleted photos dropped")
+        
+        gallery_path = os.path.join(os.path.dirname(__file__), GALLERY_FILE)
+        # Compare with the served gallery: moved / deleted photos or a new
+        # FACE_ENCODINGS_PER_PERSON change the rows without encoding anything
+        served = _gallery_manager.snapshot
+        additions = result.additions(served.gallery)
+        if additions is None or (not additions and not os.path.exists(gallery_path)):
+            # Save encodings and publish them to the detection threads (index built off-thread)
+            log("💾 Saving encodings to file...")
+            gallery = result.gallery
+            save_gallery(gallery_path, gallery)
+            _gallery_manager.publish(gallery, "training", source=gallery_path)
+        elif additions:
+            # Only new photos: append their rows to the served gallery (and insert
+            # them into its IVF index) instead of rebuilding it
+            log(f"💾 Saving encodings to file ({sum(len(rows) for rows in additions.values())} new)...")
+            gallery = result.gallery
+            save_gallery(gallery_path, gallery)
+            # watch() may load the saved file first: add() then publishes the
+            # full gallery rather than append the rows a second time
+            _gallery_manager.add(
+                np.concatenate(list(additions.values())),
+                [person_id for person_id, rows in additions.items() for _ in rows],
+                "training", source=gallery_path, base_version=served.version, fallback=gallery,
+            )
+        else:
+            log("💾 Gallery is up to date")
         
         # Update trained status for all persons
         for person_id in encodings_dict.keys():
@@ -4927,34 +6703,52 @@ def api_train_faces() -> Response:
                 _person_manager._persons[person_id]["trained"] = True
         _person_manager._save_persons()
         
-        _training_progress["percentage"] = 100
-        _training_progress["is_training"] = False
+        progress["percentage"] = 100
         
-        summary = f"✅ Training complete! {len(encodings_dict)} persons, {total_faces} faces"
-        if failed_photos:
-            summary += f", {len(failed_photos)} photos failed"
+        summary = f"✅ Training complete! {len(encodings_dict)} persons, {result.faces} faces"
+        if result.failed:
+            summary += f", {len(result.failed)} photos failed"
         log(summary)
         
-        return jsonify({
+        progress["result"] = {
             "ok": True,
             "message": summary,
             "persons_count": len(encodings_dict),
-            "total_faces": total_faces,
-            "failed_photos": failed_photos,
-            "logs": _training_progress["logs"]
-        })
+            "total_faces": result.faces,
+            "encoded_photos": result.encoded,
+            "cached_photos": result.cached,
+            "removed_photos": result.removed,
+            "failed_photos": result.failed
+        }
+        progress["status"] = "done"
     except Exception as e:
-        _training_progress["is_training"] = False
-        _training_progress["logs"].append(f"[ERROR] {str(e)}")
-        return jsonify({"ok": False, "error": str(e), "logs": _training_progress["logs"]}), 500
+        progress["logs"].append(f"[ERROR] {str(e)}")
+        progress["result"] = {"ok": False, "error": str(e)}
+        progress["status"] = "failed"
+        print(f"[ERROR] Training job {progress['job_id']} failed: {e}")
+    finally:
+        progress["is_training"] = False
 
 
 @app.route("/api/persons/train/progress", methods=["GET"])
 def api_train_progress() -> Response:
-    """Get current training progress."""
+    """Get the current (or last) training job's progress; "result" is set once it is done."""
     return jsonify(_training_progress)
 
 
+@app.route("/api/persons/gallery", methods=["GET"])
+def api_gallery_stats() -> Response:
+    """Get the known-face gallery version and reload latency."""
+    return jsonify({"ok": True, "gallery": _gallery_manager.stats()})
+
+
+@app.route("/api/persons/gallery/reload", methods=["POST"])
+def api_gallery_reload() -> Response:
+    """Reload the known-face gallery file in the background."""
+    _gallery_manager.reload("api")
+    return jsonify({"ok": True, "version": _gallery_manager.version})
+
+
 # ---------------------------------------------------------------------------
 # Model Camera Configuration API
 # ---------------------------------------------------------------------------
@@ -4976,6 +6770,14 @@ def api_get_model_cameras_by_type(model_type: str) -> Response:
     return jsonify({"ok": True, "model_type": model_type, "cameras": cameras})
 
 
+def _is_person_model_size(value) -> bool:
+    """True if `value` (a number or numeric string) is one of PERSON_MODEL_SIZES."""
+    try:
+        return int(value) in PERSON_MODEL_SIZES
+    except (TypeError, ValueError):
+        return False
+
+
 @app.route("/api/model-cameras/<model_type>", methods=["POST"])
 def api_add_model_camera(model_type: str) -> Response:
     """Add a camera to a model configuration."""
@@ -4987,12 +6789,15 @@ def api_add_model_camera(model_type: str) -> Response:
     name = payload.get("name", "")
     enabled = payload.get("enabled", True)
     is_restricted = payload.get("is_restricted", False)
+    input_size = payload.get("input_size")
     
     if camera_id is None:
         return jsonify({"ok": False, "error": "camera_id is required"}), 400
+    if input_size is not None and not _is_person_model_size(input_size):
+        return jsonify({"ok": False, "error": f"input_size must be one of {list(PERSON_MODEL_SIZES)}"}), 400
     
     config = _model_camera_manager.add_camera_to_model(
-        model_type, int(camera_id), name, enabled, is_restricted
+        model_type, int(camera_id), name, enabled, is_restricted, input_size=input_size
     )
     
     if config:
@@ -5007,13 +6812,17 @@ def api_update_model_camera(model_type: str, camera_id: int) -> Response:
         return jsonify({"ok": False, "error": "Invalid model type"}), 400
     
     payload = request.get_json(silent=True, force=True) or {}
+    input_size = payload.get("input_size")
+    if input_size is not None and not _is_person_model_size(input_size):
+        return jsonify({"ok": False, "error": f"input_size must be one of {list(PERSON_MODEL_SIZES)}"}), 400
     
     config = _model_camera_manager.update_camera_in_model(
         model_type, camera_id,
         name=payload.get("name"),
         enabled=payload.get("enabled"),
         is_restricted=payload.get("is_restricted"),
-        is_smoking_zone=payload.get("is_smoking_zone")
+        is_smoking_zone=payload.get("is_smoking_zone"),
+        input_size=input_size
     )
     
     if config:
@@ -5105,11 +6914,18 @@ def api_rtsp_add_camera() -> Response:
     name = payload.get("name")
     url = payload.get("url")
     enabled = payload.get("enabled", True)
+    sub_url = payload.get("sub_url") or None
     
     if cam_id is None or not name or not url:
         return jsonify({"ok": False, "error": "Missing required fields"}), 400
     
-    success = _stream_manager.add_camera(int(cam_id), url, name, enabled)
+    # "dual_stream": derive the sub-stream from a Hikvision/Dahua main-stream URL
+    if not sub_url and payload.get("dual_stream"):
+        sub_url = derive_substream_url(url)
+        if not sub_url:
+            return jsonify({"ok": False, "error": "Cannot derive sub-stream URL, provide sub_url"}), 400
+    
+    success = _stream_manager.add_camera(int(cam_id), url, name, enabled, sub_url)
     return jsonify({"ok": success})
 
 
@@ -5147,6 +6963,18 @@ def api_rtsp_stats() -> Response:
     return jsonify(_stream_manager.get_all_stats())
 
 
+@app.route("/api/detection/stats")
+def api_detection_stats() -> Response:
+    """Get detection scheduler, motion gate (run vs. reused) and person detector counters."""
+    return jsonify({
+        "scheduler": _detection_scheduler.get_stats(),
+        "motion_gate": _motion_gate.get_stats(),
+        "person_detectors": get_person_detector_stats(),
+        "tracking": get_tracking_stats(),
+        "gallery": _gallery_manager.stats(),
+    })
+
+
 # ---------------------------------------------------------------------------
 # Camera Auto-Discovery
 # ---------------------------------------------------------------------------
@@ -5474,57 +7302,41 @@ def trigger_ppe() -> Response:
 
 
 # ---------------------------------------------------------------------------
-# API endpoints for detection checks
+# Detection checks
 # ---------------------------------------------------------------------------
-
-@app.post("/api/demo/unauthorized/check")
-def api_demo_unauthorized() -> Response:
+# Each _run_*_check takes a camera index (None for an uploaded image), the
+# frame and its pyramid, records analytics events and returns the JSON body
+# of the check endpoint with its HTTP status. They are called by the
+# DetectionScheduler and, when no scheduled result is available, directly by
+# the check endpoints.
+
+def _run_unauthorized_check(camera_index: Optional[int], frame: np.ndarray,
+                            pyramid: FramePyramid) -> Tuple[dict, int]:
     """Check if the captured face is known; unknown = unauthorized."""
-    _load_known_faces()
-
-    payload = request.get_json(silent=True, force=True) or {}
-    
-    camera_index = payload.get("camera_index")
-    if camera_index is not None:
-        frame = None
-        for attempt in range(3):
-            frame = _get_camera_frame(camera_index, fallback_to_zero=True)
-            if frame is not None:
-                break
-            time.sleep(0.5)
-        
-        if frame is None:
-            return jsonify({"ok": False, "error": "camera_not_available"}), 400
-    else:
-        frame = _decode_image_from_request(payload)
-        if frame is None:
-            return jsonify({"ok": False, "error": "invalid_image"}), 400
+    gallery = _gallery_manager.gallery
 
-    face_locations = face_recognition.face_locations(frame)
+    frame, face_locations, encodings = _motion_gate.run(
+        camera_index, "unauthorized", pyramid.timestamp,
+        lambda: _locate_and_encode_faces(camera_index, pyramid)
+    )
     if not face_locations:
-        return jsonify({"ok": True, "unauthorized": True, "reason": "no_face"})
+        return {"ok": True, "unauthorized": True, "reason": "no_face"}, 200
 
-    encodings = face_recognition.face_encodings(frame, face_locations)
-    if not _known_face_encodings:
-        return jsonify({"ok": True, "unauthorized": True, "reason": "no_known_faces"})
+    if not gallery:
+        return {"ok": True, "unauthorized": True, "reason": "no_known_faces"}, 200
 
     tolerance = 0.4
     best_overall = None
 
-    for enc in encodings:
-        matches = face_recognition.compare_faces(_known_face_encodings, enc, tolerance=tolerance)
+    for folder_name, distance in gallery.identify(encodings, tolerance, FACE_MATCH_TOP_K):
         name = "Unknown"
         person_id = None
         confidence = 0.0
 
-        if True in matches and len(_known_face_encodings) > 0:
-            distances = face_recognition.face_distance(_known_face_encodings, enc)
-            best_idx = int(np.argmin(distances))
-            if matches[best_idx]:
-                folder_name = _known_face_names[best_idx]
-                person_id = folder_name  # Store person_id for authorization check
-                name = NAME_MAPPING.get(folder_name, folder_name)
-                confidence = float(max(0.0, 1.0 - float(distances[best_idx])))
+        if folder_name is not None:
+            person_id = folder_name  # Store person_id for authorization check
+            name = NAME_MAPPING.get(folder_name, folder_name)
+            confidence = float(max(0.0, 1.0 - distance))
 
         if best_overall is None or confidence > best_overall["confidence"]:
             best_overall = {"name": name, "person_id": person_id, "confidence": confidence}
@@ -5542,7 +7354,7 @@ def api_demo_unauthorized() -> Response:
             severity="high",
             snapshot=frame
         )
-        return jsonify({"ok": True, "unauthorized": True, "reason": "no_match"})
+        return {"ok": True, "unauthorized": True, "reason": "no_match"}, 200
 
     # Case 2: Person recognized - check if they are AUTHORIZED
     person_id = best_overall.get("person_id")
@@ -5563,67 +7375,46 @@ def api_demo_unauthorized() -> Response:
             severity="critical",
             snapshot=frame
         )
-        return jsonify({
+        return {
             "ok": True,
             "unauthorized": True,
             "reason": "not_authorized",
             "person_name": best_overall["name"],
             "confidence": best_overall["confidence"],
-        })
+        }, 200
 
     # Case 3: Person is recognized AND authorized
-    return jsonify({
+    return {
         "ok": True,
         "unauthorized": False,
         "person_name": best_overall["name"],
         "confidence": best_overall["confidence"],
-    })
+    }, 200
 
 
-@app.post("/api/demo/restricted/check")
-def api_demo_restricted() -> Response:
+def _run_restricted_check(camera_index: Optional[int], frame: np.ndarray,
+                          pyramid: FramePyramid) -> Tuple[dict, int]:
     """Check for person presence in restricted zone with face recognition."""
-    _load_known_faces()  # Ensure known faces are loaded
-    
-    payload = request.get_json(silent=True, force=True) or {}
-    
-    camera_index = payload.get("camera_index")
-    if camera_index is not None:
-        frame = None
-        for attempt in range(3):
-            frame = _get_camera_frame(camera_index, fallback_to_zero=True)
-            if frame is not None:
-                break
-            time.sleep(0.5)
-        
-        if frame is None:
-            return jsonify({"ok": False, "error": "camera_not_available"}), 400
-    else:
-        frame = _decode_image_from_request(payload)
-        if frame is None:
-            return jsonify({"ok": False, "error": "invalid_image"}), 400
+    gallery = _gallery_manager.gallery  # one snapshot for the whole check
 
-    face_locations = face_recognition.face_locations(frame)
+    frame, face_locations, encodings = _motion_gate.run(
+        camera_index, "restricted", pyramid.timestamp,
+        lambda: _locate_and_encode_faces(camera_index, pyramid, encode=bool(gallery))
+    )
     intruder = bool(face_locations)
     
     # Identify detected persons using face recognition
     detected_persons = []
-    if face_locations and _known_face_encodings:
-        encodings = face_recognition.face_encodings(frame, face_locations)
+    if face_locations and gallery:
         tolerance = 0.4
         
-        for enc in encodings:
-            matches = face_recognition.compare_faces(_known_face_encodings, enc, tolerance=tolerance)
+        for folder_name, distance in gallery.identify(encodings, tolerance, FACE_MATCH_TOP_K):
             name = "Unknown"
             confidence = 0.0
             
-            if True in matches:
-                distances = face_recognition.face_distance(_known_face_encodings, enc)
-                best_idx = int(np.argmin(distances))
-                if matches[best_idx]:
-                    folder_name = _known_face_names[best_idx]
-                    name = NAME_MAPPING.get(folder_name, folder_name)
-                    confidence = float(max(0.0, 1.0 - float(distances[best_idx])))
+            if folder_name is not None:
+                name = NAME_MAPPING.get(folder_name, folder_name)
+                confidence = float(max(0.0, 1.0 - distance))
             
             detected_persons.append({
                 "name": name,
@@ -5656,39 +7447,24 @@ def api_demo_restricted() -> Response:
             snapshot=frame
         )
     
-    return jsonify({
+    return {
         "ok": True, 
         "intruder": intruder,
         "persons_count": len(detected_persons),
         "persons": detected_persons
-    })
+    }, 200
 
 
-@app.post("/api/demo/ppe/check")
-def api_demo_ppe_check() -> Response:
+def _run_ppe_check(camera_index: Optional[int], frame: np.ndarray,
+                   pyramid: FramePyramid) -> Tuple[dict, int]:
     """PPE (hardhat) check using YOLO model."""
-    payload = request.get_json(silent=True, force=True) or {}
-    
-    camera_index = payload.get("camera_index")
-    if camera_index is not None:
-        frame = None
-        for attempt in range(3):
-            frame = _get_camera_frame(camera_index, fallback_to_zero=True)
-            if frame is not None:
-                break
-            time.sleep(0.5)
-        
-        if frame is None:
-            return jsonify({"ok": False, "error": "camera_not_available"}), 400
-    else:
-        frame = _decode_image_from_request(payload)
-        if frame is None:
-            return jsonify({"ok": False, "error": "invalid_image"}), 400
-    
     if not _load_ppe_model():
-        return jsonify({"ok": False, "error": "model_not_loaded"}), 500
+        return {"ok": False, "error": "model_not_loaded"}, 500
     
-    hardhat_detected, confidence = detect_hardhat(frame, confidence_threshold=0.3)
+    hardhat_detected, confidence = _motion_gate.run(
+        camera_index, "ppe", pyramid.timestamp,
+        lambda: detect_hardhat(frame, confidence_threshold=0.3, pyramid=pyramid)
+    )
     violation = not hardhat_detected
     
     # Record event if PPE violation detected
@@ -5704,44 +7480,62 @@ def api_demo_ppe_check() -> Response:
             snapshot=frame
         )
     
-    return jsonify({
+    return {
         "ok": True,
         "violation": violation,
         "hardhat_detected": hardhat_detected,
         "confidence": confidence
-    })
+    }, 200
 
 
-@app.post("/api/demo/evacuation/check")
-def api_demo_evacuation_check() -> Response:
+def _run_evacuation_check(camera_index: Optional[int], frame: np.ndarray,
+                          pyramid: FramePyramid) -> Tuple[dict, int]:
     """
     Evacuation System check - Person detection only (head count).
     Fast and reliable for evacuation scenarios.
     """
-    payload = request.get_json(silent=True, force=True) or {}
-    
-    camera_index = payload.get("camera_index")
-    if camera_index is not None:
-        frame = None
-        for attempt in range(3):
-            frame = _get_camera_frame(camera_index, fallback_to_zero=True)
-            if frame is not None:
-                break
-            time.sleep(0.3)
-        
-        if frame is None:
-            return jsonify({"ok": False, "error": "camera_not_available"}), 400
-    else:
-        frame = _decode_image_from_request(payload)
-        if frame is None:
-            return jsonify({"ok": False, "error": "invalid_image"}), 400
-    
     if not _load_tracking_model():
-        return jsonify({"ok": False, "error": "model_not_loaded"}), 500
+        return {"ok": False, "error": "model_not_loaded"}, 500
     
     # Use fast person-only detection (no face recognition)
-    result = detect_persons_only(frame)
-    
+    input_size = _model_camera_manager.get_person_model_size(camera_index, "evacuation")
+    result = _motion_gate.run(camera_index, "evacuation", pyramid.timestamp,
+                              lambda: detect_persons_only(frame, pyramid=pyramid, input_size=input_size))
+    return _evacuation_response(camera_index, result)
+
+
+def _run_evacuation_batch(checks: List[Tuple[int, np.ndarray, FramePyramid]]) -> List[Tuple[dict, int]]:
+    """Evacuation check for several cameras with a single person-detection inference."""
+    if not _load_tracking_model():
+        return [({"ok": False, "error": "model_not_loaded"}, 500)] * len(checks)
+    
+    # Cameras without motion reuse their last result; the rest share one batch
+    results: List[Optional[dict]] = []
+    pending = []
+    for i, (camera_index, frame, pyramid) in enumerate(checks):
+        hit, cached = _motion_gate.lookup(camera_index, "evacuation")
+        results.append(cached if hit else None)
+        if not hit:
+            pending.append(i)
+    
+    # One batch per person-model input size
+    by_size: Dict[int, List[int]] = {}
+    for i in pending:
+        size = _model_camera_manager.get_person_model_size(checks[i][0], "evacuation")
+        by_size.setdefault(size, []).append(i)
+    
+    for size, indices in by_size.items():
+        detections = detect_persons_batch([checks[i][2] for i in indices], input_size=size)
+        for i, result in zip(indices, detections):
+            _motion_gate.store(checks[i][0], "evacuation", result, checks[i][2].timestamp)
+            results[i] = result
+    
+    return [_evacuation_response(camera_index, result)
+            for (camera_index, _, _), result in zip(checks, results)]
+
+
+def _evacuation_response(camera_index: Optional[int], result: dict) -> Tuple[dict, int]:
+    """Record the evacuation event for a head count and build the check response."""
     # Store analytics event if people are detected
     if result["person_count"] > 0:
         cam_id = camera_index if camera_index is not None else 0
@@ -5758,42 +7552,37 @@ def api_demo_evacuation_check() -> Response:
             snapshot=None  # No snapshot for fast evacuation check
         )
     
-    return jsonify({
+    return {
         "ok": True,
         "person_count": result["person_count"],
         "boxes": [[int(b) for b in box[:4]] for box in result.get("persons_boxes", [])]
-    })
+    }, 200
 
 
-@app.post("/api/demo/live-tracking/check")
-def api_demo_live_tracking_check() -> Response:
+def _run_live_tracking_check(camera_index: Optional[int], frame: np.ndarray,
+                             pyramid: FramePyramid) -> Tuple[dict, int]:
     """
     Live Tracking System check - Person detection WITH face recognition.
     Records person logs for analytics.
     """
-    payload = request.get_json(silent=True, force=True) or {}
+    if not _load_tracking_model():
+        return {"ok": False, "error": "model_not_loaded"}, 500
     
-    camera_index = payload.get("camera_index")
+    # Use full detection with face recognition (faces on the main stream if dual ingest)
+    hires_source = None
     if camera_index is not None:
-        frame = None
-        for attempt in range(3):
-            frame = _get_camera_frame(camera_index, fallback_to_zero=True)
-            if frame is not None:
-                break
-            time.sleep(0.3)
-        
-        if frame is None:
-            return jsonify({"ok": False, "error": "camera_not_available"}), 400
-    else:
-        frame = _decode_image_from_request(payload)
-        if frame is None:
-            return jsonify({"ok": False, "error": "invalid_image"}), 400
+        hires_source = lambda: _get_camera_frame_hires(camera_index, pyramid.timestamp or None)
+    input_size = _model_camera_manager.get_person_model_size(camera_index, "live_tracking")
     
-    if not _load_tracking_model():
-        return jsonify({"ok": False, "error": "model_not_loaded"}), 500
+    def detect() -> dict:
+        if camera_index is not None:
+            # An open main stream decodes a frame next to this one while persons are detected
+            _stream_manager.request_high_res(camera_index)
+        return detect_and_identify(frame, hires_source=hires_source, pyramid=pyramid,
+                                   input_size=input_size, camera_index=camera_index)
     
-    # Use full detection with face recognition
-    result = detect_and_identify(frame)
+    result = _motion_gate.run(camera_index, "live_tracking", pyramid.timestamp, detect)
+    evidence_frame = result.get("evidence_frame", frame)
     
     cam_id = camera_index if camera_index is not None else 0
     cam_name = RTSP_CAMERAS.get(cam_id, {}).get("name", f"Camera {cam_id}")
@@ -5806,7 +7595,7 @@ def api_demo_live_tracking_check() -> Response:
             try:
                 filename = f"tracking_{face_detail['name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
                 filepath = os.path.join(SNAPSHOTS_DIR, filename)
-                cv2.imwrite(filepath, frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                cv2.imwrite(filepath, evidence_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
                 snapshot_path = f"/static/snapshots/{filename}"
             except:
                 pass
@@ -5832,17 +7621,303 @@ def api_demo_live_tracking_check() -> Response:
                 "face_details": result["face_details"]
             },
             severity="info",
-            snapshot=frame if result["identified_persons"] else None
+            snapshot=evidence_frame if result["identified_persons"] else None
         )
     
-    return jsonify({
+    return {
         "ok": True,
         "person_count": result["person_count"],
         "identified_persons": result["identified_persons"],
         "unknown_count": result["unknown_count"],
         "face_details": result["face_details"],
-        "boxes": [[int(b) for b in box[:4]] for box in result.get("persons_boxes", [])]
-    })
+        "boxes": [[int(b) for b in box[:4]] for box in result.get("persons_boxes", [])],
+        "track_ids": result.get("track_ids", [])
+    }, 200
+
+
+_CHECK_FUNCTIONS: Dict[str, Callable[[Optional[int], np.ndarray, FramePyramid], Tuple[dict, int]]] = {
+    "unauthorized": _run_unauthorized_check,
+    "restricted": _run_restricted_check,
+    "ppe": _run_ppe_check,
+    "evacuation": _run_evacuation_check,
+    "live_tracking": _run_live_tracking_check,
+}
+
+# Models whose scheduled checks for all due cameras run as one batch
+_BATCH_CHECK_FUNCTIONS: Dict[str, Callable[[List[Tuple[int, np.ndarray, FramePyramid]]],
+                                           List[Tuple[dict, int]]]] = {
+    "evacuation": _run_evacuation_batch,
+}
+
+
+# ---------------------------------------------------------------------------
+# Detection Scheduler
+# ---------------------------------------------------------------------------
+
+# Seconds between runs of each model on each camera (a camera entry in
+# model_camera_config.json may override it with an "interval" key)
+DETECTION_INTERVALS = {
+    "unauthorized": 2.0,
+    "restricted": 2.0,
+    "ppe": 2.0,
+    "evacuation": 2.0,
+    "live_tracking": 2.0,
+}
+DETECTION_WORKERS = 2              # inference threads shared by all cameras and models
+DETECTION_SCHEDULER_TICK = 0.2     # seconds between dispatch passes
+DETECTION_RESULT_MAX_AGE = 3.0     # cached results older than this many intervals are not served
+
+
+class DetectionScheduler:
+    """
+    Server-side detection loop.
+    
+    Runs every model on every camera enabled for it in ModelCameraManager at
+    that model's interval on a fixed worker pool, and caches the latest result
+    per (model, camera). The check endpoints return the cached result, so the
+    inference cost per camera does not depend on how many dashboards poll.
+    """
+    
+    def __init__(self, workers: int = DETECTION_WORKERS):
+        self.workers = workers
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        
+        self._intervals: Dict[Tuple[str, int], float] = {}
+        self._next_run: Dict[Tuple[str, int], float] = {}
+        self._in_flight: set = set()
+        self._results: Dict[Tuple[str, int], Tuple[float, dict]] = {}
+        self._stats: Dict[str, dict] = defaultdict(
+            lambda: {"runs": 0, "batches": 0, "errors": 0, "served": 0, "busy_seconds": 0.0})
+    
+    def start(self) -> None:
+        """Start the dispatch thread and worker pool (no-op if running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="detection")
+            self._thread = threading.Thread(target=self._loop, daemon=True,
+                                            name="detection-scheduler")
+            self._thread.start()
+        print(f"[INFO] Detection scheduler started ({self.workers} workers)")
+    
+    def stop(self) -> None:
+        """Stop dispatching; running checks finish in the background."""
+        self._stop.set()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+    
+    @staticmethod
+    def _enabled_jobs() -> Dict[Tuple[str, int], float]:
+        """(model, camera) pairs enabled in ModelCameraManager, with their interval."""
+        jobs = {}
+        for model_type, cameras in _model_camera_manager.get_all_config().items():
+            if model_type not in _CHECK_FUNCTIONS:
+                continue
+            for cam_key, cfg in cameras.items():
+                if cfg.get("enabled", False):
+                    interval = float(cfg.get("interval", DETECTION_INTERVALS[model_type]))
+                    jobs[(model_type, int(cam_key))] = interval
+        return jobs
+    
+    def _loop(self) -> None:
+        while not self._stop.wait(DETECTION_SCHEDULER_TICK):
+            try:
+                self._dispatch()
+            except Exception as e:
+                print(f"[WARN] Detection scheduler dispatch failed: {e}")
+    
+    def _dispatch(self) -> None:
+        """Submit every due (model, camera) check that is not already running."""
+        jobs = self._enabled_jobs()
+        now = time.time()
+        with self._lock:
+            if self._executor is None:
+                return
+            self._intervals = jobs
+            for key in list(self._results):
+                if key not in jobs:
+                    del self._results[key]
+            
+            due: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+            for key, interval in jobs.items():
+                if key in self._in_flight or now < self._next_run.get(key, 0.0):
+                    continue
+                self._in_flight.add(key)
+                self._next_run[key] = now + interval
+                due[key[0]].append(key)
+            
+            for model_type, keys in due.items():
+                if model_type in _BATCH_CHECK_FUNCTIONS:
+                    self._executor.submit(self._run_checks, model_type, keys)
+                else:
+                    for key in keys:
+                        self._executor.submit(self._run_checks, model_type, [key])
+    
+    def _run_checks(self, model_type: str, keys: List[Tuple[str, int]]) -> None:
+        """Run one model on one camera, or on several cameras as a batch."""
+        start = time.time()
+        bodies: Dict[Tuple[str, int], dict] = {}
+        try:
+            # The frames stay leased (not overwritten, not copied) until the checks return
+            with ExitStack() as leases:
+                checks = []
+                for key in keys:
+                    # lease_pyramid() falls back to another camera; a missing camera must not
+                    if _stream_manager.get_stream(key[1]) is None:
+                        continue
+                    pyramid = leases.enter_context(_stream_manager.lease_pyramid(key[1]))
+                    if pyramid is not None:
+                        checks.append((key, pyramid))
+                if not checks:
+                    return
+                
+                if model_type in _BATCH_CHECK_FUNCTIONS:
+                    responses = _BATCH_CHECK_FUNCTIONS[model_type](
+                        [(key[1], pyramid.full, pyramid) for key, pyramid in checks])
+                else:
+                    responses = [_CHECK_FUNCTIONS[model_type](key[1], pyramid.full, pyramid)
+                                 for key, pyramid in checks]
+            for (key, _), (body, status) in zip(checks, responses):
+                if status == 200:
+                    bodies[key] = body
+        except Exception as e:
+            cameras = [key[1] for key in keys]
+            print(f"[ERROR] Scheduled {model_type} check on camera(s) {cameras} failed: {e}")
+            with self._lock:
+                self._stats[model_type]["errors"] += 1
+        finally:
+            with self._lock:
+                for key in keys:
+                    self._in_flight.discard(key)
+                if bodies:
+                    stats = self._stats[model_type]
+                    stats["runs"] += len(bodies)
+                    stats["batches"] += 1
+                    stats["busy_seconds"] += time.time() - start
+                    finished = time.time()
+                    for key, body in bodies.items():
+                        self._results[key] = (finished, body)
+    
+    def get_result(self, model_type: str, camera_index) -> Optional[dict]:
+        """Latest scheduled result for a camera, or None if there is no recent one."""
+        self.start()
+        try:
+            key = (model_type, int(camera_index))
+        except (TypeError, ValueError):
+            return None
+        
+        with self._lock:
+            cached = self._results.get(key)
+            interval = self._intervals.get(key)
+            if cached is None or interval is None:
+                return None
+            age = time.time() - cached[0]
+            if age > interval * DETECTION_RESULT_MAX_AGE:
+                return None
+            self._stats[model_type]["served"] += 1
+        return {**cached[1], "result_age": round(age, 2)}
+    
+    def get_stats(self) -> dict:
+        """Scheduled jobs and per-model run counters."""
+        with self._lock:
+            models = {}
+            for model_type, stats in self._stats.items():
+                runs = stats["runs"]
+                models[model_type] = {
+                    "runs": runs,
+                    "batches": stats["batches"],
+                    "errors": stats["errors"],
+                    "served": stats["served"],
+                    "avg_seconds": round(stats["busy_seconds"] / stats["batches"], 3) if stats["batches"] else 0.0,
+                }
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "workers": self.workers,
+                "jobs": [{"model": m, "camera_id": c, "interval": i}
+                         for (m, c), i in sorted(self._intervals.items())],
+                "in_flight": len(self._in_flight),
+                "models": models,
+            }
+
+
+_detection_scheduler = DetectionScheduler()
+
+
+# ---------------------------------------------------------------------------
+# API endpoints for detection checks
+# ---------------------------------------------------------------------------
+
+def _serve_check(model_type: str, retry_delay: float) -> Response:
+    """
+    Answer a check endpoint: the scheduler's cached result for the camera if
+    there is a recent one, otherwise run the check on the camera's latest
+    frame (or the uploaded image) now.
+    """
+    payload = request.get_json(silent=True, force=True) or {}
+    
+    camera_index = payload.get("camera_index")
+    if camera_index is not None:
+        cached = _detection_scheduler.get_result(model_type, camera_index)
+        if cached is not None:
+            return jsonify(cached)
+        
+        for attempt in range(3):
+            # The frame stays leased (not overwritten, not copied) while the check runs
+            with _stream_manager.lease_pyramid(camera_index) as pyramid:
+                if pyramid is not None:
+                    body, status = _CHECK_FUNCTIONS[model_type](camera_index, pyramid.full, pyramid)
+                    return jsonify(body), status
+            time.sleep(retry_delay)
+        return jsonify({"ok": False, "error": "camera_not_available"}), 400
+    
+    frame = _decode_image_from_request(payload)
+    if frame is None:
+        return jsonify({"ok": False, "error": "invalid_image"}), 400
+    body, status = _CHECK_FUNCTIONS[model_type](camera_index, frame, FramePyramid(frame))
+    return jsonify(body), status
+
+
+@app.post("/api/demo/unauthorized/check")
+def api_demo_unauthorized() -> Response:
+    """Check if the captured face is known; unknown = unauthorized."""
+    return _serve_check("unauthorized", retry_delay=0.5)
+
+
+@app.post("/api/demo/restricted/check")
+def api_demo_restricted() -> Response:
+    """Check for person presence in restricted zone with face recognition."""
+    return _serve_check("restricted", retry_delay=0.5)
+
+
+@app.post("/api/demo/ppe/check")
+def api_demo_ppe_check() -> Response:
+    """PPE (hardhat) check using YOLO model."""
+    return _serve_check("ppe", retry_delay=0.5)
+
+
+@app.post("/api/demo/evacuation/check")
+def api_demo_evacuation_check() -> Response:
+    """
+    Evacuation System check - Person detection only (head count).
+    Fast and reliable for evacuation scenarios.
+    """
+    return _serve_check("evacuation", retry_delay=0.3)
+
+
+@app.post("/api/demo/live-tracking/check")
+def api_demo_live_tracking_check() -> Response:
+    """
+    Live Tracking System check - Person detection WITH face recognition.
+    Records person logs for analytics.
+    """
+    return _serve_check("live_tracking", retry_delay=0.3)
 
 
 @app.get("/api/person-logs")
@@ -8393,13 +10468,25 @@ if __name__ == "__main__":
     print("Press Ctrl+C to stop")
     print("=" * 60)
     
-    # Initialize streams before starting
+    import onnxruntime  # noqa: F401  fail at startup, not at the first detection
+    
+    os.makedirs(SNAPSHOTS_DIR, exist_ok=True)
+    os.makedirs(KNOWN_FACES_DIR, exist_ok=True)
+    _load_person_logs()
+    
+    # Load the known faces once, before any detection thread reads them, then
+    # initialize streams and the detection loop before starting
+    _gallery_manager.reload("startup", wait=True)
+    _gallery_manager.watch()
     _stream_manager.initialize()
+    _detection_scheduler.start()
     
     try:
         app.run(debug=False, host="0.0.0.0", port=5001, threaded=True)
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
+        _detection_scheduler.stop()
         _stream_manager.stop_all()
+        _gallery_manager.stop()
         print("Goodbye!")
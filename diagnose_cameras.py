@@ -8,6 +8,8 @@ import sqlite3
 import pickle
 from datetime import datetime, timedelta
 
+from face_engine import FaceGallery
+
 print("=== RTSP Camera & Face Recognition Diagnostic Tool ===")
 
 # Load configuration
@@ -80,6 +82,7 @@ print("\nTesting face encodings...")
 try:
     with open(config["encodings_file"], "rb") as f:
         data = pickle.load(f)
+    gallery = FaceGallery.from_dict(data)
     
     encoding_count = len(data)
     print(f"- Found {encoding_count} face encodings")
@@ -135,14 +138,11 @@ else:
                         for i, (face_encoding, face_location) in enumerate(zip(face_encodings, face_locations)):
                             try:
                                 # Compare with known faces
-                                distances = face_recognition.face_distance(list(data.values()), face_encoding)
-                                min_distance = min(distances) if len(distances) > 0 else 1.0
-                                matches = face_recognition.compare_faces(list(data.values()), face_encoding, tolerance=0.6)
+                                match_name, min_distance = gallery.identify([face_encoding], tolerance=0.6)[0]
                                 
                                 name = "Unknown"
-                                if True in matches:
-                                    index = matches.index(True)
-                                    name = list(data.keys())[index]
+                                if match_name is not None:
+                                    name = match_name
                                 
                                 print(f"  - Face {i+1}: {name} (distance={min_distance:.3f})")
                                 
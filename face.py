@@ -2,7 +2,7 @@
 """
 Demo Face Recognition Script
 ----------------------------
-- Uses the same encodings as the attendance system (face_encodings.pkl)
+- Uses the same known-face gallery as the attendance system
 - Opens webcam index 0
 - Draws bounding boxes with the recognized name
 - Prints the recognized name (and confidence) to the terminal
@@ -12,87 +12,29 @@ Press 'q' to quit.
 
 import os
 import sys
-import pickle
-from typing import List, Tuple
 
 import cv2
 import face_recognition
-import numpy as np
 
+from config import ENCODINGS_FILE, GALLERY_FILE
+from face_engine import FaceGallery, load_gallery
 
-def load_encodings() -> Tuple[List[np.ndarray], List[str]]:
+
+def load_encodings() -> FaceGallery:
     """
-    Load face encodings and labels from face_encodings.pkl
-    (same file used by the attendance system).
+    Load the known-face gallery (same file used by the attendance system):
+    the gallery file, or face_encodings.pkl if it has not been migrated yet.
     """
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    enc_path = os.path.join(base_dir, "face_encodings.pkl")
+    gallery = load_gallery(os.path.join(base_dir, GALLERY_FILE), os.path.join(base_dir, ENCODINGS_FILE))
 
-    if not os.path.exists(enc_path):
-        print(f"[ERROR] face_encodings.pkl not found at: {enc_path}")
+    if not gallery:
+        print(f"[ERROR] No known-face gallery found in {base_dir}")
         print("Make sure you run this script from the same folder where encodings are saved.")
         sys.exit(1)
 
-    # Compatibility shim: older encodings may have been created with
-    # NumPy 1.x where objects referenced internal modules like
-    # "numpy._core" and "numpy._core.multiarray". NumPy 2.x removed
-    # those modules, which breaks unpickling. We alias them back to
-    # the public numpy module so the pickle can be loaded without
-    # downgrading NumPy.
-    if "numpy._core" not in sys.modules:  # type: ignore[attr-defined]
-        sys.modules["numpy._core"] = np  # type: ignore[assignment]
-    try:
-        core = np.core  # type: ignore[attr-defined]
-        if "numpy._core.multiarray" not in sys.modules:
-            sys.modules["numpy._core.multiarray"] = core.multiarray  # type: ignore[attr-defined]
-    except Exception:
-        # If np.core is not present for some reason, we still have the
-        # top-level alias which is enough for many pickles.
-        pass
-
-    with open(enc_path, "rb") as f:
-        data = pickle.load(f)
-
-    encodings: List[np.ndarray] = []
-    names: List[str] = []
-
-    # Preferred format used by the latest tools: {'encodings': [...], 'names': [...]}
-    if isinstance(data, dict) and "encodings" in data and "names" in data:
-        encodings = [np.array(e) for e in data.get("encodings", [])]
-        names = [str(n) for n in data.get("names", [])]
-    elif isinstance(data, dict):
-        # Fallback: {name: encoding} or {name: [encodings]}
-        for name, value in data.items():
-            arr = np.array(value)
-            if arr.ndim == 1:
-                encodings.append(arr)
-                names.append(str(name))
-            elif arr.ndim == 2:
-                for row in arr:
-                    encodings.append(np.array(row))
-                    names.append(str(name))
-    elif isinstance(data, list):
-        # Fallback: list of (name, encoding)
-        for item in data:
-            try:
-                name, enc = item
-            except Exception:
-                continue
-            arr = np.array(enc)
-            if arr.ndim == 1:
-                encodings.append(arr)
-                names.append(str(name))
-            elif arr.ndim == 2:
-                for row in arr:
-                    encodings.append(np.array(row))
-                    names.append(str(name))
-
-    if not encodings or not names:
-        print("[ERROR] Encodings file is empty or invalid.")
-        sys.exit(1)
-
-    print(f"[INFO] Loaded {len(encodings)} known face encodings.")
-    return encodings, names
+    print(f"[INFO] Loaded {len(gallery)} known face encodings.")
+    return gallery
 
 
 def get_name_mapping() -> dict:
@@ -148,7 +90,7 @@ def open_webcam() -> cv2.VideoCapture:
 
 
 def main():
-    known_face_encodings, known_face_names = load_encodings()
+    gallery = load_encodings()
     name_mappings = get_name_mapping()
 
     # Open webcam robustly
@@ -178,20 +120,14 @@ def main():
             face_names = []
             confidences = []
 
-            for face_encoding in face_encodings:
-                # Compare face to known encodings
-                matches = face_recognition.compare_faces(known_face_encodings, face_encoding, tolerance=0.6)
-                face_distances = face_recognition.face_distance(known_face_encodings, face_encoding)
-
+            # Compare all faces to the known encodings in one pass
+            for folder_name, distance in gallery.identify(face_encodings, tolerance=0.6):
                 name = "Unknown"
                 confidence = 0.0
 
-                if len(face_distances) > 0:
-                    best_match_index = np.argmin(face_distances)
-                    if matches[best_match_index]:
-                        confidence = 1.0 - face_distances[best_match_index]
-                        folder_name = known_face_names[best_match_index]
-                        name = name_mappings.get(folder_name, folder_name)
+                if folder_name is not None:
+                    confidence = 1.0 - distance
+                    name = name_mappings.get(folder_name, folder_name)
 
                 face_names.append(name)
                 confidences.append(confidence)
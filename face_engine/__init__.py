@@ -0,0 +1,16 @@
+"""Face detection and recognition building blocks shared by the apps."""
+
+from face_engine.detectors import (
+    FACE_DETECTORS,
+    CnnFaceDetector,
+    FaceDetector,
+    HaarFaceDetector,
+    HogFaceDetector,
+    YuNetFaceDetector,
+    create_face_detector,
+)
+from face_engine.gallery import FaceGallery, reduce_encodings
+from face_engine.ann import IVFIndex
+from face_engine.store import load_gallery, save_gallery
+from face_engine.manager import GalleryManager, GallerySnapshot
+from face_engine.trainer import EmbeddingCache, IncrementalTrainer, TrainingResult
@@ -0,0 +1,138 @@
+"""
+IVF Index for the Known-Face Gallery
+====================================
+A pure-NumPy inverted-file index: k-means partitions the gallery into
+`nlist` cells, a query only scans the rows in its `nprobe` closest cells,
+and those candidates are reranked by exact distance. No extra service or
+library is needed, and with the defaults recall@1 stays close to 100% on
+face embeddings (identities form tight clusters).
+
+The index stores only centroids and row ids; distances are computed on the
+FaceGallery matrix it was built for, so search results are exact distances.
+New encodings are inserted into their nearest cell without retraining.
+
+The recall/latency benchmark is face_engine/benchmark_ann.py.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 20, seed: int = 0,
+           sample: int = 50000) -> np.ndarray:
+    """Lloyd's k-means (k-means++ init) on at most `sample` rows; returns (k, D) centroids."""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample:
+        vectors = vectors[rng.choice(len(vectors), sample, replace=False)]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    k = min(k, len(vectors))
+    sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+
+    # k-means++ seeding
+    centroids = np.empty((k, vectors.shape[1]), dtype=np.float32)
+    centroids[0] = vectors[rng.integers(len(vectors))]
+    closest = np.full(len(vectors), np.inf, dtype=np.float32)
+    for i in range(1, k):
+        d = sq_norms - 2.0 * vectors @ centroids[i - 1] + centroids[i - 1] @ centroids[i - 1]
+        np.minimum(closest, np.maximum(d, 0.0), out=closest)
+        total = closest.sum()
+        pick = rng.choice(len(vectors), p=closest / total) if total > 0 else rng.integers(len(vectors))
+        centroids[i] = vectors[pick]
+
+    for _ in range(iterations):
+        assign = _nearest(vectors, centroids)
+        counts = np.bincount(assign, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = counts == 0
+        # Re-seed empty cells with random rows instead of letting them die
+        sums[empty] = vectors[rng.integers(len(vectors), size=int(empty.sum()))]
+        counts[empty] = 1
+        new = sums / counts[:, None]
+        if np.allclose(new, centroids, atol=1e-6):
+            centroids = new
+            break
+        centroids = new
+    return centroids.astype(np.float32)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """Index of the closest centroid for every row (chunked to bound memory)."""
+    c_norms = np.einsum("ij,ij->i", centroids, centroids)
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        block = vectors[start:start + chunk]
+        out[start:start + chunk] = np.argmin(c_norms[None, :] - 2.0 * block @ centroids.T, axis=1)
+    return out
+
+
+class IVFIndex:
+    """Coarse k-means partition of gallery rows with exact candidate rerank."""
+
+    def __init__(self, centroids: np.ndarray, nprobe: int = 8):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.c_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        self.nprobe = nprobe
+        self.lists: List[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in range(len(self.centroids))]
+        self.size = 0
+
+    @classmethod
+    def train(cls, matrix: np.ndarray, nlist: Optional[int] = None, nprobe: int = 8,
+              seed: int = 0) -> "IVFIndex":
+        """Build an index over all rows of `matrix`; nlist defaults to ~sqrt(N)."""
+        if nlist is None:
+            nlist = max(1, int(round(np.sqrt(len(matrix)))))
+        index = cls(kmeans(matrix, nlist, seed=seed), nprobe)
+        index.add(matrix, 0)
+        return index
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    def add(self, vectors: np.ndarray, start_id: int) -> None:
+        """Insert rows start_id, start_id + 1, ... into their nearest cells."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.centroids.shape[1])
+        if not len(vectors):
+            return
+        assign = _nearest(vectors, self.centroids)
+        ids = np.arange(start_id, start_id + len(vectors), dtype=np.int64)
+        order = np.argsort(assign, kind="stable")
+        cells, starts = np.unique(assign[order], return_index=True)
+        for cell, chunk in zip(cells, np.split(ids[order], starts[1:])):
+            # Replace (not extend) the list so concurrent searches see either version
+            self.lists[cell] = np.concatenate([self.lists[cell], chunk])
+        self.size += len(vectors)
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Row ids in the `nprobe` cells closest to one query vector."""
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        d = self.c_norms - 2.0 * (self.centroids @ query)
+        cells = np.argpartition(d, nprobe - 1)[:nprobe] if nprobe < self.nlist else range(self.nlist)
+        return np.concatenate([self.lists[c] for c in cells])
+
+    def search(self, queries: np.ndarray, matrix: np.ndarray, sq_norms: np.ndarray,
+               k: int = 1, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k (ids, distances), each (M, k), of every query against `matrix`.
+
+        Only candidates from the probed cells are scored, with exact distances.
+        Ids beyond len(matrix) (inserted after that matrix was built) are
+        ignored; missing results are -1 / inf.
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, matrix.shape[1])
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        dists = np.full((len(queries), k), np.inf, dtype=np.float32)
+        for qi, query in enumerate(queries):
+            cand = self.candidates(query, nprobe)
+            cand = cand[cand < len(matrix)]
+            if not len(cand):
+                continue
+            sq = sq_norms[cand] - 2.0 * (matrix[cand] @ query) + query @ query
+            top = min(k, len(cand))
+            best = np.argpartition(sq, top - 1)[:top] if top < len(cand) else np.arange(len(cand))
+            best = best[np.argsort(sq[best])]
+            ids[qi, :top] = cand[best]
+            dists[qi, :top] = np.sqrt(np.maximum(sq[best], 0.0))
+        return ids, dists
@@ -0,0 +1,77 @@
+"""
+IVF Index Benchmark
+===================
+Recall and per-query latency of the IVF index (face_engine/ann.py) against
+brute-force gallery matching at 1k, 10k and 100k encodings. The gallery is
+synthetic: identities spread like dlib encodings with several photos each,
+queries are new photos of random identities.
+
+Usage:
+    python -m face_engine.benchmark_ann
+    python -m face_engine.benchmark_ann --sizes 10000 --nprobe 4 8 16
+"""
+
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+from face_engine.ann import IVFIndex
+from face_engine.gallery import FaceGallery
+
+
+def synthetic_gallery(n: int, per_person: int = 5, dim: int = 128, seed: int = 0):
+    """
+    Face-like embeddings: one random identity center per person (spread like
+    dlib encodings, ~0.9 apart) with `per_person` photos around it (~0.35 apart).
+    """
+    rng = np.random.default_rng(seed)
+    people = max(1, n // per_person)
+    centers = rng.normal(0, 0.9 / np.sqrt(2 * dim), (people, dim)).astype(np.float32)
+    owner = np.arange(n) % people
+    matrix = centers[owner] + rng.normal(0, 0.25 / np.sqrt(dim), (n, dim)).astype(np.float32)
+    queries = centers[rng.integers(0, people, 200)] + rng.normal(0, 0.25 / np.sqrt(dim), (200, dim))
+    return matrix.astype(np.float32), queries.astype(np.float32)
+
+
+def run_benchmark(sizes=(1000, 10000, 100000), nprobes=(1, 4, 8, 16), k=5):
+    print(f"{'N':>8}{'nlist':>7}{'nprobe':>8}{'recall@1':>10}{'recall@' + str(k):>10}"
+          f"{'scanned':>9}{'ms/query':>10}{'build s':>9}")
+    for n in sizes:
+        matrix, queries = synthetic_gallery(n)
+        gallery = FaceGallery(matrix, [str(i) for i in range(n)])
+
+        dist = gallery.distances(queries)
+        exact = np.argsort(dist, axis=1)[:, :k]
+        start = time.perf_counter()
+        for q in queries:
+            gallery.distances(q[None])
+        brute_ms = 1000 * (time.perf_counter() - start) / len(queries)
+        print(f"{n:>8}{'-':>7}{'brute':>8}{1.0:>10.3f}{1.0:>10.3f}{1.0:>9.0%}{brute_ms:>10.3f}{'-':>9}")
+
+        start = time.perf_counter()
+        index = IVFIndex.train(gallery.matrix)
+        build_s = time.perf_counter() - start
+        for nprobe in nprobes:
+            if nprobe > index.nlist:
+                continue
+            start = time.perf_counter()
+            ids = np.vstack([index.search(q[None], gallery.matrix, gallery.sq_norms, k, nprobe)[0]
+                             for q in queries])
+            ms = 1000 * (time.perf_counter() - start) / len(queries)
+            recall1 = np.mean(ids[:, 0] == exact[:, 0])
+            recallk = np.mean([len(set(a) & set(b)) / k for a, b in zip(ids, exact)])
+            scanned = np.mean([len(index.candidates(q, nprobe)) for q in queries]) / n
+            print(f"{n:>8}{index.nlist:>7}{nprobe:>8}{recall1:>10.3f}{recallk:>10.3f}"
+                  f"{scanned:>9.1%}{ms:>10.3f}{build_s:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 100000],
+                        help='Gallery sizes to benchmark')
+    parser.add_argument('--nprobe', nargs='+', type=int, default=[1, 4, 8, 16],
+                        help='Cells probed per query')
+    parser.add_argument('--k', default=5, type=int, help='Top-k for recall@k')
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.nprobe, args.k)
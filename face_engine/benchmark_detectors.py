@@ -0,0 +1,89 @@
+"""
+Face Detector Benchmark
+=======================
+Compares the face detector backends on the evidence/ images. Every evidence
+image was saved for a recognized face, so a backend's recall is taken as the
+share of images in which it finds at least one face. Agreement is the share
+of the reference backend's faces (HOG if available) that a backend also
+finds at IoU >= 0.3.
+
+Usage:
+    python -m face_engine.benchmark_detectors
+    python -m face_engine.benchmark_detectors --backends hog haar yunet --limit 200
+"""
+
+import os
+import time
+from argparse import ArgumentParser
+
+import cv2
+import numpy as np
+
+from face_engine.detectors import FACE_DETECTORS
+
+EVIDENCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "evidence")
+
+
+def _iou(a, b):
+    """IoU of two (top, right, bottom, left) boxes."""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    inter = max(0, bottom - top) * max(0, right - left)
+    area = lambda f: (f[2] - f[0]) * (f[1] - f[3])
+    return inter / (area(a) + area(b) - inter + 1e-7)
+
+
+def run_backend(detector, images):
+    """Per-image face boxes and latencies (seconds) for one backend."""
+    detector.detect(images[0])  # warm up (model load, first allocation)
+    faces, latencies = [], []
+    for image in images:
+        start = time.perf_counter()
+        faces.append(detector.detect(image))
+        latencies.append(time.perf_counter() - start)
+    return faces, np.array(latencies)
+
+
+def benchmark(backends, images):
+    results = {}
+    for name in backends:
+        try:
+            detector = FACE_DETECTORS[name]()
+        except (ImportError, FileNotFoundError) as e:
+            print(f"[WARN] Skipping {name}: {e}")
+            continue
+        results[name] = run_backend(detector, images)
+
+    reference = "hog" if "hog" in results else next(iter(results), None)
+    print(f"\n{len(images)} evidence images, agreement vs. {reference}")
+    print(f"{'backend':<8}{'recall':>9}{'faces/img':>11}{'agreement':>11}{'mean ms':>10}{'p95 ms':>9}")
+    for name, (faces, latencies) in results.items():
+        recall = np.mean([len(f) > 0 for f in faces])
+        per_image = np.mean([len(f) for f in faces])
+        ref_faces = results[reference][0]
+        total = sum(len(f) for f in ref_faces)
+        matched = sum(
+            any(_iou(r, f) >= 0.3 for f in found)
+            for refs, found in zip(ref_faces, faces) for r in refs
+        )
+        agreement = matched / total if total else 0.0
+        ms = latencies * 1000
+        print(f"{name:<8}{recall:>8.1%}{per_image:>11.2f}{agreement:>10.1%}"
+              f"{ms.mean():>10.2f}{np.percentile(ms, 95):>9.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument('--backends', nargs='+', default=sorted(FACE_DETECTORS),
+                        help='Backends to compare')
+    parser.add_argument('--images', default=EVIDENCE_DIR, help='Directory of face images')
+    parser.add_argument('--limit', default=100, type=int, help='Max images to use')
+    args = parser.parse_args()
+
+    paths = sorted(os.path.join(args.images, n) for n in os.listdir(args.images)
+                   if n.lower().endswith(('.jpg', '.jpeg', '.png')))[:args.limit]
+    images = [img for img in (cv2.imread(p) for p in paths) if img is not None]
+    if not images:
+        raise SystemExit(f"No images found in {args.images}")
+    benchmark(args.backends, images)
@@ -0,0 +1,144 @@
+"""
+Multi-Embedding Matching Benchmark
+==================================
+Compares per-person averaged encodings (the previous training output) with
+keeping every photo's encoding, matched by the closest photo (min) or the
+mean of the top-k closest photos, and with k-means centroids per person.
+
+Photos are read from known_faces/<person>/ and encoded once. Accuracy is
+leave-one-out: each photo of a person with 2+ photos is matched against a
+gallery built from all other photos, and counts as correct when the right
+person is returned within the tolerance. False accepts are measured
+open-set: every photo of a person is matched against a gallery without
+that person, and any match within the tolerance is a false accept.
+
+Usage:
+    python -m face_engine.benchmark_multi
+    python -m face_engine.benchmark_multi --faces known_faces --tolerance 0.4 0.5 0.6
+"""
+
+import os
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+from face_engine.gallery import FaceGallery, reduce_encodings
+
+KNOWN_FACES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "known_faces")
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# name -> (how each person's photo encodings become gallery rows, top_k)
+STRATEGIES = {
+    "mean": (lambda encs: np.mean(encs, axis=0, keepdims=True), 1),
+    "all/min": (lambda encs: encs, 1),
+    "all/top2": (lambda encs: encs, 2),
+    "kmeans2/min": (lambda encs: reduce_encodings(encs, 2), 1),
+}
+
+
+def encode_photos(faces_dir, cache=None):
+    """{person: (k, 128) encodings} for the first face in every photo."""
+    if cache and os.path.exists(cache):
+        data = np.load(cache)
+        return {name: data[name] for name in data.files}
+
+    import face_recognition
+
+    encodings = {}
+    for person in sorted(os.listdir(faces_dir)):
+        folder = os.path.join(faces_dir, person)
+        if not os.path.isdir(folder):
+            continue
+        rows = []
+        for photo in sorted(os.listdir(folder)):
+            if not photo.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            found = face_recognition.face_encodings(face_recognition.load_image_file(os.path.join(folder, photo)))
+            if found:
+                rows.append(found[0])
+        if rows:
+            encodings[person] = np.asarray(rows, dtype=np.float32)
+            print(f"Encoded {len(rows)} photos for {person}")
+    if cache:
+        np.savez(cache, **encodings)
+    return encodings
+
+
+def build_gallery(encodings, strategy, skip_person=None, skip_photo=None):
+    """Gallery of all persons (minus `skip_person`, minus one held-out photo)."""
+    to_rows, _ = STRATEGIES[strategy]
+    rows = {}
+    for person, encs in encodings.items():
+        if person == skip_person:
+            continue
+        if skip_photo is not None and person == skip_photo[0]:
+            encs = np.delete(encs, skip_photo[1], axis=0)
+        if len(encs):
+            rows[person] = to_rows(encs)
+    return FaceGallery.from_dict(rows)
+
+
+def evaluate(encodings, strategy, tolerances):
+    _, top_k = STRATEGIES[strategy]
+    correct = {tol: 0 for tol in tolerances}
+    false_accept = {tol: 0 for tol in tolerances}
+    closed = opened = 0
+
+    for person, encs in encodings.items():
+        if len(encs) < 2:
+            continue
+        for i, query in enumerate(encs):
+            gallery = build_gallery(encodings, strategy, skip_photo=(person, i))
+            name, dist = gallery.identify([query], max(tolerances), top_k)[0]
+            closed += 1
+            for tol in tolerances:
+                correct[tol] += name == person and dist <= tol
+
+    for person, encs in encodings.items():
+        gallery = build_gallery(encodings, strategy, skip_person=person)
+        if not gallery:
+            continue
+        for _, dist in gallery.identify(encs, max(tolerances), top_k):
+            opened += 1
+            for tol in tolerances:
+                false_accept[tol] += dist <= tol
+
+    gallery = build_gallery(encodings, strategy)
+    queries = np.concatenate(list(encodings.values()))
+    start = time.perf_counter()
+    for _ in range(20):
+        gallery.match_persons(queries, top_k)
+    us = 1e6 * (time.perf_counter() - start) / (20 * len(queries))
+
+    return {
+        "rows": len(gallery),
+        "accuracy": {tol: correct[tol] / closed if closed else 0.0 for tol in tolerances},
+        "false_accept": {tol: false_accept[tol] / opened if opened else 0.0 for tol in tolerances},
+        "us_per_face": us,
+    }
+
+
+def run_benchmark(encodings, tolerances=(0.4, 0.5, 0.6)):
+    photos = sum(len(e) for e in encodings.values())
+    print(f"\n{len(encodings)} persons, {photos} photos")
+    header = f"{'strategy':<13}{'rows':>6}" + "".join(f"{'acc@' + str(t):>9}{'FA@' + str(t):>8}" for t in tolerances)
+    print(header + f"{'us/face':>9}")
+    for strategy in STRATEGIES:
+        r = evaluate(encodings, strategy, tolerances)
+        cells = "".join(f"{r['accuracy'][t]:>9.1%}{r['false_accept'][t]:>8.1%}" for t in tolerances)
+        print(f"{strategy:<13}{r['rows']:>6}{cells}{r['us_per_face']:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument('--faces', default=KNOWN_FACES_DIR, help='Directory with one folder of photos per person')
+    parser.add_argument('--cache', default=None, help='.npz file to cache the photo encodings in')
+    parser.add_argument('--tolerance', nargs='+', type=float, default=[0.4, 0.5, 0.6],
+                        help='Match tolerances to report')
+    args = parser.parse_args()
+
+    encodings = encode_photos(args.faces, args.cache)
+    if not encodings:
+        raise SystemExit(f"No encodable photos found in {args.faces}")
+    run_benchmark(encodings, args.tolerance)
@@ -0,0 +1,176 @@
+"""
+Face Detector Backends
+======================
+One interface over the face detectors used across the apps. Every backend
+takes a BGR frame and returns face boxes as (top, right, bottom, left)
+tuples - the face_recognition convention, so results can be passed straight
+to face_recognition.face_encodings.
+
+Backends:
+    hog    dlib HOG via face_recognition (default; good frontal recall, slow at 720p)
+    cnn    dlib CNN via face_recognition (accurate, needs a GPU to be practical)
+    haar   OpenCV Haar cascade (fast, more false positives)
+    yunet  OpenCV DNN YuNet ONNX model (fast and finds small faces; needs the model file)
+
+Select one with FACE_DETECTION_MODEL in config.py and build it with
+create_face_detector().
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple, Type
+
+import cv2
+import numpy as np
+
+try:
+    import face_recognition
+except ImportError:  # Haar / YuNet still work without dlib
+    face_recognition = None
+
+FaceBox = Tuple[int, int, int, int]  # (top, right, bottom, left)
+
+DEFAULT_YUNET_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "models", "face_detection_yunet_2023mar.onnx",
+)
+
+
+class FaceDetector:
+    """Base class: detect(bgr_image) -> [(top, right, bottom, left), ...]."""
+
+    name = "base"
+
+    def detect(self, image: np.ndarray) -> List[FaceBox]:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class HogFaceDetector(FaceDetector):
+    """dlib HOG detector from face_recognition."""
+
+    name = "hog"
+    model = "hog"
+
+    def __init__(self, upsample: int = 1):
+        if face_recognition is None:
+            raise ImportError("face_recognition is not installed")
+        self.upsample = upsample
+
+    def detect(self, image: np.ndarray) -> List[FaceBox]:
+        # HOG takes the strongest gradient over the channels, so BGR vs RGB does
+        # not matter; the CNN subclass converts
+        image = np.ascontiguousarray(image)
+        return [tuple(map(int, box)) for box in
+                face_recognition.face_locations(image, self.upsample, model=self.model)]
+
+
+class CnnFaceDetector(HogFaceDetector):
+    """dlib CNN (MMOD) detector from face_recognition."""
+
+    name = "cnn"
+    model = "cnn"
+
+    def detect(self, image: np.ndarray) -> List[FaceBox]:
+        return super().detect(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+
+class HaarFaceDetector(FaceDetector):
+    """OpenCV frontal-face Haar cascade."""
+
+    name = "haar"
+
+    def __init__(self, scale_factor: float = 1.1, min_neighbors: int = 5,
+                 min_size: Tuple[int, int] = (30, 30), cascade_path: Optional[str] = None):
+        cascade_path = cascade_path or os.path.join(
+            cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise FileNotFoundError(f"Haar cascade not found: {cascade_path}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+        self._lock = threading.Lock()
+
+    def detect(self, image: np.ndarray) -> List[FaceBox]:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        with self._lock:
+            faces = self.cascade.detectMultiScale(
+                gray, scaleFactor=self.scale_factor,
+                minNeighbors=self.min_neighbors, minSize=self.min_size)
+        return [(int(y), int(x + w), int(y + h), int(x)) for x, y, w, h in faces]
+
+
+class YuNetFaceDetector(FaceDetector):
+    """OpenCV DNN YuNet detector (cv2.FaceDetectorYN, OpenCV >= 4.7)."""
+
+    name = "yunet"
+
+    def __init__(self, model_path: Optional[str] = None, score_threshold: float = 0.7,
+                 nms_threshold: float = 0.3, top_k: int = 200):
+        model_path = model_path or DEFAULT_YUNET_MODEL_PATH
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"YuNet model not found: {model_path}")
+        self.model_path = model_path
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
+        self.top_k = top_k
+        # The detector holds its input size, so keep one per thread
+        self._local = threading.local()
+
+    def _detector(self, width: int, height: int):
+        detector = getattr(self._local, "detector", None)
+        if detector is None:
+            detector = cv2.FaceDetectorYN.create(
+                self.model_path, "", (width, height),
+                self.score_threshold, self.nms_threshold, self.top_k)
+            self._local.detector = detector
+        detector.setInputSize((width, height))
+        return detector
+
+    def detect(self, image: np.ndarray) -> List[FaceBox]:
+        h, w = image.shape[:2]
+        _, faces = self._detector(w, h).detect(np.ascontiguousarray(image))
+        if faces is None:
+            return []
+        boxes = []
+        for x, y, bw, bh in faces[:, :4]:
+            left, top = max(0, int(x)), max(0, int(y))
+            right, bottom = min(w, int(x + bw)), min(h, int(y + bh))
+            boxes.append((top, right, bottom, left))
+        return boxes
+
+
+FACE_DETECTORS: Dict[str, Type[FaceDetector]] = {
+    "hog": HogFaceDetector,
+    "cnn": CnnFaceDetector,
+    "haar": HaarFaceDetector,
+    "yunet": YuNetFaceDetector,
+}
+
+
+def create_face_detector(name: Optional[str] = None, fallback: str = "hog", **kwargs) -> FaceDetector:
+    """
+    Build the face detector `name` (default: config.FACE_DETECTION_MODEL).
+
+    If that backend cannot be created (missing model file or library), the
+    `fallback` backend is used instead, and Haar as a last resort.
+    """
+    if name is None:
+        try:
+            from config import FACE_DETECTION_MODEL as name
+        except ImportError:
+            name = "hog"
+    name = name.lower()
+
+    for candidate in dict.fromkeys([name, fallback, "haar"]):
+        if candidate not in FACE_DETECTORS:
+            print(f"[WARN] Unknown face detector '{candidate}', choose from {sorted(FACE_DETECTORS)}")
+            continue
+        try:
+            return FACE_DETECTORS[candidate](**(kwargs if candidate == name else {}))
+        except (ImportError, FileNotFoundError) as e:
+            print(f"[WARN] Face detector '{candidate}' unavailable: {e}")
+    raise RuntimeError("No face detector backend available")
@@ -0,0 +1,176 @@
+"""
+Known-Face Gallery
+==================
+The known face encodings as one contiguous float32 (N, 128) matrix with
+precomputed squared norms and a row -> name array, so every face found in a
+frame is matched against the whole gallery in a single matrix product:
+
+    ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b
+
+Distances are the Euclidean distances face_recognition.face_distance
+returns, so existing tolerances (0.4 - 0.6) keep their meaning.
+
+A person may own several rows (one per training photo, or k-means
+centroids of them, see reduce_encodings()). match_persons() scores each
+person by their closest row, or by the mean of their top-k closest rows,
+for all query faces in one vectorized pass.
+
+Large galleries can attach an IVF index (face_engine/ann.py, build_index())
+so a query only scans a few cells instead of every row.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from face_engine.ann import IVFIndex, kmeans
+
+
+def reduce_encodings(encodings: Sequence[np.ndarray], max_vectors: int) -> np.ndarray:
+    """
+    One person's encodings as at most `max_vectors` rows: the k-means
+    centroids when there are more, otherwise unchanged. max_vectors <= 0
+    keeps every encoding.
+    """
+    encodings = np.asarray(encodings, dtype=np.float32).reshape(len(encodings), -1)
+    if max_vectors <= 0 or len(encodings) <= max_vectors:
+        return encodings
+    return kmeans(encodings, max_vectors)
+
+
+class FaceGallery:
+    """Immutable matrix of known face encodings with one name per row."""
+
+    def __init__(self, encodings: Iterable[np.ndarray], names: Iterable[str],
+                 index: Optional[IVFIndex] = None):
+        if isinstance(encodings, np.ndarray) and encodings.ndim == 2:
+            # Used as-is when already float32 and contiguous (e.g. a read-only memmap)
+            matrix = np.ascontiguousarray(encodings, dtype=np.float32)
+        else:
+            rows = [np.asarray(e, dtype=np.float32).reshape(-1) for e in encodings]
+            dim = rows[0].shape[0] if rows else 128
+            matrix = np.stack(rows) if rows else np.empty((0, dim), dtype=np.float32)
+        names = [str(n) for n in names]
+        if len(matrix) != len(names):
+            raise ValueError(f"{len(matrix)} encodings but {len(names)} names")
+
+        self.matrix = matrix
+        self.sq_norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+        self.names = np.array(names, dtype=object)
+        self.matrix.flags.writeable = False
+        self.sq_norms.flags.writeable = False
+        self.index = index
+
+        # Rows grouped by person: person_names[person_of_row[i]] == names[i], and
+        # person_rows is a (P, max rows per person) row table padded with -1
+        person_names, self.person_of_row = np.unique(self.names.astype(str), return_inverse=True)
+        self.person_names = person_names.astype(object)
+        self.person_of_row = self.person_of_row.reshape(-1)
+        counts = np.bincount(self.person_of_row, minlength=len(person_names))
+        self.person_rows = np.full((len(person_names), counts.max(initial=0)), -1, dtype=np.int64)
+        order = np.argsort(self.person_of_row, kind="stable")
+        slots = np.arange(len(order)) - np.repeat(np.cumsum(counts) - counts, counts)
+        self.person_rows[self.person_of_row[order], slots] = order
+        self.person_counts = counts
+
+    @classmethod
+    def from_dict(cls, known_faces: Dict[str, np.ndarray]) -> "FaceGallery":
+        """Build from a name -> encoding mapping ((128,) or (k, 128) per name)."""
+        encodings, names = [], []
+        for name, value in known_faces.items():
+            arr = np.asarray(value, dtype=np.float32)
+            for row in arr.reshape(-1, arr.shape[-1]) if arr.ndim else []:
+                encodings.append(row)
+                names.append(name)
+        return cls(encodings, names)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __repr__(self) -> str:
+        return f"FaceGallery({len(self)} encodings, {len(self.person_names)} names)"
+
+    def build_index(self, nlist: Optional[int] = None, nprobe: int = 8) -> IVFIndex:
+        """Train an IVF index over the gallery; match() uses it from then on."""
+        self.index = IVFIndex.train(self.matrix, nlist, nprobe) if len(self) else None
+        return self.index
+
+    def add(self, encodings: Sequence[np.ndarray], names: Sequence[str]) -> "FaceGallery":
+        """
+        New gallery with `encodings` appended. The index, if any, is shared
+        and the new rows are inserted into it without retraining; this
+        gallery is left unchanged and keeps matching only its own rows.
+        Only call add() on the newest gallery of a chain sharing an index.
+        """
+        rows = np.asarray(encodings, dtype=np.float32).reshape(-1, self.matrix.shape[1])
+        gallery = FaceGallery(np.vstack([self.matrix, rows]), list(self.names) + list(names), self.index)
+        if self.index is not None:
+            self.index.add(rows, len(self))
+        return gallery
+
+    def distances(self, encodings: Sequence[np.ndarray]) -> np.ndarray:
+        """(M, N) distances from every query encoding to every gallery row."""
+        queries = np.asarray(encodings, dtype=np.float32).reshape(-1, self.matrix.shape[1])
+        sq = (np.einsum("ij,ij->i", queries, queries)[:, None]
+              + self.sq_norms[None, :]
+              - 2.0 * (queries @ self.matrix.T))
+        np.maximum(sq, 0.0, out=sq)  # rounding can push near-identical pairs below 0
+        return np.sqrt(sq, out=sq)
+
+    def match(self, encodings: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closest gallery row for each query encoding.
+
+        Returns (indices, distances), both (M,); an empty gallery yields
+        index -1 and distance inf for every query.
+        """
+        m = len(encodings)
+        if m == 0 or not len(self):
+            return np.full(m, -1, dtype=np.int64), np.full(m, np.inf, dtype=np.float32)
+        if self.index is not None:
+            ids, dist = self.index.search(encodings, self.matrix, self.sq_norms, k=1)
+            return ids[:, 0], dist[:, 0]
+        dist = self.distances(encodings)
+        best = np.argmin(dist, axis=1)
+        return best, dist[np.arange(m), best]
+
+    def match_persons(self, encodings: Sequence[np.ndarray],
+                      top_k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best person for each query encoding.
+
+        A person's distance is the mean of their `top_k` closest rows (all
+        of them if they have fewer); top_k=1 is the closest row and uses the
+        IVF index when one is attached. Returns (person indices into
+        person_names, distances), both (M,), -1 / inf when the gallery is empty.
+        """
+        if top_k <= 1 or not len(self):
+            rows, dist = self.match(encodings)
+            persons = self.person_of_row[rows] if len(self) else rows
+            return np.where(rows >= 0, persons, -1), dist
+
+        m = len(encodings)
+        if m == 0:
+            return np.full(0, -1, dtype=np.int64), np.full(0, np.inf, dtype=np.float32)
+        dist = self.distances(encodings)
+        # (M, P, max rows) distances, padding slots pushed to the end as inf
+        per_person = np.where(self.person_rows >= 0, dist[:, self.person_rows], np.inf)
+        k = min(top_k, per_person.shape[2])
+        nearest = np.sort(per_person, axis=2)[:, :, :k]
+        used = np.minimum(self.person_counts, k)
+        score = np.where(np.isfinite(nearest), nearest, 0.0).sum(axis=2) / used
+        best = np.argmin(score, axis=1)
+        return best, score[np.arange(m), best].astype(np.float32)
+
+    def identify(self, encodings: Sequence[np.ndarray], tolerance: float,
+                 top_k: int = 1) -> List[Tuple[Optional[str], float]]:
+        """
+        (name, distance) per query encoding, scored as in match_persons();
+        name is None when the best person is further than `tolerance`.
+        """
+        best, dist = self.match_persons(encodings, top_k)
+        return [(self.person_names[i] if i >= 0 and d <= tolerance else None, float(d))
+                for i, d in zip(best, dist)]
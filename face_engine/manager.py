@@ -0,0 +1,238 @@
+"""
+Known-Face Gallery Manager
+==========================
+Owns the live known-face gallery of an app as a versioned, immutable
+snapshot. Readers take one reference (manager.gallery or manager.snapshot)
+and use it for the whole frame, so a reload can never swap the encodings
+out from under them halfway through a match. Reloads and incremental adds
+build the new FaceGallery (and its IVF index) on a background thread and
+publish it with a single reference assignment.
+
+Reloads are triggered by:
+    - a change of the gallery file (watch() polls its mtime/size/inode,
+      which also catches the atomic rename save_gallery() does)
+    - an API call (reload() / add())
+    - training completion (publish() of the gallery it just saved, or
+      add() of just the new rows when training only added photos)
+
+stats() reports the current version and reload latency.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from face_engine.gallery import FaceGallery
+from face_engine.store import load_gallery, resolve_gallery_path
+
+
+@dataclass(frozen=True)
+class GallerySnapshot:
+    """One published gallery version."""
+
+    version: int
+    gallery: FaceGallery
+    source: Optional[str] = None        # file it was loaded from, if any
+    reason: str = "initial"
+    loaded_at: float = field(default_factory=time.time)
+
+
+def _file_signature(path: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class GalleryManager:
+    """Versioned, atomically swapped known-face gallery with background reloads."""
+
+    def __init__(self, *paths: str, ann_min_size: int = 0, nprobe: int = 8):
+        """
+        paths: gallery files to load, first existing wins (see load_gallery()).
+        ann_min_size: build an IVF index when the gallery has at least this
+        many encodings (0 = never).
+        """
+        self.paths = paths
+        self.ann_min_size = ann_min_size
+        self.nprobe = nprobe
+
+        self._snapshot = GallerySnapshot(0, FaceGallery([], []), reason="empty")
+        self._loaded = False
+        self._build_lock = threading.Lock()   # one build at a time
+        self._init_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._signature = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self._durations_ms = deque(maxlen=50)
+        self._reloads = 0
+        self._errors = 0
+        self._last_error: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    @property
+    def snapshot(self) -> GallerySnapshot:
+        """The current snapshot; loads the gallery on first use."""
+        if not self._loaded:
+            with self._init_lock:
+                if not self._loaded:
+                    self.reload("initial", wait=True)
+        return self._snapshot
+
+    @property
+    def gallery(self) -> FaceGallery:
+        return self.snapshot.gallery
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _prepare(self, gallery: FaceGallery) -> FaceGallery:
+        if self.ann_min_size and len(gallery) >= self.ann_min_size and gallery.index is None:
+            gallery.build_index(nprobe=self.nprobe)
+        return gallery
+
+    def _publish(self, gallery: FaceGallery, source: Optional[str], reason: str, started: float) -> None:
+        self._snapshot = GallerySnapshot(self._snapshot.version + 1, gallery, source, reason)
+        self._loaded = True
+        elapsed_ms = 1000 * (time.perf_counter() - started)
+        with self._stats_lock:
+            self._reloads += 1
+            self._durations_ms.append(elapsed_ms)
+        print(f"[INFO] Known faces v{self._snapshot.version} ({reason}): {len(gallery)} encodings, "
+              f"{len(gallery.person_names)} persons in {elapsed_ms:.1f} ms")
+
+    def _run(self, build, reason: str) -> None:
+        with self._build_lock:
+            started = time.perf_counter()
+            try:
+                gallery, source = build()
+                self._publish(self._prepare(gallery), source, reason, started)
+            except Exception as e:
+                with self._stats_lock:
+                    self._errors += 1
+                    self._last_error = f"{reason}: {e}"
+                self._loaded = True  # keep serving the previous snapshot
+                print(f"[ERROR] Known faces {reason} failed: {e}")
+
+    def _submit(self, build, reason: str, wait: bool) -> None:
+        if wait:
+            self._run(build, reason)
+        else:
+            threading.Thread(target=self._run, args=(build, reason), daemon=True,
+                             name=f"gallery-{reason}").start()
+
+    def reload(self, reason: str = "api", wait: bool = False) -> None:
+        """Re-read the gallery file and publish it as a new version."""
+        def build():
+            source = resolve_gallery_path(*self.paths)
+            self._signature = _file_signature(source)
+            return load_gallery(*self.paths), source
+        self._submit(build, reason, wait)
+
+    def add(self, encodings: Sequence[np.ndarray], names: Sequence[str],
+            reason: str = "add", wait: bool = False, source: Optional[str] = None,
+            base_version: Optional[int] = None, fallback: Optional[FaceGallery] = None) -> None:
+        """
+        Publish the current gallery plus `encodings` (no file read); an IVF
+        index gets the new rows inserted instead of being retrained.
+        `source` is as in publish().
+
+        base_version: the version the new rows were worked out against. If
+        another version was published in between (e.g. watch() loaded the
+        file that already holds them), appending could duplicate rows, so
+        `fallback` (the complete gallery) is published instead, or the
+        gallery file is re-read when there is none.
+        """
+        self.snapshot  # make sure there is a gallery to extend
+
+        def build():
+            current = self._snapshot  # latest version at build time
+            if source is not None:
+                self._signature = _file_signature(source)
+            if base_version is None or current.version == base_version:
+                return current.gallery.add(encodings, names), source or current.source
+            if fallback is not None:
+                return fallback, source or current.source
+            path = resolve_gallery_path(*self.paths)
+            self._signature = _file_signature(path)
+            return load_gallery(*self.paths), path
+        self._submit(build, reason, wait)
+
+    def publish(self, gallery: FaceGallery, reason: str = "training", wait: bool = False,
+                source: Optional[str] = None) -> None:
+        """
+        Publish an already built gallery (e.g. straight from training).
+        `source` is the file it was just saved to, so watch() does not
+        load that same file again.
+        """
+        def build():
+            if source is not None:
+                self._signature = _file_signature(source)
+            return gallery, source or self._snapshot.source
+        self._submit(build, reason, wait)
+
+    # ------------------------------------------------------------------
+    # File watching
+    # ------------------------------------------------------------------
+
+    def watch(self, interval: float = 2.0) -> None:
+        """Reload in the background whenever the gallery file changes."""
+        if self._watch_thread is not None:
+            return
+        if self._signature is None:
+            self._signature = _file_signature(resolve_gallery_path(*self.paths))
+
+        def loop():
+            while not self._stop.wait(interval):
+                signature = _file_signature(resolve_gallery_path(*self.paths))
+                if signature is not None and signature != self._signature:
+                    self.reload("file_change", wait=True)
+
+        self._watch_thread = threading.Thread(target=loop, daemon=True, name="gallery-watch")
+        self._watch_thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        with self._stats_lock:
+            durations = list(self._durations_ms)
+            result = {
+                "version": snap.version,
+                "encodings": len(snap.gallery),
+                "persons": len(snap.gallery.person_names),
+                "indexed": snap.gallery.index is not None,
+                "source": snap.source,
+                "reason": snap.reason,
+                "loaded_at": snap.loaded_at,
+                "reloads": self._reloads,
+                "errors": self._errors,
+                "last_error": self._last_error,
+            }
+        result["reload_ms"] = {
+            "last": round(durations[-1], 2) if durations else 0.0,
+            "avg": round(float(np.mean(durations)), 2) if durations else 0.0,
+            "max": round(max(durations), 2) if durations else 0.0,
+        }
+        return result
@@ -0,0 +1,33 @@
+"""
+Gallery Migration Tool
+======================
+Converts a face_encodings.pkl in any of the legacy shapes (name -> vector(s),
+{"encodings", "names"}, list of (name, encoding) tuples) to the binary
+gallery file read by load_gallery() (face_engine/store.py).
+
+Usage:
+    python -m face_engine.migrate_gallery face_encodings.pkl          # -> config.GALLERY_FILE
+    python -m face_engine.migrate_gallery face_encodings.pkl -o other.fgal
+    python -m face_engine.migrate_gallery --info face_gallery.fgal
+"""
+
+from argparse import ArgumentParser
+
+from face_engine.store import default_gallery_paths, load_gallery, migrate
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument('source', help='Encodings pickle to migrate, or gallery file with --info')
+    parser.add_argument('-o', '--output', default=None, help='Gallery file to write (default: config.GALLERY_FILE)')
+    parser.add_argument('--info', action='store_true', help='Only print what the file contains')
+    args = parser.parse_args()
+
+    if args.info:
+        gallery = load_gallery(args.source)
+        print(f"{args.source}: {gallery}")
+        for name, count in zip(gallery.person_names, gallery.person_counts):
+            print(f"  {name}: {count}")
+    else:
+        output = args.output or default_gallery_paths()[0]
+        gallery = migrate(args.source, output)
+        print(f"Migrated {args.source} -> {output}: {gallery}")
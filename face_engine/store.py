@@ -0,0 +1,176 @@
+"""
+Known-Face Gallery File
+=======================
+A versioned binary format for the known-face gallery, replacing
+face_encodings.pkl:
+
+    offset 0    64-byte header: magic b"FGAL", format version (uint16),
+                encoding dim (uint16), row count (uint32), then the byte
+                offsets of the matrix and names table and the table size
+                (uint64 each), little-endian, zero-padded
+    offset 64   float32 (count, dim) matrix, C order
+    after it    names table: UTF-8 JSON list, one name per matrix row
+
+The matrix is opened with np.memmap, so every process serving the same file
+shares its pages instead of unpickling a private copy, and no pickle /
+NumPy-version compatibility shims are needed. Files are written to a
+temporary name and renamed into place, so readers never see a partial file.
+
+load_gallery() is the loader for every entry point. It also reads the three
+legacy pickle shapes (name -> vector(s), {"encodings", "names"}, and a list
+of (name, encoding) tuples) so apps keep working until the file is migrated
+with face_engine/migrate_gallery.py.
+"""
+
+import json
+import os
+import pickle
+import struct
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from face_engine.gallery import FaceGallery
+
+MAGIC = b"FGAL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIQQQ")
+HEADER_SIZE = 64
+
+
+def is_gallery_file(path: str) -> bool:
+    """True if `path` starts with the gallery file magic."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def save_gallery(path: str, gallery: FaceGallery) -> None:
+    """Write `gallery` to `path` atomically (temporary file + rename)."""
+    matrix = np.ascontiguousarray(gallery.matrix, dtype="<f4")
+    names = json.dumps([str(n) for n in gallery.names], ensure_ascii=False).encode("utf-8")
+    count, dim = matrix.shape
+    names_offset = HEADER_SIZE + matrix.nbytes
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, dim, count, HEADER_SIZE, names_offset, len(names))
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(matrix.tobytes())
+            f.write(names)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_gallery_file(path: str) -> Tuple[np.ndarray, List[str]]:
+    """(memory-mapped read-only matrix, names) from a gallery file."""
+    with open(path, "rb") as f:
+        magic, version, dim, count, matrix_offset, names_offset, names_size = \
+            HEADER.unpack(f.read(HEADER_SIZE)[:HEADER.size])
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a face gallery file")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{path} has gallery format v{version}, this code reads up to v{FORMAT_VERSION}")
+        f.seek(names_offset)
+        names = json.loads(f.read(names_size).decode("utf-8"))
+
+    if len(names) != count:
+        raise ValueError(f"{path}: {count} rows but {len(names)} names")
+    if count == 0:
+        return np.empty((0, dim), dtype=np.float32), names
+    matrix = np.memmap(path, dtype="<f4", mode="r", offset=matrix_offset, shape=(count, dim))
+    return matrix, names
+
+
+def read_encodings_pickle(path: str) -> Tuple[List[np.ndarray], List[str]]:
+    """(encodings, names), one row each, from any of the legacy pickle shapes."""
+    # Pickles written under NumPy 2.x reference numpy._core, which NumPy 1.x
+    # lacks; alias it to the public module so they still load
+    if "numpy._core" not in sys.modules:
+        sys.modules["numpy._core"] = np
+    try:
+        if "numpy._core.multiarray" not in sys.modules:
+            sys.modules["numpy._core.multiarray"] = np.core.multiarray
+    except AttributeError:
+        pass
+
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+
+    if isinstance(data, dict) and "encodings" in data and "names" in data:
+        pairs = zip(data.get("names", []), data.get("encodings", []))
+    elif isinstance(data, dict):
+        pairs = data.items()
+    elif isinstance(data, (list, tuple)):
+        pairs = [item for item in data if isinstance(item, (list, tuple)) and len(item) == 2]
+    else:
+        raise ValueError(f"{path}: unsupported encodings pickle ({type(data).__name__})")
+
+    encodings: List[np.ndarray] = []
+    names: List[str] = []
+    for name, value in pairs:
+        arr = np.asarray(value, dtype=np.float32)
+        if arr.ndim not in (1, 2) or arr.size == 0:
+            continue
+        for row in arr.reshape(-1, arr.shape[-1]):
+            encodings.append(row)
+            names.append(str(name))
+    return encodings, names
+
+
+def default_gallery_paths() -> List[str]:
+    """config.GALLERY_FILE, then the legacy config.ENCODINGS_FILE."""
+    try:
+        from config import ENCODINGS_FILE, GALLERY_FILE
+    except ImportError:
+        ENCODINGS_FILE, GALLERY_FILE = "face_encodings.pkl", "face_gallery.fgal"
+    return [GALLERY_FILE, ENCODINGS_FILE]
+
+
+def resolve_gallery_path(*paths: str) -> Optional[str]:
+    """The first existing file among `paths` and default_gallery_paths(), or None."""
+    for candidate in dict.fromkeys([p for p in paths if p] + default_gallery_paths()):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def load_gallery(*paths: str) -> FaceGallery:
+    """
+    Load the known-face gallery from the first of `paths` that exists.
+
+    Each path may be a gallery file or a legacy encodings pickle (detected
+    by content). config.GALLERY_FILE and then the legacy
+    config.ENCODINGS_FILE are tried after `paths`. Returns an empty gallery
+    when none exists.
+    """
+    candidate = resolve_gallery_path(*paths)
+    if candidate is None:
+        tried = dict.fromkeys([p for p in paths if p] + default_gallery_paths())
+        print(f"[WARN] No known-face gallery found (tried {', '.join(tried)})")
+        return FaceGallery([], [])
+    if paths and candidate != paths[0]:
+        print(f"[WARN] Gallery {paths[0]} not found, loading {candidate}")
+    if is_gallery_file(candidate):
+        matrix, names = read_gallery_file(candidate)
+    else:
+        matrix, names = read_encodings_pickle(candidate)
+        print(f"[WARN] {candidate} is a legacy pickle; migrate it with "
+              f"`python -m face_engine.migrate_gallery {candidate}`")
+    return FaceGallery(matrix, names)
+
+
+def migrate(src: str, dst: str) -> FaceGallery:
+    """Convert an encodings pickle to a gallery file; returns the gallery."""
+    encodings, names = read_encodings_pickle(src)
+    gallery = FaceGallery(encodings, names)
+    save_gallery(dst, gallery)
+    return gallery
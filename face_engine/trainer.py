@@ -0,0 +1,341 @@
+"""
+Incremental Face Training
+=========================
+Builds the known-face gallery from known_faces/<person>/<photo> without
+re-encoding photos that were already encoded. Every photo's encoding is
+kept in an EmbeddingCache keyed by the SHA-256 of the file content, so a
+training run only runs face_recognition on new or changed photos, reuses
+the cached encoding of every other photo, and drops the entries of photos
+that were deleted (or replaced). A photo in which no face was found is
+cached as such, so it is not re-encoded on every run either.
+
+The cache is a small .npz file (digests + (N, 128) float32 encodings, NaN
+rows for "no face") written atomically next to the gallery file. Because
+it is keyed by content, renaming or moving a photo to another person's
+folder does not re-encode it. Whether the gallery itself changed is decided
+by comparing the trained rows with the served gallery
+(TrainingResult.additions()), so moved or deleted photos and a changed
+FACE_ENCODINGS_PER_PERSON are still picked up.
+
+Photos that do need encoding are fanned out over a pool of `workers`
+processes, started with "spawn" so they inherit no threads or loaded
+models from the app. Spawn re-imports the parent's main script in each
+worker, so that script must keep its startup under
+`if __name__ == "__main__":` (demo_rtsp.py, train_faces.py do). Each worker decodes the
+image and runs detection and encoding itself, so only the path goes in and 128 floats come back; at most
+2 * workers photos are in flight at a time. Results are consumed in folder
+order, so progress callbacks arrive in the same order as a sequential run.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from face_engine.gallery import FaceGallery, reduce_encodings
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hex SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_photo(path: str) -> Optional[np.ndarray]:
+    """Encoding of the first face found in a photo, or None."""
+    import face_recognition
+
+    found = face_recognition.face_encodings(face_recognition.load_image_file(path))
+    return np.asarray(found[0], dtype=np.float32) if found else None
+
+
+def _completed(fn: Callable, *args) -> Future:
+    """A Future already resolved with fn(*args), or the exception it raised."""
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _raise(error: Exception):
+    raise error
+
+
+class EmbeddingCache:
+    """Photo content digest -> encoding (None = no face), persisted as .npz."""
+
+    def __init__(self, path: Optional[str] = None, dim: int = 128):
+        self.path = path
+        self.dim = dim
+        self._entries: Dict[str, Optional[np.ndarray]] = {}
+        self.dirty = False
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with np.load(self.path) as data:
+                digests, encodings = data["digests"], data["encodings"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARN] Ignoring unreadable embedding cache {self.path}: {e}")
+            return
+        if encodings.ndim == 2 and len(encodings):
+            self.dim = encodings.shape[1]
+        for digest, row in zip(digests, encodings):
+            self._entries[str(digest)] = None if np.isnan(row).any() else row.astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._entries
+
+    def get(self, digest: str) -> Optional[np.ndarray]:
+        return self._entries.get(digest)
+
+    def put(self, digest: str, encoding: Optional[np.ndarray]) -> None:
+        self._entries[digest] = None if encoding is None else np.asarray(encoding, dtype=np.float32).reshape(-1)
+        self.dirty = True
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Drop every entry not in `keep`; returns how many were dropped."""
+        keep = set(keep)
+        stale = [d for d in self._entries if d not in keep]
+        for digest in stale:
+            del self._entries[digest]
+        self.dirty = self.dirty or bool(stale)
+        return len(stale)
+
+    def save(self) -> None:
+        """Write the cache to `path` atomically (temporary file + rename)."""
+        if not self.path:
+            return
+        digests = np.array(list(self._entries), dtype="U64")
+        encodings = np.full((len(digests), self.dim), np.nan, dtype=np.float32)
+        for i, encoding in enumerate(self._entries.values()):
+            if encoding is not None:
+                encodings[i] = encoding
+
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, digests=digests, encodings=encodings)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.dirty = False
+
+
+@dataclass
+class TrainingResult:
+    """Outcome of one IncrementalTrainer.train() run."""
+
+    encodings: Dict[str, np.ndarray]              # person -> gallery rows
+    photos: int = 0                               # photos found
+    faces: int = 0                                # photos with a face
+    encoded: int = 0                              # photos run through face_recognition
+    cached: int = 0                               # photos served from the cache
+    removed: int = 0                              # cache entries of deleted photos
+    failed: List[str] = field(default_factory=list)   # "person/photo"
+
+    def additions(self, gallery: FaceGallery) -> Optional[Dict[str, np.ndarray]]:
+        """
+        The rows this result adds to `gallery`, per person: {} when both hold
+        the same rows, None when `gallery` has a row this result does not
+        (a photo deleted or moved to another person, a person removed, other
+        centroids), so the gallery must be rebuilt.
+        """
+        current: Dict[str, Counter] = {}
+        for row, name in zip(np.asarray(gallery.matrix, dtype=np.float32), gallery.names):
+            current.setdefault(str(name), Counter())[row.tobytes()] += 1
+
+        added = {}
+        for person, rows in self.encodings.items():
+            remaining = current.pop(person, Counter())
+            new = []
+            for row in np.asarray(rows, dtype=np.float32):
+                if remaining[row.tobytes()] > 0:
+                    remaining[row.tobytes()] -= 1
+                else:
+                    new.append(row)
+            if +remaining:
+                return None
+            if new:
+                added[person] = np.stack(new)
+        return None if current else added
+
+    @property
+    def gallery(self) -> FaceGallery:
+        return FaceGallery.from_dict(self.encodings)
+
+
+# on_photo(person, photo, status, error) with status one of
+# "encoded", "cached", "no_face" or "error"
+PhotoCallback = Callable[[str, str, str, Optional[str]], None]
+# on_person(person, faces, photos) once a person's folder is done
+PersonCallback = Callable[[str, int, int], None]
+
+
+class IncrementalTrainer:
+    """Trains the gallery from a photo folder, re-encoding only what changed."""
+
+    def __init__(self, faces_dir: str, cache_path: Optional[str] = None, max_per_person: int = 0,
+                 encoder: Callable[[str], Optional[np.ndarray]] = encode_photo, workers: int = 1):
+        """
+        faces_dir: one folder of photos per person (the folder name is the person).
+        cache_path: .npz embedding cache (None keeps it in memory only).
+        max_per_person: see reduce_encodings() (0 keeps every photo's encoding).
+        encoder: path -> encoding or None; must be a module-level function
+        when workers > 1 (it is pickled to the worker processes).
+        workers: encoding processes (0 = one per CPU, 1 = encode in-process).
+        """
+        self.faces_dir = faces_dir
+        self.cache_path = cache_path
+        self.max_per_person = max_per_person
+        self.encoder = encoder
+        self.workers = workers
+        self._cache: Optional[EmbeddingCache] = None
+        self._lock = threading.Lock()  # one training run at a time
+
+    @property
+    def cache(self) -> EmbeddingCache:
+        if self._cache is None:
+            self._cache = EmbeddingCache(self.cache_path)
+        return self._cache
+
+    def scan(self) -> Dict[str, List[str]]:
+        """{person: [photo file names]}, both sorted."""
+        photos = {}
+        for person in sorted(os.listdir(self.faces_dir)):
+            folder = os.path.join(self.faces_dir, person)
+            if os.path.isdir(folder):
+                photos[person] = sorted(f for f in os.listdir(folder) if f.lower().endswith(IMAGE_EXTENSIONS))
+        return photos
+
+    def _encodings(self, paths: List[str],
+                   seen: set) -> Iterator[Tuple[Optional[np.ndarray], bool, Optional[Exception]]]:
+        """
+        (encoding, newly encoded, error) for every path, in order. Cached
+        photos are served from the cache; the rest are encoded in-process or
+        in the worker pool with a bounded number in flight. Adds every
+        readable photo's digest to `seen`.
+        """
+        cache = self.cache
+        digests = [_completed(file_digest, path) for path in paths]
+        readable = {d.result() for d in digests if d.exception() is None}
+        seen.update(readable)
+        todo = [digest for digest in readable if digest not in cache]
+
+        workers = min(self.workers or os.cpu_count() or 1, len(todo))
+        pool = None
+        if workers > 1:
+            pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        max_pending = 2 * max(workers, 1)
+        encoding_now: Dict[str, Future] = {}  # digest -> Future of a photo being encoded
+        pending = deque()                     # (digest, newly encoded, Future) in path order
+
+        def resolve():
+            digest, new, future = pending.popleft()
+            try:
+                encoding, error = future.result(), None
+            except Exception as e:
+                encoding, error = None, e
+            if new:
+                encoding_now.pop(digest, None)
+                if error is None:
+                    cache.put(digest, encoding)
+            return encoding, new, error
+
+        try:
+            for path, digest_future in zip(paths, digests):
+                if digest_future.exception() is not None:
+                    digest, new, future = None, False, _completed(_raise, digest_future.exception())
+                else:
+                    digest, new = digest_future.result(), False
+                    if digest in cache:
+                        future = _completed(cache.get, digest)
+                    elif digest in encoding_now:  # same photo twice, encode it once
+                        future = encoding_now[digest]
+                    else:
+                        new = True
+                        future = pool.submit(self.encoder, path) if pool else _completed(self.encoder, path)
+                        encoding_now[digest] = future
+                pending.append((digest, new, future))
+                while pending and (pending[0][2].done() or len(pending) >= max_pending):
+                    yield resolve()
+            while pending:
+                yield resolve()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def train(self, on_photo: Optional[PhotoCallback] = None,
+              on_person: Optional[PersonCallback] = None,
+              photos: Optional[Dict[str, List[str]]] = None) -> TrainingResult:
+        """
+        Encode new / changed photos, reuse cached encodings for the rest and
+        drop cache entries of photos that no longer exist. `photos` defaults
+        to scan(). Callbacks run in the calling thread, in folder order. The
+        cache file is rewritten only when something changed.
+        """
+        with self._lock:
+            cache = self.cache
+            photos = self.scan() if photos is None else photos
+            result = TrainingResult({}, photos=sum(len(p) for p in photos.values()))
+            seen = set()
+            paths = [os.path.join(self.faces_dir, person, photo)
+                     for person, files in photos.items() for photo in files]
+            encodings = self._encodings(paths, seen)
+
+            try:
+                for person, files in photos.items():
+                    rows = []
+                    for photo in files:
+                        encoding, new, error = next(encodings)
+                        if error is not None:
+                            status = "error"
+                        elif encoding is None:
+                            status = "no_face"
+                        else:
+                            status = "encoded" if new else "cached"
+                        if error is None:
+                            if new:
+                                result.encoded += 1
+                            else:
+                                result.cached += 1
+
+                        if encoding is not None:
+                            rows.append(encoding)
+                        else:
+                            result.failed.append(f"{person}/{photo}")
+                        if on_photo:
+                            on_photo(person, photo, status, None if error is None else str(error))
+
+                    if rows:
+                        result.encodings[person] = reduce_encodings(rows, self.max_per_person)
+                        result.faces += len(rows)
+                    if on_person:
+                        on_person(person, len(rows), len(files))
+            finally:
+                encodings.close()  # stops the worker pool if a callback raised
+
+            result.removed = cache.prune(seen)
+            if cache.dirty:
+                cache.save()
+            return result
@@ -101,18 +101,16 @@
 import cv2
 import face_recognition
 import sqlite3
-import pickle
 from datetime import datetime
 
-# Load precomputed encodings
-ENCODINGS_FILE = "face_encodings.pkl"
-try:
-    with open(ENCODINGS_FILE, "rb") as f:
-        known_faces = pickle.load(f)
-    print("Loaded precomputed encodings.")
-except FileNotFoundError:
-    print(f"Error: {ENCODINGS_FILE} not found. Run train_faces.py first.")
+from face_engine import load_gallery
+
+# Load precomputed encodings (gallery file or legacy face_encodings.pkl)
+known_faces = load_gallery()
+if not known_faces:
+    print("Error: no known-face gallery found. Run train_faces.py first.")
     exit(1)
+print("Loaded precomputed encodings.")
 
 # Setup database
 conn = sqlite3.connect("tracking.db")
@@ -137,11 +135,10 @@ while True:
     face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
 
     for face_encoding in face_encodings:
-        matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding)
+        match_name, _ = known_faces.identify([face_encoding], tolerance=0.6)[0]
         name = "Unknown"
-        if True in matches:
-            first_match_index = matches.index(True)
-            name = list(known_faces.keys())[first_match_index]
+        if match_name is not None:
+            name = match_name
         
         time_now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         conn.execute("INSERT INTO logs (name, time, floor) VALUES (?, ?, ?)", (name, time_now, current_floor))
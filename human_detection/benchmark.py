@@ -0,0 +1,164 @@
+"""
+Person Detector Micro-Benchmark
+===============================
+Per-frame latency of the UltraFastDetector pre/post-processing path against
+the previous implementation (fresh np.full letterbox + astype/divide
+temporaries, per-box tuple building), and of the NMS variants in nms.py at
+10, 100 and 1000 candidate boxes.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --size 320 --width 1920 --height 1080
+    python benchmark.py --model weights/model_256.onnx   # also time end-to-end detect
+"""
+
+import time
+import cv2
+import numpy as np
+from argparse import ArgumentParser
+
+from realtime_person_detection import (
+    LetterboxPreprocessor, decode_detections, xywh2xyxy,
+)
+from nms import nms_loop, nms_matrix, nms_opencv
+
+
+def legacy_preprocess(frame, input_size):
+    """Preprocessing as done before the preallocated-buffer engine."""
+    h0, w0 = frame.shape[:2]
+    scale = input_size / max(h0, w0)
+    new_w, new_h = int(w0 * scale), int(h0 * scale)
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_w = (input_size - new_w) // 2
+    pad_h = (input_size - new_h) // 2
+    padded = np.full((input_size, input_size, 3), 114, dtype=np.uint8)
+    padded[pad_h:pad_h+new_h, pad_w:pad_w+new_w] = resized
+
+    blob = padded[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return blob[np.newaxis], scale, pad_w, pad_h
+
+
+def legacy_postprocess(output, shape, scale, pad_w, pad_h, conf=0.5, iou=0.5):
+    """Post-processing as done before: per-box Python tuples."""
+    output = output[0].T
+    output = output[output[:, 4] > conf]
+    if len(output) == 0:
+        return []
+    boxes = xywh2xyxy(output[:, :4])
+    scores = output[:, 4]
+    keep = nms_loop(boxes, scores, iou)
+    boxes, scores = boxes[keep], scores[keep]
+
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad_w) / scale
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad_h) / scale
+    boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, shape[1])
+    boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, shape[0])
+
+    detections = []
+    for b, sc in zip(boxes, scores):
+        detections.append((int(b[0]), int(b[1]), int(b[2]), int(b[3]), sc))
+    return detections
+
+
+def synthetic_output(input_size, persons=8, seed=0):
+    """Raw (1, 5, anchors) output resembling a YOLO head with a few people."""
+    rng = np.random.default_rng(seed)
+    anchors = sum((input_size // s) ** 2 for s in (8, 16, 32))
+    out = np.empty((1, 5, anchors), dtype=np.float32)
+    out[0, 0] = rng.uniform(0, input_size, anchors)
+    out[0, 1] = rng.uniform(0, input_size, anchors)
+    out[0, 2] = rng.uniform(8, input_size / 4, anchors)
+    out[0, 3] = rng.uniform(16, input_size / 2, anchors)
+    out[0, 4] = rng.uniform(0, 0.3, anchors)
+    # Clusters of overlapping confident anchors around each person
+    for p in range(persons):
+        idx = rng.choice(anchors, 6, replace=False)
+        out[0, :4, idx] = out[0, :4, idx[0]] + rng.normal(0, 2, (6, 4))
+        out[0, 4, idx] = rng.uniform(0.55, 0.95, 6)
+    return out
+
+
+def time_ms(fn, repeat):
+    """Median per-call latency in milliseconds (after one warm-up call)."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return 1000 * float(np.median(samples))
+
+
+def run_benchmark(size=256, width=1280, height=720, repeat=200, model=None):
+    frame = np.random.default_rng(1).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    output = synthetic_output(size)
+    preprocess = LetterboxPreprocessor(size)
+
+    _, scale, pad_w, pad_h = legacy_preprocess(frame, size)
+    letterbox = np.array([[scale, pad_w, pad_h]], dtype=np.float32)
+    shapes = np.array([frame.shape[:2]], dtype=np.float32)
+
+    rows = [
+        ("preprocess", lambda: legacy_preprocess(frame, size), lambda: preprocess([frame])),
+        ("postprocess",
+         lambda: legacy_postprocess(output, frame.shape, scale, pad_w, pad_h),
+         lambda: decode_detections(output, letterbox, shapes)),
+    ]
+
+    if model:
+        from realtime_person_detection import UltraFastDetector
+        detector = UltraFastDetector(model, size)
+
+        def legacy_detect():
+            blob, s, pw, ph = legacy_preprocess(frame, size)
+            out = detector.session.run(None, {detector.input_name: blob})[0]
+            return legacy_postprocess(out, frame.shape, s, pw, ph,
+                                      detector.conf_threshold, detector.iou_threshold)
+
+        rows.append(("detect (end-to-end)", legacy_detect, lambda: detector.detect_boxes(frame)))
+
+    print(f"Frame {width}x{height} -> input {size}, median of {repeat} runs")
+    print(f"{'stage':<22}{'legacy ms':>12}{'new ms':>12}{'speedup':>10}")
+    for name, legacy, new in rows:
+        t_old, t_new = time_ms(legacy, repeat), time_ms(new, repeat)
+        print(f"{name:<22}{t_old:>12.3f}{t_new:>12.3f}{t_old / t_new:>9.2f}x")
+
+
+def crowd_boxes(count, seed=0):
+    """`count` candidate boxes in clusters of ~10 overlapping boxes, like a crowded frame."""
+    rng = np.random.default_rng(seed)
+    people = max(1, count // 10)
+    centers = rng.uniform(0, 1000, (people, 2))[rng.integers(0, people, count)]
+    centers += rng.normal(0, 6, (count, 2))
+    sizes = rng.uniform(30, 90, (count, 2))
+    boxes = np.concatenate([centers - sizes / 2, centers + sizes / 2], axis=1).astype(np.float32)
+    scores = rng.uniform(0.5, 1.0, count).astype(np.float32)
+    return boxes, scores
+
+
+def run_nms_benchmark(counts=(10, 100, 1000), repeat=50):
+    variants = [("loop", nms_loop), ("iou-matrix", nms_matrix), ("cv2.dnn", nms_opencv)]
+    print(f"NMS, median of {repeat} runs (ms)")
+    print(f"{'boxes':<8}" + "".join(f"{name:>14}" for name, _ in variants) + f"{'kept':>8}")
+    for count in counts:
+        boxes, scores = crowd_boxes(count)
+        reference = nms_loop(boxes, scores)
+        for name, fn in variants:
+            assert np.array_equal(fn(boxes, scores), reference), name
+        times = [time_ms(lambda fn=fn: fn(boxes, scores), repeat) for _, fn in variants]
+        print(f"{count:<8}" + "".join(f"{t:>14.3f}" for t in times) + f"{len(reference):>8}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument('--size', default=256, type=int, help='Detector input size')
+    parser.add_argument('--width', default=1280, type=int, help='Frame width')
+    parser.add_argument('--height', default=720, type=int, help='Frame height')
+    parser.add_argument('--repeat', default=200, type=int, help='Timed runs per stage')
+    parser.add_argument('--model', default=None, help='ONNX model for an end-to-end comparison')
+    args = parser.parse_args()
+
+    run_benchmark(args.size, args.width, args.height, args.repeat, args.model)
+    print()
+    run_nms_benchmark()
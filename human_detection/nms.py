@@ -0,0 +1,111 @@
+"""
+Non-Maximum Suppression
+=======================
+Greedy NMS for the person and PPE detectors.
+
+OpenCV's cv2.dnn.NMSBoxes is used when available (fastest at every size
+measured, see benchmark.py). Without it, small candidate sets use an
+IoU-matrix variant (one vectorized N x N IoU, then a cheap greedy pass over
+its rows) and larger ones the pure NumPy loop. All three give the same
+result. batched_nms runs per-class or per-image NMS in a single call by
+shifting every group's boxes into its own disjoint coordinate range.
+"""
+
+import cv2
+import numpy as np
+
+# Above this many candidates the N x N IoU matrix stops paying off
+MATRIX_NMS_MAX_BOXES = 256
+
+_HAS_CV2_NMS = hasattr(cv2, 'dnn') and hasattr(cv2.dnn, 'NMSBoxes')
+
+
+def nms_loop(boxes, scores, iou_threshold=0.5):
+    """Reference greedy NMS: a Python loop over the remaining candidates."""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+
+        w = np.maximum(0, xx2 - xx1)
+        h = np.maximum(0, yy2 - yy1)
+        inter = w * h
+
+        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-7)
+        inds = np.where(iou <= iou_threshold)[0]
+        order = order[inds + 1]
+
+    return np.array(keep, dtype=np.intp)
+
+
+def box_iou_matrix(boxes):
+    """Pairwise IoU of (N, 4) x1, y1, x2, y2 boxes as an (N, N) matrix."""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    w = np.maximum(0, np.minimum(x2[:, None], x2) - np.maximum(x1[:, None], x1))
+    h = np.maximum(0, np.minimum(y2[:, None], y2) - np.maximum(y1[:, None], y1))
+    inter = w * h
+    return inter / (areas[:, None] + areas - inter + 1e-7)
+
+
+def nms_matrix(boxes, scores, iou_threshold=0.5):
+    """Greedy NMS over a precomputed IoU matrix; same result as nms_loop."""
+    order = scores.argsort()[::-1]
+    overlaps = box_iou_matrix(boxes[order]) > iou_threshold
+
+    suppressed = np.zeros(len(order), dtype=bool)
+    keep = []
+    for i in range(len(order)):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        suppressed |= overlaps[i]
+    return order[keep]
+
+
+def nms_opencv(boxes, scores, iou_threshold=0.5):
+    """Greedy NMS via cv2.dnn.NMSBoxes (expects x, y, w, h rectangles)."""
+    rects = np.empty((len(boxes), 4), dtype=np.float64)
+    rects[:, :2] = boxes[:, :2]
+    rects[:, 2:] = boxes[:, 2:4] - boxes[:, :2]
+    # Detector scores are already confidence-filtered (> 0), so NMSBoxes only suppresses
+    keep = cv2.dnn.NMSBoxes(rects, scores.astype(np.float32), 0.0, iou_threshold)
+    return np.asarray(keep, dtype=np.intp).reshape(-1)
+
+
+def nms(boxes, scores, iou_threshold=0.5):
+    """Greedy NMS; returns indices of kept boxes, highest score first."""
+    n = len(boxes)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    if _HAS_CV2_NMS:
+        return nms_opencv(boxes, scores, iou_threshold)
+    if n <= MATRIX_NMS_MAX_BOXES:
+        return nms_matrix(boxes, scores, iou_threshold)
+    return nms_loop(boxes, scores, iou_threshold)
+
+
+def batched_nms(boxes, scores, groups, iou_threshold=0.5):
+    """NMS run independently per group (class id or image index) in one call.
+
+    Boxes of different groups are shifted into disjoint coordinate ranges so
+    they can never suppress each other. Returns kept indices, highest score
+    first.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+    groups = np.asarray(groups)
+    if groups.min() == groups.max():
+        return nms(boxes, scores, iou_threshold)
+    span = float(boxes[:, :4].max() - min(0.0, float(boxes[:, :4].min()))) + 1.0
+    offsets = (groups.astype(boxes.dtype) * span)[:, None]
+    return nms(boxes[:, :4] + offsets, scores, iou_threshold)
@@ -0,0 +1,189 @@
+"""
+INT8 Person Model Quantization
+==============================
+Produces an INT8 variant of an exported person-detection ONNX model and
+reports how it compares with the FP32 model (person-count agreement and
+latency) on held-out frames.
+
+Static quantization (default) calibrates activation ranges on frames from
+the evidence/ directory; dynamic quantization only quantizes weights and
+needs no calibration data. The output is written next to the input as
+model_<size>_int8.onnx, which UltraFastDetector(..., int8=True) and
+`realtime_person_detection.py --int8` load.
+
+Usage:
+    python quantize_model.py
+    python quantize_model.py --model weights/model_320.onnx --size 320
+    python quantize_model.py --mode dynamic --report int8_report.json
+"""
+
+import os
+import json
+import random
+import time
+import cv2
+import numpy as np
+from argparse import ArgumentParser
+
+from realtime_person_detection import (
+    LetterboxPreprocessor, UltraFastDetector, int8_model_path,
+)
+
+EVIDENCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "evidence")
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def list_frames(frames_dir, seed=0):
+    """Image paths under `frames_dir`, in a reproducible shuffled order."""
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(frames_dir)
+        for name in names if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    random.Random(seed).shuffle(paths)
+    return paths
+
+
+def load_frames(paths):
+    frames = []
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is not None:
+            frames.append(frame)
+    return frames
+
+
+def quantize(model_path, output_path, mode='static', calibration_frames=(), input_size=256):
+    """Write an INT8 copy of `model_path` to `output_path`."""
+    from onnxruntime.quantization import (
+        CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType,
+        quantize_dynamic, quantize_static,
+    )
+
+    # Only the convolutions are quantized: the detection head's decode
+    # (sigmoid/mul/concat mixing pixel coordinates with 0-1 scores in one
+    # tensor) would lose most of its score resolution at 8 bits.
+    op_types = ['Conv', 'MatMul']
+
+    if mode == 'dynamic':
+        quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8,
+                         op_types_to_quantize=op_types)
+        return
+
+    import onnxruntime as ort
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    # Shape inference + graph optimization first, as recommended for static quantization
+    prepared_path = f"{os.path.splitext(output_path)[0]}_prep.onnx"
+    quant_pre_process(model_path, prepared_path, skip_symbolic_shape=True)
+    input_name = ort.InferenceSession(prepared_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+    preprocess = LetterboxPreprocessor(input_size)
+
+    class FrameReader(CalibrationDataReader):
+        """Feeds letterboxed evidence frames to the calibrator, one at a time."""
+
+        def __init__(self, frames):
+            self._frames = iter(frames)
+
+        def get_next(self):
+            frame = next(self._frames, None)
+            if frame is None:
+                return None
+            blob, _ = preprocess([frame])
+            return {input_name: blob.copy()}
+
+    try:
+        quantize_static(
+            prepared_path, output_path, FrameReader(calibration_frames),
+            quant_format=QuantFormat.QDQ,
+            op_types_to_quantize=op_types,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+    finally:
+        os.remove(prepared_path)
+
+
+def compare(model_path, frames, input_size=256, conf=0.5, threads=4):
+    """Person-count agreement and latency of the INT8 model against FP32."""
+    fp32 = UltraFastDetector(model_path, input_size, conf, intra_op_threads=threads)
+    int8 = UltraFastDetector(model_path, input_size, conf, intra_op_threads=threads, int8=True)
+
+    counts = {"fp32": [], "int8": []}
+    latency = {"fp32": [], "int8": []}
+    for frame in frames:
+        for name, detector in (("fp32", fp32), ("int8", int8)):
+            start = time.perf_counter()
+            boxes = detector.detect_boxes(frame)
+            latency[name].append(time.perf_counter() - start)
+            counts[name].append(len(boxes))
+
+    fp32_counts, int8_counts = np.array(counts["fp32"]), np.array(counts["int8"])
+    report = {
+        "frames": len(frames),
+        "input_size": input_size,
+        "count_agreement": float(np.mean(fp32_counts == int8_counts)) if len(frames) else 0.0,
+        "count_mean_abs_error": float(np.mean(np.abs(fp32_counts - int8_counts))) if len(frames) else 0.0,
+        "persons_fp32": int(fp32_counts.sum()),
+        "persons_int8": int(int8_counts.sum()),
+    }
+    for name in ("fp32", "int8"):
+        samples = np.array(latency[name]) * 1000
+        report[f"{name}_latency_ms"] = {
+            "mean": round(float(samples.mean()), 3) if len(samples) else 0.0,
+            "p50": round(float(np.percentile(samples, 50)), 3) if len(samples) else 0.0,
+            "p95": round(float(np.percentile(samples, 95)), 3) if len(samples) else 0.0,
+        }
+    fp32_mean = report["fp32_latency_ms"]["mean"]
+    int8_mean = report["int8_latency_ms"]["mean"]
+    report["speedup"] = round(fp32_mean / int8_mean, 2) if int8_mean else 0.0
+    return report
+
+
+def print_report(report):
+    print(f"\nINT8 vs FP32 on {report['frames']} held-out frames (input {report['input_size']})")
+    print(f"  Person-count agreement: {report['count_agreement'] * 100:.1f}% "
+          f"(mean abs error {report['count_mean_abs_error']:.2f}, "
+          f"persons {report['persons_fp32']} -> {report['persons_int8']})")
+    for name in ("fp32", "int8"):
+        lat = report[f"{name}_latency_ms"]
+        print(f"  {name.upper()} latency: mean {lat['mean']:.2f} ms, p50 {lat['p50']:.2f} ms, p95 {lat['p95']:.2f} ms")
+    print(f"  Speedup: {report['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument('--model', default='./weights/model_256.onnx', help='FP32 ONNX model')
+    parser.add_argument('--size', default=256, type=int, help='Model input size')
+    parser.add_argument('--mode', default='static', choices=['static', 'dynamic'], help='Quantization mode')
+    parser.add_argument('--frames', default=EVIDENCE_DIR, help='Calibration/evaluation frames directory')
+    parser.add_argument('--calib', default=100, type=int, help='Frames used for calibration')
+    parser.add_argument('--eval', default=200, type=int, help='Held-out frames used for the report')
+    parser.add_argument('--conf', default=0.5, type=float, help='Confidence')
+    parser.add_argument('--threads', default=4, type=int, help='Intra-op threads for the latency run')
+    parser.add_argument('--report', default=None, help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    paths = list_frames(args.frames)
+    if not paths:
+        raise SystemExit(f"No frames found in {args.frames}")
+    calib_paths, eval_paths = paths[:args.calib], paths[args.calib:args.calib + args.eval]
+    if not eval_paths:
+        print("Not enough frames for a held-out set, evaluating on the calibration frames")
+        eval_paths = calib_paths
+
+    output_path = int8_model_path(args.model)
+    print(f"Quantizing {args.model} ({args.mode}, {len(calib_paths)} calibration frames)...")
+    quantize(args.model, output_path, args.mode,
+             load_frames(calib_paths) if args.mode == 'static' else (), args.size)
+    print(f"Saved INT8 model: {output_path}")
+
+    report = compare(args.model, load_frames(eval_paths), args.size, args.conf, args.threads)
+    report["mode"] = args.mode
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.report}")
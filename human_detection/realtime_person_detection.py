@@ -11,11 +11,19 @@ Press 'q' to quit.
 """
 
 import os
+import queue
+import time
 import cv2
 import numpy as np
-from threading import Thread
+from contextlib import contextmanager
+from threading import Lock, Thread
 from argparse import ArgumentParser
 
+try:
+    from .nms import batched_nms, nms_loop
+except ImportError:  # run as a script from this directory
+    from nms import batched_nms, nms_loop
+
 
 def convert_to_onnx(weights_path, onnx_path, input_size=256):
     """Convert PyTorch model to ONNX for fast CPU inference."""
@@ -42,6 +50,12 @@ def convert_to_onnx(weights_path, onnx_path, input_size=256):
     print(f"Saved ONNX model: {onnx_path}")
 
 
+def int8_model_path(onnx_path):
+    """Path of the INT8 variant written by quantize_model.py for `onnx_path`."""
+    root, ext = os.path.splitext(onnx_path)
+    return f"{root}_int8{ext}"
+
+
 def xywh2xyxy(x):
     """Convert boxes from (cx,cy,w,h) to (x1,y1,x2,y2)."""
     y = np.copy(x)
@@ -52,108 +66,279 @@ def xywh2xyxy(x):
     return y
 
 
-def nms_numpy(boxes, scores, iou_threshold=0.5):
-    """Pure NumPy NMS for speed."""
-    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
-    areas = (x2 - x1) * (y2 - y1)
-    order = scores.argsort()[::-1]
-    
-    keep = []
-    while order.size > 0:
-        i = order[0]
-        keep.append(i)
+# Previous name of the reference loop NMS
+nms_numpy = nms_loop
+
+
+class LetterboxPreprocessor:
+    """Letterbox + normalize frames into preallocated network input tensors.
+    
+    One padded uint8 NHWC buffer and one float32 NCHW blob are kept per batch
+    size, so steady-state preprocessing allocates nothing frame-sized:
+    BGR->RGB, HWC->CHW and /255 are done in a single pass into the blob, and
+    the grey border is only repainted when a slot's frame shape changes.
+    """
+    
+    def __init__(self, input_size=256):
+        self.input_size = input_size
+        self._buffers = {}
+    
+    def _input_buffers(self, n):
+        """Reusable (padded uint8 NHWC, float32 NCHW blob, last frame shape per slot) for batch size n."""
+        buffers = self._buffers.get(n)
+        if buffers is None:
+            size = self.input_size
+            buffers = (
+                np.full((n, size, size, 3), 114, dtype=np.uint8),
+                np.empty((n, 3, size, size), dtype=np.float32),
+                [None] * n,
+            )
+            self._buffers[n] = buffers
+        return buffers
+    
+    def _letterbox(self, frame, out, repaint=True):
+        """Letterbox `frame` into the (size, size, 3) uint8 array `out`; returns (scale, pad_w, pad_h).
+        
+        With repaint=False the grey border already in `out` is kept, which is
+        valid when `out` last held a frame of the same shape.
+        """
+        h0, w0 = frame.shape[:2]
         
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
+        # Fast letterbox resize
+        scale = self.input_size / max(h0, w0)
+        new_w, new_h = int(w0 * scale), int(h0 * scale)
         
-        w = np.maximum(0, xx2 - xx1)
-        h = np.maximum(0, yy2 - yy1)
-        inter = w * h
+        resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
         
-        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-7)
-        inds = np.where(iou <= iou_threshold)[0]
-        order = order[inds + 1]
+        # Pad
+        pad_w = (self.input_size - new_w) // 2
+        pad_h = (self.input_size - new_h) // 2
+        
+        if repaint:
+            out[:] = 114
+        out[pad_h:pad_h+new_h, pad_w:pad_w+new_w] = resized
+        return scale, pad_w, pad_h
     
-    return keep
+    def __call__(self, frames):
+        """Returns (blob, letterbox): the (n, 3, size, size) float32 network input
+        and (scale, pad_w, pad_h) per frame. The blob is overwritten by the next
+        call with the same batch size.
+        """
+        padded, blob, last_shapes = self._input_buffers(len(frames))
+        letterbox = np.empty((len(frames), 3), dtype=np.float32)
+        for i, frame in enumerate(frames):
+            letterbox[i] = self._letterbox(frame, padded[i], repaint=last_shapes[i] != frame.shape[:2])
+            last_shapes[i] = frame.shape[:2]
+        
+        # BGR->RGB, NHWC->NCHW and normalize in a single pass into the blob
+        np.divide(padded[..., ::-1].transpose(0, 3, 1, 2), np.float32(255.0),
+                  out=blob, dtype=np.float32, casting='unsafe')
+        return blob, letterbox
+
+
+def decode_detections(output, letterbox, shapes, conf=0.5, iou=0.5):
+    """Turn raw (n, 5, num_anchors) model output into per-image detections.
+    
+    `letterbox` is the (n, 3) scale, pad_w, pad_h from LetterboxPreprocessor
+    and `shapes` the (n, 2) original h, w. Returns one (N, 5) float32 array of
+    (x1, y1, x2, y2, conf) per image, coordinates truncated to whole pixels,
+    highest score first.
+    """
+    n = len(output)
+    
+    # Filter by confidence across the whole batch (on the score row, without
+    # transposing the full output)
+    img_idx, anchor_idx = np.nonzero(output[:, 4, :] > conf)
+    if len(img_idx) == 0:
+        return [np.empty((0, 5), dtype=np.float32) for _ in range(n)]
+    selected = output[img_idx, :, anchor_idx]  # (k, 5)
+    scores = selected[:, 4]
+    
+    # Convert boxes
+    boxes = xywh2xyxy(selected[:, :4])
+    
+    # NMS for all images at once, per image
+    keep = batched_nms(boxes, scores, img_idx, iou)
+    boxes, scores, img_idx = boxes[keep], scores[keep], img_idx[keep]
+    
+    # Scale back to original images
+    scale, pad_w, pad_h = letterbox[img_idx, 0], letterbox[img_idx, 1], letterbox[img_idx, 2]
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad_w[:, None]) / scale[:, None]
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad_h[:, None]) / scale[:, None]
+    
+    # Clip
+    h0, w0 = shapes[img_idx, 0], shapes[img_idx, 1]
+    boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, w0[:, None])
+    boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, h0[:, None])
+    
+    # Split per image, keeping NMS (score) order within each image
+    detections = np.empty((len(boxes), 5), dtype=np.float32)
+    np.trunc(boxes, out=detections[:, :4])
+    detections[:, 4] = scores
+    if n == 1:
+        return [detections]
+    order = np.argsort(img_idx, kind='stable')
+    counts = np.bincount(img_idx, minlength=n)
+    return np.split(detections[order], np.cumsum(counts)[:-1])
 
 
 class UltraFastDetector:
     """Ultra-fast detector using ONNX Runtime."""
     
-    def __init__(self, onnx_path, input_size=256, conf=0.5, iou=0.5):
+    def __init__(self, onnx_path, input_size=256, conf=0.5, iou=0.5, intra_op_threads=4,
+                 int8=False):
         import onnxruntime as ort
         
+        # INT8 variant produced by quantize_model.py next to the FP32 model
+        if int8:
+            onnx_path = int8_model_path(onnx_path)
+        self.model_path = onnx_path
+        self.int8 = int8
         self.input_size = input_size
         self.conf_threshold = conf
         self.iou_threshold = iou
+        self.preprocess = LetterboxPreprocessor(input_size)
         
         # ONNX Runtime with optimizations
         opts = ort.SessionOptions()
         opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-        opts.intra_op_num_threads = 4
+        opts.intra_op_num_threads = intra_op_threads
+        opts.inter_op_num_threads = 1
         
         self.session = ort.InferenceSession(onnx_path, opts, providers=['CPUExecutionProvider'])
         self.input_name = self.session.get_inputs()[0].name
+        # Fixed batch size of the exported model (None if the batch axis is dynamic)
+        batch_dim = self.session.get_inputs()[0].shape[0]
+        self.max_batch = batch_dim if isinstance(batch_dim, int) and batch_dim > 0 else None
         
         # Warm up
         dummy = np.zeros((1, 3, input_size, input_size), dtype=np.float32)
         self.session.run(None, {self.input_name: dummy})
-        print("ONNX Runtime ready!")
+        print(f"ONNX Runtime ready! ({'INT8' if int8 else 'FP32'})")
     
     def detect(self, frame):
-        h0, w0 = frame.shape[:2]
-        
-        # Fast letterbox resize
-        scale = self.input_size / max(h0, w0)
-        new_w, new_h = int(w0 * scale), int(h0 * scale)
-        
-        resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-        
-        # Pad
-        pad_w = (self.input_size - new_w) // 2
-        pad_h = (self.input_size - new_h) // 2
-        
-        padded = np.full((self.input_size, self.input_size, 3), 114, dtype=np.uint8)
-        padded[pad_h:pad_h+new_h, pad_w:pad_w+new_w] = resized
-        
-        # Preprocess: HWC->CHW, BGR->RGB, normalize
-        blob = padded[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
-        blob = blob[np.newaxis, ...]
-        
-        # Inference
-        output = self.session.run(None, {self.input_name: blob})[0][0]
-        
-        # Post-process: output shape is (5, num_anchors) for 1 class
-        output = output.T  # (num_anchors, 5)
-        
-        # Filter by confidence
-        scores = output[:, 4]
-        mask = scores > self.conf_threshold
-        output = output[mask]
-        scores = scores[mask]
+        return self.detect_batch([frame])[0]
+    
+    def detect_batch(self, frames):
+        """Detect persons in several frames; returns one [(x1, y1, x2, y2, conf), ...] list per frame."""
+        return [[(int(x1), int(y1), int(x2), int(y2), conf) for x1, y1, x2, y2, conf in boxes.tolist()]
+                for boxes in self.detect_boxes_batch(frames)]
+    
+    def detect_boxes(self, frame):
+        """Detect persons in one frame; returns an (N, 5) float32 array of x1, y1, x2, y2, conf."""
+        return self.detect_boxes_batch([frame])[0]
+    
+    def detect_boxes_batch(self, frames):
+        """Detect persons in several frames with one session call per batch.
         
-        if len(output) == 0:
+        Returns one (N, 5) float32 array per frame (see decode_detections).
+        Models exported without a dynamic batch axis are run in chunks of
+        their fixed batch size.
+        """
+        if len(frames) == 0:
             return []
+        if self.max_batch and len(frames) > self.max_batch:
+            results = []
+            for i in range(0, len(frames), self.max_batch):
+                results.extend(self.detect_boxes_batch(frames[i:i + self.max_batch]))
+            return results
         
-        # Convert boxes
-        boxes = xywh2xyxy(output[:, :4])
+        blob, letterbox = self.preprocess(frames)
+        shapes = np.array([f.shape[:2] for f in frames], dtype=np.float32)  # (n, 2): h0, w0
         
-        # NMS
-        keep = nms_numpy(boxes, scores, self.iou_threshold)
-        boxes = boxes[keep]
-        scores = scores[keep]
-        
-        # Scale back to original image
-        boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad_w) / scale
-        boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad_h) / scale
+        # Inference: output shape is (n, 5, num_anchors) for 1 class
+        output = self.session.run(None, {self.input_name: blob})[0]
+        return decode_detections(output, letterbox, shapes,
+                                 self.conf_threshold, self.iou_threshold)
+
+
+class DetectorPool:
+    """Pool of UltraFastDetector sessions for concurrent inference.
+    
+    The CPU budget (all cores by default) is split between the sessions, so
+    e.g. 16 cores give 4 sessions x 4 intra-op threads: four cameras can run
+    inference at once instead of queueing behind a single session. Callers
+    borrow an idle session; wait time and queue depth are tracked for tuning.
+    """
+    
+    def __init__(self, onnx_path, input_size=256, conf=0.5, iou=0.5,
+                 sessions=None, threads_per_session=None, cpu_budget=None, int8=False):
+        cpu_budget = cpu_budget or os.cpu_count() or 4
+        sessions = sessions or max(1, cpu_budget // 4)
+        threads_per_session = threads_per_session or max(1, cpu_budget // sessions)
         
-        # Clip
-        boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, w0)
-        boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, h0)
+        self.input_size = input_size
+        self.int8 = int8
+        self.sessions = sessions
+        self.threads_per_session = threads_per_session
+        self._idle = queue.Queue()
+        for _ in range(sessions):
+            self._idle.put(UltraFastDetector(onnx_path, input_size, conf, iou,
+                                             intra_op_threads=threads_per_session, int8=int8))
         
-        return [(int(b[0]), int(b[1]), int(b[2]), int(b[3]), s) for b, s in zip(boxes, scores)]
+        self._stats_lock = Lock()
+        self._waiting = 0
+        self._max_waiting = 0
+        self._requests = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._infer_total = 0.0
+        print(f"Detector pool ready: {sessions} sessions x {threads_per_session} threads")
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow an idle detector session (blocks while all are busy)."""
+        start = time.perf_counter()
+        with self._stats_lock:
+            self._waiting += 1
+            self._max_waiting = max(self._max_waiting, self._waiting)
+        detector = self._idle.get()
+        acquired = time.perf_counter()
+        with self._stats_lock:
+            self._waiting -= 1
+            self._requests += 1
+            wait = acquired - start
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        try:
+            yield detector
+        finally:
+            self._idle.put(detector)
+            with self._stats_lock:
+                self._infer_total += time.perf_counter() - acquired
+    
+    def detect(self, frame):
+        with self.acquire() as detector:
+            return detector.detect(frame)
+    
+    def detect_batch(self, frames):
+        with self.acquire() as detector:
+            return detector.detect_batch(frames)
+    
+    def detect_boxes(self, frame):
+        with self.acquire() as detector:
+            return detector.detect_boxes(frame)
+    
+    def detect_boxes_batch(self, frames):
+        with self.acquire() as detector:
+            return detector.detect_boxes_batch(frames)
+    
+    def stats(self):
+        """Queue depth and wait/inference time metrics."""
+        with self._stats_lock:
+            requests = self._requests
+            return {
+                "precision": "int8" if self.int8 else "fp32",
+                "sessions": self.sessions,
+                "threads_per_session": self.threads_per_session,
+                "busy_sessions": self.sessions - self._idle.qsize(),
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_waiting,
+                "requests": requests,
+                "avg_wait_ms": round(1000 * self._wait_total / requests, 2) if requests else 0.0,
+                "max_wait_ms": round(1000 * self._wait_max, 2),
+                "avg_inference_ms": round(1000 * self._infer_total / requests, 2) if requests else 0.0,
+            }
 
 
 class VideoCaptureFast:
@@ -180,7 +365,7 @@ class VideoCaptureFast:
         self.cap.release()
 
 
-def run_detection(source='0', input_size=256, conf=0.5, skip=2):
+def run_detection(source='0', input_size=256, conf=0.5, skip=2, int8=False):
     """Run ultra-fast detection."""
     
     weights_path = './weights/best.pt'
@@ -191,7 +376,7 @@ def run_detection(source='0', input_size=256, conf=0.5, skip=2):
         convert_to_onnx(weights_path, onnx_path, input_size)
     
     # Initialize
-    detector = UltraFastDetector(onnx_path, input_size, conf)
+    detector = UltraFastDetector(onnx_path, input_size, conf, int8=int8)
     
     src = int(source) if source.isdigit() else source
     cap = VideoCaptureFast(src)
@@ -270,6 +455,7 @@ if __name__ == "__main__":
     parser.add_argument('--size', default=256, type=int, help='Input size (smaller=faster)')
     parser.add_argument('--conf', default=0.5, type=float, help='Confidence')
     parser.add_argument('--skip', default=2, type=int, help='Process every Nth frame')
+    parser.add_argument('--int8', action='store_true', help='Use the INT8 model from quantize_model.py')
     args = parser.parse_args()
     
-    run_detection(args.source, args.size, args.conf, args.skip)
+    run_detection(args.source, args.size, args.conf, args.skip, args.int8)
@@ -0,0 +1,146 @@
+"""
+SORT Person Tracker
+===================
+Simple Online and Realtime Tracking over UltraFastDetector person boxes: a
+constant-velocity Kalman filter per track and Hungarian assignment on IoU
+between predicted tracks and new detections.
+
+Each camera gets its own Sort instance, so track ids are persistent per
+camera. update() returns one track id per detection, which lets callers
+cache per-person state (e.g. a recognized identity) by track id.
+"""
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU between (N, 4) and (M, 4) x1, y1, x2, y2 boxes."""
+    ax1, ay1, ax2, ay2 = (boxes_a[:, i][:, None] for i in range(4))
+    bx1, by1, bx2, by2 = (boxes_b[:, i] for i in range(4))
+    w = np.maximum(0, np.minimum(ax2, bx2) - np.maximum(ax1, bx1))
+    h = np.maximum(0, np.minimum(ay2, by2) - np.maximum(ay1, by1))
+    inter = w * h
+    area_a = (ax2 - ax1) * (ay2 - ay1)
+    area_b = (bx2 - bx1) * (by2 - by1)
+    return inter / (area_a + area_b - inter + 1e-7)
+
+
+def _box_to_z(box):
+    """x1, y1, x2, y2 -> measurement [cx, cy, area, aspect]."""
+    w, h = box[2] - box[0], box[3] - box[1]
+    return np.array([box[0] + w / 2, box[1] + h / 2, w * h, w / max(h, 1e-6)])
+
+
+def _x_to_box(x):
+    """Kalman state [cx, cy, area, aspect, ...] -> x1, y1, x2, y2."""
+    area, aspect = max(x[2], 1e-6), max(x[3], 1e-6)
+    w = np.sqrt(area * aspect)
+    h = area / w
+    return np.array([x[0] - w / 2, x[1] - h / 2, x[0] + w / 2, x[1] + h / 2])
+
+
+class KalmanBoxTracker:
+    """One tracked box: constant-velocity model over (cx, cy, area) with fixed aspect."""
+
+    # State transition and measurement models (state: cx, cy, s, r, vcx, vcy, vs)
+    F = np.eye(7)
+    F[0, 4] = F[1, 5] = F[2, 6] = 1.0
+    H = np.eye(4, 7)
+
+    def __init__(self, box, track_id):
+        self.id = track_id
+        self.x = np.zeros(7)
+        self.x[:4] = _box_to_z(box)
+
+        # Covariances as in the SORT paper: high uncertainty on unseen velocities
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+        self.Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 1e-4])
+        self.R = np.diag([1.0, 1.0, 10.0, 10.0])
+
+        self.hits = 1
+        self.hit_streak = 1
+        self.age = 0
+        self.time_since_update = 0
+
+    def predict(self):
+        """Advance the state one step; returns the predicted box."""
+        # Keep the area non-negative
+        if self.x[2] + self.x[6] <= 0:
+            self.x[6] = 0.0
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        self.age += 1
+        if self.time_since_update > 0:
+            self.hit_streak = 0
+        self.time_since_update += 1
+        return _x_to_box(self.x)
+
+    def update(self, box):
+        """Correct the state with a matched detection."""
+        z = _box_to_z(box)
+        y = z - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(7) - K @ self.H) @ self.P
+
+        self.hits += 1
+        self.hit_streak += 1
+        self.time_since_update = 0
+
+    @property
+    def box(self):
+        return _x_to_box(self.x)
+
+
+class Sort:
+    """Multi-object tracker assigning persistent ids to per-frame detections."""
+
+    def __init__(self, max_age=3, iou_threshold=0.3):
+        self.max_age = max_age
+        self.iou_threshold = iou_threshold
+        self.tracks = []
+        self.expired = []          # ids dropped by the last update()
+        self._next_id = 1
+
+    def update(self, detections):
+        """Match (N, 4+) x1, y1, x2, y2[, conf] detections to tracks.
+
+        Returns an (N,) int array with the track id of every detection
+        (unmatched detections start new tracks). Tracks unmatched for more
+        than max_age updates are dropped and listed in self.expired.
+        """
+        if len(detections):
+            detections = np.asarray(detections, dtype=np.float64)[:, :4]
+        else:
+            detections = np.empty((0, 4))
+        predicted = np.array([t.predict() for t in self.tracks]).reshape(-1, 4)
+
+        matches = []
+        unmatched = set(range(len(detections)))
+        if len(detections) and len(predicted):
+            ious = iou_matrix(detections, predicted)
+            rows, cols = linear_sum_assignment(-ious)
+            for d, t in zip(rows, cols):
+                if ious[d, t] >= self.iou_threshold:
+                    matches.append((d, t))
+                    unmatched.discard(d)
+
+        track_ids = np.zeros(len(detections), dtype=np.int64)
+        for d, t in matches:
+            self.tracks[t].update(detections[d])
+            track_ids[d] = self.tracks[t].id
+        for d in sorted(unmatched):
+            track = KalmanBoxTracker(detections[d], self._next_id)
+            self._next_id += 1
+            self.tracks.append(track)
+            track_ids[d] = track.id
+
+        self.expired = [t.id for t in self.tracks if t.time_since_update > self.max_age]
+        self.tracks = [t for t in self.tracks if t.time_since_update <= self.max_age]
+        return track_ids
+
+    @property
+    def active_ids(self):
+        return [t.id for t in self.tracks]
@@ -231,7 +231,6 @@
 import cv2
 import face_recognition
 import sqlite3
-import pickle
 import threading
 import queue
 import os
@@ -243,6 +242,7 @@ import numpy as np
 
 # Import settings from the configuration file
 import config
+from face_engine import create_face_detector, load_gallery
 
 # --- Global Control ---
 shutdown_event = threading.Event()
@@ -251,18 +251,18 @@ db_queue = queue.Queue()
 # New: Queue for face detection results to display bounding boxes
 face_results_queue = queue.Queue(maxsize=100)
 
-# --- Load Known Faces (No Changes) ---
+# --- Load Known Faces ---
 def load_known_faces():
-    """Loads face encodings from the pickle file."""
+    """Loads the known-face gallery (config.GALLERY_FILE, or the legacy pickle)."""
     try:
-        with open(config.ENCODINGS_FILE, "rb") as f:
-            return pickle.load(f)
-    except FileNotFoundError:
-        print(f"[ERROR] Encodings file not found: {config.ENCODINGS_FILE}")
-        sys.exit(1)
+        gallery = load_gallery(config.GALLERY_FILE, config.ENCODINGS_FILE)
     except Exception as e:
         print(f"[ERROR] Could not load face encodings: {e}")
         sys.exit(1)
+    if not gallery:
+        print(f"[ERROR] No known faces found in {config.GALLERY_FILE} or {config.ENCODINGS_FILE}")
+        sys.exit(1)
+    return gallery
 
 # # --- Camera Streaming Thread (No Changes) ---
 # class CameraStreamer(threading.Thread):
@@ -590,9 +590,10 @@ class GridDisplay:
 # --- Face Processing Thread (OPTIMIZED FOR RTSP WITH VISUALIZATION) ---
 class FaceProcessor(threading.Thread):
     """A thread that processes frames from the queue for face recognition."""
-    def __init__(self, known_faces):
+    def __init__(self, gallery):
         super().__init__()
-        self.known_faces = known_faces
+        self.gallery = gallery
+        self.face_detector = create_face_detector(config.FACE_DETECTION_MODEL)
         self.frame_count = 0
         self.daemon = True
 
@@ -641,10 +642,8 @@ class FaceProcessor(threading.Thread):
                     # Convert to RGB for face_recognition library
                     rgb_frame = cv2.cvtColor(processing_frame, cv2.COLOR_BGR2RGB)
 
-                    # Find faces with reduced upsampling for speed
-                    face_locations = face_recognition.face_locations(rgb_frame, 
-                                                                    number_of_times_to_upsample=1,
-                                                                    model=config.FACE_DETECTION_MODEL)
+                    # Find faces with the configured detector backend (BGR input)
+                    face_locations = self.face_detector.detect(processing_frame)
                     
                     face_results = []  # Store results for visualization
                     
@@ -652,17 +651,19 @@ class FaceProcessor(threading.Thread):
                         print(f"[DEBUG] Found {len(face_locations)} faces in {location}")
                         
                         face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+                        # One gallery pass for all faces in the frame
+                        best_indices, best_distances = self.gallery.match(face_encodings)
 
-                        for i, (encoding, face_location) in enumerate(zip(face_encodings, face_locations)):
+                        for i, face_location in enumerate(face_locations):
                             if shutdown_event.is_set():
                                 break
                                 
-                            distances = face_recognition.face_distance(list(self.known_faces.values()), encoding)
-                            if len(distances) == 0:
+                            best_match_index = best_indices[i]
+                            if best_match_index < 0:
                                 continue
                             
-                            best_match_index = np.argmin(distances)
-                            confidence = 1.0 - distances[best_match_index]
+                            best_distance = float(best_distances[i])
+                            confidence = 1.0 - best_distance
                             
                             # Adjust face location for cropping offset and scale to display size
                             top, right, bottom, left = face_location
@@ -675,8 +676,8 @@ class FaceProcessor(threading.Thread):
                             color = (0, 0, 255)  # Red for unknown
                             
                             # Lower threshold for better detection
-                            if distances[best_match_index] < 0.6:  # Increased from 0.5 to 0.6
-                                name = list(self.known_faces.keys())[best_match_index]
+                            if best_distance < 0.6:  # Increased from 0.5 to 0.6
+                                name = self.gallery.names[best_match_index]
                                 color = (0, 255, 0)  # Green for known
                                 
                                 print(f"[DETECTED] Found {name} with confidence {confidence:.2f} at {location}")
@@ -785,8 +786,8 @@ def main():
     signal.signal(signal.SIGTERM, handle_exit)
 
     os.makedirs(config.EVIDENCE_DIR, exist_ok=True)
-    known_faces = load_known_faces()
-    print(f"[INFO] Loaded {len(known_faces)} known faces.")
+    gallery = load_known_faces()
+    print(f"[INFO] Loaded {len(gallery.person_names)} known faces ({len(gallery)} encodings).")
 
     # Validate camera configuration
     num_cameras = len(config.CAMERA_STREAMS)
@@ -802,7 +803,7 @@ def main():
     grid_display = GridDisplay()
 
     threads = [
-        FaceProcessor(known_faces),
+        FaceProcessor(gallery),
         DatabaseWriter()
     ]
     
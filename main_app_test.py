@@ -18,6 +18,7 @@ import numpy as np
 
 # Import settings from the configuration file
 import config
+from face_engine import FaceGallery
 
 # --- Global Control ---
 shutdown_event = threading.Event()
@@ -29,7 +30,7 @@ def load_known_faces():
     """Loads face encodings from the pickle file."""
     try:
         with open(config.ENCODINGS_FILE, "rb") as f:
-            return pickle.load(f)
+            return FaceGallery.from_dict(pickle.load(f))
     except FileNotFoundError:
         print(f"[ERROR] Encodings file not found: {config.ENCODINGS_FILE}")
         sys.exit(1)
@@ -128,13 +129,8 @@ class FaceProcessor(threading.Thread):
                         if shutdown_event.is_set():
                             break
                             
-                        distances = face_recognition.face_distance(list(self.known_faces.values()), encoding)
-                        if len(distances) == 0:
-                            continue
-                        
-                        best_match_index = np.argmin(distances)
-                        if distances[best_match_index] < 0.5:
-                            name = list(self.known_faces.keys())[best_match_index]
+                        name, _ = self.known_faces.identify([encoding], tolerance=0.5)[0]
+                        if name is not None:
                             
                             timestamp = datetime.now()
                             safe_time = timestamp.strftime("%Y%m%d_%H%M%S")
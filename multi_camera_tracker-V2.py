@@ -175,15 +175,14 @@
 import cv2
 import face_recognition
 import sqlite3
-import pickle
 import os
 import yaml
 import threading
 import queue
 import time
 from datetime import datetime
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+
+from face_engine import GalleryManager
 
 # Load config
 def load_config():
@@ -199,30 +198,14 @@ DEBOUNCE_SECONDS = config["debounce_seconds"]
 EVIDENCE_DIR = config["evidence_dir"]
 PROCESS_EVERY_N_FRAMES = config["process_every_n_frames"]
 
-# Load known faces
-def load_encodings():
-    try:
-        with open(ENCODINGS_FILE, "rb") as f:
-            data = pickle.load(f)
-        print("Loaded encodings.")
-        return data
-    except FileNotFoundError:
-        print("Error: Encodings file not found.")
-        exit(1)
-
-known_faces = load_encodings()
-
-# Watch for changes to the encodings file
-class EncodingChangeHandler(FileSystemEventHandler):
-    def on_modified(self, event):
-        global known_faces
-        if event.src_path.endswith(ENCODINGS_FILE):
-            print("Encodings file changed. Reloading...")
-            known_faces = load_encodings()
-
-observer = Observer()
-observer.schedule(EncodingChangeHandler(), path=".", recursive=False)
-observer.start()
+# Load known encodings (gallery file or legacy pickle) as a versioned snapshot;
+# the manager reloads it off-thread when the file changes
+gallery_manager = GalleryManager(ENCODINGS_FILE)
+if not gallery_manager.gallery:
+    print("Error: Encodings file not found.")
+    exit(1)
+print(f"Known faces: {', '.join(gallery_manager.gallery.person_names)}")
+gallery_manager.watch()
 
 # Setup database
 conn = sqlite3.connect(DB_FILE, check_same_thread=False)
@@ -304,15 +287,13 @@ def process_camera(camera_index, floor):
             rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
             face_locations = face_recognition.face_locations(rgb_frame, number_of_times_to_upsample=1)
             face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+            gallery = gallery_manager.gallery  # one known-face snapshot for the whole frame
 
             for face_encoding, face_location in zip(face_encodings, face_locations):
-                distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
-                min_distance = min(distances) if len(distances) > 0 else 1.0
-                matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.5)
+                match_name, min_distance = gallery.identify([face_encoding], tolerance=0.5)[0]
                 name = "Unknown"
-                if True in matches:
-                    index = matches.index(True)
-                    name = list(known_faces.keys())[index]
+                if match_name is not None:
+                    name = match_name
 
                 if name != "Unknown":
                     time_now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -350,7 +331,6 @@ except KeyboardInterrupt:
 # Wait for queue to empty and clean up
 writer_thread.join()
 detection_queue.join()
-observer.stop()
-observer.join()
+gallery_manager.stop()
 conn.close()
 print("Shutdown complete.")
\ No newline at end of file
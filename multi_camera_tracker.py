@@ -120,21 +120,19 @@
 import cv2
 import face_recognition
 import sqlite3
-import pickle
 from datetime import datetime
 import threading
 import queue
 import os
 
-# Load precomputed encodings
-ENCODINGS_FILE = "face_encodings.pkl"
-try:
-    with open(ENCODINGS_FILE, "rb") as f:
-        known_faces = pickle.load(f)
-    print("Loaded precomputed encodings.")
-except FileNotFoundError:
-    print(f"Error: {ENCODINGS_FILE} not found. Run train_faces.py first.")
+from face_engine import load_gallery
+
+# Load precomputed encodings (gallery file or legacy face_encodings.pkl)
+known_faces = load_gallery()
+if not known_faces:
+    print("Error: no known-face gallery found. Run train_faces.py first.")
     exit(1)
+print("Loaded precomputed encodings.")
 
 # Setup database and queue
 conn = sqlite3.connect("tracking.db", check_same_thread=False)
@@ -226,12 +224,10 @@ def process_camera(camera_index, floor):
             face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
 
             for i, (face_encoding, face_location) in enumerate(zip(face_encodings, face_locations)):
-                matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.5)
-                face_distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
+                match_name, _ = known_faces.identify([face_encoding], tolerance=0.5)[0]
                 name = "Unknown"
-                if matches and min(face_distances) < 0.5:
-                    first_match_index = matches.index(True)
-                    name = list(known_faces.keys())[first_match_index]
+                if match_name is not None:
+                    name = match_name
 
                 if name != "Unknown":
                     time_now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
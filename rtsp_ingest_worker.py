@@ -0,0 +1,386 @@
+"""
+RTSP Ingest Worker Process
+==========================
+
+Process-based camera ingest backend for demo_rtsp.py.
+
+Each worker process owns one RTSP capture, decodes frames and publishes them
+into a ring of `multiprocessing.shared_memory` slots, so decoding runs outside
+the Flask interpreter (and its GIL). The parent side (`ProcessRTSPStream` in
+demo_rtsp.py) reads the newest slot and drives decode-on-demand through a
+small shared control block.
+
+This module is deliberately lightweight (cv2 + numpy only) because it is
+imported again by every spawned worker process.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# Shared memory layout
+# ---------------------------------------------------------------------------
+# [ control block: float64 * (CTRL_FIELDS + 3 * slots) ][ slot 0 ][ slot 1 ]...
+# Per-slot metadata (frame_id, height, width) follows the control fields.
+
+CTRL_LAST_ID = 0         # id of the newest published frame
+CTRL_WRITE_IDX = 1       # slot holding the newest frame
+CTRL_CONNECTED = 2       # 1.0 while the capture is open and delivering packets
+CTRL_FRAME_COUNT = 3     # decoded frames
+CTRL_SKIPPED = 4         # grabbed but not decoded packets
+CTRL_FPS = 5             # grab rate
+CTRL_DECODE_FPS = 6      # decode rate
+CTRL_LAST_FRAME_TIME = 7 # time.time() of the last decode
+CTRL_DEMAND = 8          # set by the reader, cleared by the worker on decode
+CTRL_VIEWERS = 9         # number of continuous consumers (MJPEG viewers)
+CTRL_STOP = 10           # set by the reader to stop the worker
+CTRL_ERROR = 11          # 0 = ok, 1 = failed to open, 2 = disconnected
+CTRL_TARGET_FPS = 12     # decode rate set by the parent's frame-rate governor
+CTRL_CONNECT_ATTEMPTS = 13   # capture open attempts
+CTRL_CONNECT_FAILURES = 14   # failed open attempts
+CTRL_DISCONNECTS = 15        # connections dropped after too many grab failures
+CTRL_CONNECT_SECONDS = 16    # duration of the last successful open
+CTRL_ACTIVITY = 17           # motion activity score of the newest frame
+CTRL_MOTION_TIME = 18        # time.time() of the last frame with motion
+CTRL_CONNECT_SLOT = 19       # 1.0 while the worker holds a connect slot
+CTRL_FIELDS = 20
+
+ERROR_MESSAGES = {
+    0: None,
+    1: "Failed to open stream",
+    2: "Stream disconnected",
+}
+
+
+def backoff_delay(failures: int, base: float, max_delay: float, jitter: float) -> float:
+    """Jittered exponential reconnect delay after `failures` consecutive failures."""
+    delay = min(max_delay, base * 2 ** max(0, failures - 1))
+    return delay * random.uniform(1.0 - jitter, 1.0 + jitter)
+
+
+class DecodePacer:
+    """
+    Decides which grabbed packets get decoded to hold a target decode rate.
+
+    Deadlines advance on a fixed grid so the average rate stays on target,
+    with a quarter interval of slack so camera jitter does not halve it.
+    """
+
+    def __init__(self):
+        self._next_time = 0.0
+        self._last_time = 0.0
+
+    def _deadline(self, interval: float) -> float:
+        # A rate increase (e.g. a viewer attached) takes effect immediately;
+        # the extra quarter matches the early-decode slack in due()
+        return min(self._next_time, self._last_time + 1.25 * interval)
+
+    def due(self, target_fps: float, now: float) -> bool:
+        """True if a packet grabbed at `now` should be decoded."""
+        if target_fps <= 0:
+            return False
+        interval = 1.0 / target_fps
+        return now >= self._deadline(interval) - 0.25 * interval
+
+    def decoded(self, target_fps: float, now: float) -> None:
+        """Record a decode (paced or forced by a consumer)."""
+        self._last_time = now
+        if target_fps <= 0:
+            self._next_time = float("inf")
+            return
+        interval = 1.0 / target_fps
+        deadline = self._deadline(interval)
+        if now - deadline < interval:
+            self._next_time = deadline + interval
+        else:
+            self._next_time = now + interval  # fell behind: restart the grid
+
+
+class MotionDetector:
+    """
+    Cheap motion measure on a tiny grayscale thumbnail of every decoded frame.
+
+    The activity score is the fraction of thumbnail pixels that differ from a
+    running-average background by more than `pixel_threshold` gray levels.
+    """
+
+    def __init__(self, size: Tuple[int, int], pixel_threshold: float,
+                 activity_threshold: float, background_rate: float):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.activity_threshold = activity_threshold
+        self.background_rate = background_rate
+        self.activity = 0.0
+        self.last_motion_time = 0.0
+        self._background: Optional[np.ndarray] = None
+
+    def update(self, frame: np.ndarray, now: float) -> float:
+        """Score a new frame against the background and fold it in."""
+        thumb = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        if self._background is None or self._background.shape != gray.shape:
+            # First frame (or new resolution): treat as motion so detection runs once
+            self._background = gray.astype(np.float32)
+            self.activity = 1.0
+        else:
+            diff = cv2.absdiff(gray.astype(np.float32), self._background)
+            self.activity = float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+            cv2.accumulateWeighted(gray, self._background, self.background_rate)
+        if self.activity >= self.activity_threshold:
+            self.last_motion_time = now
+        return self.activity
+
+
+class SharedFrameRing:
+    """
+    Ring of frame slots in a shared memory block.
+
+    The worker writes with the same `next_slot()` / `publish()` calls as the
+    in-process FrameRing; the reader uses `copy_latest()`.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int,
+                 max_height: int, max_width: int):
+        self.shm = shm
+        self.slots = slots
+        self.max_height = max_height
+        self.max_width = max_width
+        self.slot_bytes = max_height * max_width * 3
+
+        header_len = CTRL_FIELDS + 3 * slots
+        self.ctrl = np.ndarray((header_len,), dtype=np.float64, buffer=shm.buf)
+        self._data_offset = header_len * 8
+
+    @staticmethod
+    def required_size(slots: int, max_height: int, max_width: int) -> int:
+        """Bytes needed for a ring with the given geometry."""
+        return (CTRL_FIELDS + 3 * slots) * 8 + slots * max_height * max_width * 3
+
+    def _meta(self, idx: int) -> int:
+        return CTRL_FIELDS + 3 * idx
+
+    def slot_view(self, idx: int, height: int, width: int) -> np.ndarray:
+        """Writable (height, width, 3) view of a slot."""
+        return np.ndarray((height, width, 3), dtype=np.uint8, buffer=self.shm.buf,
+                          offset=self._data_offset + idx * self.slot_bytes)
+
+    # -- writer side --------------------------------------------------------
+
+    def next_slot(self, height: int, width: int) -> Optional[np.ndarray]:
+        """Invalidate and return the next slot for a frame of the given size."""
+        idx = (int(self.ctrl[CTRL_WRITE_IDX]) + 1) % self.slots
+        self.ctrl[self._meta(idx)] = 0  # readers must not trust this slot now
+        if height <= 0 or height > self.max_height or width > self.max_width:
+            return None
+        return self.slot_view(idx, height, width)
+
+    def publish(self, frame: np.ndarray) -> int:
+        """Publish the frame written into the next slot (copying it if needed)."""
+        idx = (int(self.ctrl[CTRL_WRITE_IDX]) + 1) % self.slots
+        h, w = frame.shape[:2]
+        if h > self.max_height or w > self.max_width:
+            scale = min(self.max_height / h, self.max_width / w)
+            h, w = int(h * scale), int(w * scale)
+            cv2.resize(frame, (w, h), dst=self.slot_view(idx, h, w),
+                       interpolation=cv2.INTER_AREA)
+        else:
+            slot = self.slot_view(idx, h, w)
+            if not np.shares_memory(slot, frame):
+                np.copyto(slot, frame)
+
+        frame_id = self.ctrl[CTRL_LAST_ID] + 1
+        meta = self._meta(idx)
+        self.ctrl[meta + 1] = h
+        self.ctrl[meta + 2] = w
+        self.ctrl[meta] = frame_id
+        self.ctrl[CTRL_WRITE_IDX] = idx
+        self.ctrl[CTRL_LAST_ID] = frame_id
+        return int(frame_id)
+
+    # -- reader side --------------------------------------------------------
+
+    @property
+    def last_id(self) -> int:
+        return int(self.ctrl[CTRL_LAST_ID])
+
+    def copy_latest(self, out: Optional[np.ndarray] = None) -> Tuple[Optional[np.ndarray], int]:
+        """Copy the newest frame out of shared memory.
+
+        Uses the slot's frame id as a sequence lock: if the worker started
+        rewriting the slot during the copy the read is retried.
+        """
+        for _ in range(3):
+            idx = int(self.ctrl[CTRL_WRITE_IDX])
+            meta = self._meta(idx)
+            frame_id = int(self.ctrl[meta])
+            if frame_id == 0:
+                return None, 0
+            h, w = int(self.ctrl[meta + 1]), int(self.ctrl[meta + 2])
+            if out is None or out.shape != (h, w, 3):
+                out = np.empty((h, w, 3), dtype=np.uint8)
+            np.copyto(out, self.slot_view(idx, h, w))
+            if int(self.ctrl[meta]) == frame_id:
+                return out, frame_id
+        return None, 0
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+def _open_capture(url: str, settings: dict) -> Optional[cv2.VideoCapture]:
+    """Open an RTSP capture the same way RTSPStream._connect does."""
+    params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(settings["open_timeout"] * 1000)]
+    cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG, params)
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(url, cv2.CAP_ANY, params)
+    if not cap.isOpened():
+        return None
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, settings["buffer_size"])
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings["frame_width"])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings["frame_height"])
+    cap.set(cv2.CAP_PROP_FPS, settings["target_fps"])
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'H264'))
+    return cap
+
+
+def run_ingest_worker(camera_index: int, url: str, shm_name: str, slots: int,
+                      max_height: int, max_width: int, settings: dict,
+                      connect_slots=None) -> None:
+    """Entry point of an ingest worker process (grab, decode, publish).
+
+    connect_slots is an optional multiprocessing semaphore shared by all
+    workers that caps concurrent capture opens.
+    """
+    import multiprocessing
+
+    os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = settings["ffmpeg_options"]
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = SharedFrameRing(shm, slots, max_height, max_width)
+    ctrl = ring.ctrl
+    parent = multiprocessing.parent_process()
+
+    cap: Optional[cv2.VideoCapture] = None
+    slot = frame = None
+    consecutive_failures = 0
+    connect_failures = 0
+    frame_shape = (0, 0)
+    fps_frames = fps_decoded = 0
+    fps_start = time.time()
+    pacer = DecodePacer()
+    motion = MotionDetector(**settings["motion"])
+
+    def sleep_unless_stopped(seconds: float) -> None:
+        end_time = time.time() + seconds
+        while time.time() < end_time and not ctrl[CTRL_STOP]:
+            time.sleep(0.1)
+
+    def retry_delay() -> float:
+        return backoff_delay(connect_failures, settings["reconnect_delay"],
+                             settings["reconnect_max_delay"], settings["reconnect_jitter"])
+
+    def open_capture() -> Optional[cv2.VideoCapture]:
+        if connect_slots is not None:
+            while not connect_slots.acquire(timeout=0.5):
+                if ctrl[CTRL_STOP]:
+                    return None
+            ctrl[CTRL_CONNECT_SLOT] = 1  # lets the parent release it if it has to kill us
+        try:
+            ctrl[CTRL_CONNECT_ATTEMPTS] += 1
+            start = time.time()
+            capture = _open_capture(url, settings)
+            if capture is not None:
+                ctrl[CTRL_CONNECT_SECONDS] = time.time() - start
+            return capture
+        finally:
+            if connect_slots is not None:
+                ctrl[CTRL_CONNECT_SLOT] = 0
+                connect_slots.release()
+
+    print(f"[INGEST-{camera_index}] Worker process {os.getpid()} started")
+    try:
+        while not ctrl[CTRL_STOP] and (parent is None or parent.is_alive()):
+            if cap is None:
+                cap = open_capture()
+                if cap is None:
+                    if ctrl[CTRL_STOP]:
+                        break
+                    connect_failures += 1
+                    ctrl[CTRL_CONNECT_FAILURES] += 1
+                    ctrl[CTRL_CONNECTED] = 0
+                    ctrl[CTRL_ERROR] = 1
+                    sleep_unless_stopped(retry_delay())
+                    continue
+                connect_failures = 0
+                print(f"[INGEST-{camera_index}] Connected to {url}")
+
+            if not cap.grab():
+                consecutive_failures += 1
+                if consecutive_failures >= 10:
+                    print(f"[INGEST-{camera_index}] Too many failures, reconnecting...")
+                    ctrl[CTRL_CONNECTED] = 0
+                    ctrl[CTRL_ERROR] = 2
+                    ctrl[CTRL_DISCONNECTS] += 1
+                    cap.release()
+                    cap = None
+                    consecutive_failures = 0
+                    sleep_unless_stopped(retry_delay())
+                continue
+            consecutive_failures = 0
+            ctrl[CTRL_CONNECTED] = 1
+            ctrl[CTRL_ERROR] = 0
+
+            now = time.time()
+            target_fps = float(ctrl[CTRL_TARGET_FPS])
+            if target_fps > 0:
+                paced = pacer.due(target_fps, now)
+            else:
+                paced = ctrl[CTRL_VIEWERS] > 0  # no governor: decode for viewers only
+            decode = (not settings["decode_on_demand"] or paced
+                      or ctrl[CTRL_DEMAND] or ring.last_id == 0)
+            fps_frames += 1
+            if decode:
+                ctrl[CTRL_DEMAND] = 0
+                pacer.decoded(target_fps, now)
+                slot = ring.next_slot(*frame_shape)
+                if slot is not None:
+                    ret, frame = cap.retrieve(slot)
+                else:
+                    ret, frame = cap.retrieve()
+                if ret and frame is not None:
+                    frame_shape = frame.shape[:2]
+                    ring.publish(frame)
+                    ctrl[CTRL_ACTIVITY] = motion.update(frame, now)
+                    ctrl[CTRL_MOTION_TIME] = motion.last_motion_time
+                    ctrl[CTRL_FRAME_COUNT] += 1
+                    ctrl[CTRL_LAST_FRAME_TIME] = time.time()
+                    fps_decoded += 1
+            else:
+                ctrl[CTRL_SKIPPED] += 1
+
+            elapsed = time.time() - fps_start
+            if elapsed >= 1.0:
+                ctrl[CTRL_FPS] = fps_frames / elapsed
+                ctrl[CTRL_DECODE_FPS] = fps_decoded / elapsed
+                fps_frames = fps_decoded = 0
+                fps_start = time.time()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cap is not None:
+            cap.release()
+        ctrl[CTRL_CONNECTED] = 0
+        # Drop every view into the block before closing it
+        slot = frame = None
+        del ctrl, ring
+        shm.close()
+        print(f"[INGEST-{camera_index}] Worker process stopped")
@@ -9,14 +9,16 @@ import pickle
 import config
 import numpy as np
 
+from face_engine import FaceGallery
+
 def load_known_faces():
     """Loads face encodings from the pickle file."""
     try:
         with open(config.ENCODINGS_FILE, "rb") as f:
-            return pickle.load(f)
+            return FaceGallery.from_dict(pickle.load(f))
     except FileNotFoundError:
         print(f"[ERROR] Encodings file not found: {config.ENCODINGS_FILE}")
-        return {}
+        return FaceGallery.from_dict({})
 
 def main():
     print("=== Face Recognition with Bounding Boxes Test ===")
@@ -58,18 +60,13 @@ def main():
                 bottom *= 2
                 left *= 2
                 
-                # See if the face is a match for the known face(s)
-                matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.6)
+                # Use the known person closest to the new face
+                match_name, distance = known_faces.identify([face_encoding], tolerance=0.6)[0]
                 name = "Unknown"
                 confidence = 0.0
-                
-                # Use the known face with the smallest distance to the new face
-                face_distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
-                if len(face_distances) > 0:
-                    best_match_index = np.argmin(face_distances)
-                    if matches[best_match_index]:
-                        name = list(known_faces.keys())[best_match_index]
-                        confidence = 1.0 - face_distances[best_match_index]
+                if match_name is not None:
+                    name = match_name
+                    confidence = 1.0 - distance
                 
                 # Choose color based on recognition
                 if name != "Unknown":
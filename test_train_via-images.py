@@ -32,8 +32,8 @@ def identify_faces(image_path, known_faces):
         # Compare with known faces
         matches = []
         for name, known_encoding in known_faces.items():
-            # Calculate distance between test encoding and known encoding
-            distance = face_recognition.face_distance([known_encoding], test_encoding)[0]
+            # Distance to the closest of the person's known encodings
+            distance = face_recognition.face_distance(np.atleast_2d(known_encoding), test_encoding).min()
             # Threshold for a match (0.6 is a common default, adjust as needed)
             if distance < 0.6:
                 matches.append((name, distance))
@@ -1,40 +1,35 @@
-import face_recognition
-import os
-import pickle
+from config import FACE_EMBEDDING_CACHE, FACE_ENCODINGS_PER_PERSON, FACE_TRAINING_WORKERS, GALLERY_FILE
+from face_engine import FaceGallery, IncrementalTrainer, save_gallery
 
 # Function to compute encodings from subfolders
 def compute_encodings(image_folder):
-    encodings_dict = {}
-    for person_folder in os.listdir(image_folder):
-        person_path = os.path.join(image_folder, person_folder)
-        if os.path.isdir(person_path):  # Ensure it's a directory
-            for filename in os.listdir(person_path):
-                image_path = os.path.join(person_path, filename)
-                image = face_recognition.load_image_file(image_path)
-                encodings = face_recognition.face_encodings(image)
-                if encodings:
-                    name = person_folder  # Use folder name as identity
-                    if name not in encodings_dict:
-                        encodings_dict[name] = []
-                    encodings_dict[name].append(encodings[0])
-                    print(f"Trained face for {name} from {filename}")
-                else:
-                    print(f"No face detected in {filename} for {name}, skipping.")
-    # Average encodings for each person (optional, for better accuracy)
-    for name in encodings_dict:
-        if len(encodings_dict[name]) > 1:
-            encodings_dict[name] = sum(encodings_dict[name]) / len(encodings_dict[name])
-            print(f"Averaged {len(encodings_dict[name])} encodings for {name}")
-        else:
-            encodings_dict[name] = encodings_dict[name][0]
-    return encodings_dict
+    # Keep one encoding per photo as a (k, 128) array, so matching can use each
+    # photo's pose and lighting; optionally reduce to a few k-means centroids.
+    # Photos already in the embedding cache (same content) are not re-encoded,
+    # new ones are encoded by FACE_TRAINING_WORKERS processes.
+    trainer = IncrementalTrainer(image_folder, FACE_EMBEDDING_CACHE, FACE_ENCODINGS_PER_PERSON,
+                                 workers=FACE_TRAINING_WORKERS)
+
+    def on_photo(name, filename, status, error):
+        if status == "encoded":
+            print(f"Trained face for {name} from {filename}")
+        elif status == "no_face":
+            print(f"No face detected in {filename} for {name}, skipping.")
+        elif status == "error":
+            print(f"Could not encode {filename} for {name}: {error}")
+
+    result = trainer.train(on_photo)
+    for name, rows in result.encodings.items():
+        print(f"Kept {len(rows)} encodings for {name}")
+    print(f"{result.encoded} photos encoded, {result.cached} from cache, "
+          f"{result.removed} deleted photos dropped")
+    return result.encodings
 
 # Settings
 IMAGE_FOLDER = "known_faces"
-ENCODINGS_FILE = "face_encodings.pkl"
 
 # Compute and save encodings
-known_faces = compute_encodings(IMAGE_FOLDER)
-with open(ENCODINGS_FILE, "wb") as f:
-    pickle.dump(known_faces, f)
-print(f"Saved encodings to {ENCODINGS_FILE}")
\ No newline at end of file
+if __name__ == "__main__":
+    known_faces = compute_encodings(IMAGE_FOLDER)
+    save_gallery(GALLERY_FILE, FaceGallery.from_dict(known_faces))
+    print(f"Saved encodings to {GALLERY_FILE}")
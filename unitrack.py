@@ -3,7 +3,6 @@ import base64
 import io
 import sys
 import os
-import pickle
 import cv2
 import numpy as np
 import yaml
@@ -18,9 +17,20 @@ except Exception:
 import sqlite3
 from datetime import datetime
 
+from config import FACE_DETECTION_MODEL
+from face_engine import GalleryManager, create_face_detector
+
 # Create Flask app
 app = Flask(__name__)
 
+# helper to get the configured face detector backend
+_face_detector = None
+def get_face_detector():
+    global _face_detector
+    if _face_detector is None:
+        _face_detector = create_face_detector(FACE_DETECTION_MODEL)
+    return _face_detector
+
 # helper to get face cascade
 _face_cascade = None
 def get_face_cascade():
@@ -51,25 +61,6 @@ def load_config():
 
 config = load_config()
 
-# Load known face encodings
-def load_known_faces():
-    enc_file = config['encodings_file']
-    if not os.path.exists(enc_file):
-        print(f'[unitrack] Warning: Encodings file not found: {enc_file}')
-        return {}
-    
-    try:
-        with open(enc_file, 'rb') as f:
-            data = pickle.load(f)
-        print(f'[unitrack] Loaded {len(data)} known face encodings')
-        print(f'[unitrack] Known names: {", ".join(data.keys())}')
-        return data
-    except Exception as e:
-        print(f'[unitrack] Error loading encodings: {e}')
-        return {}
-
-known_faces = load_known_faces()
-
 # Initialize OpenCV face cascade as fallback
 cascade_path = os.path.join(cv2.data.haarcascades, 'haarcascade_frontalface_default.xml')
 face_cascade = cv2.CascadeClassifier(cascade_path) if os.path.exists(cascade_path) else None
@@ -81,37 +72,24 @@ except Exception:
     _HAS_PIL = False
 
 
-# Load known face encodings (from config.yaml if present, else fallback to face_encodings.pkl)
-def load_known_encodings():
-    enc_file = 'face_encodings.pkl'
-    # try config.yaml
+# Known-face gallery file (encodings_file from config.yaml if present, else
+# config.GALLERY_FILE / the legacy face_encodings.pkl)
+def known_encodings_file():
     try:
         if os.path.exists('config.yaml'):
             with open('config.yaml', 'r') as f:
                 cfg = yaml.safe_load(f)
             if cfg and isinstance(cfg, dict) and cfg.get('encodings_file'):
-                enc_file = cfg.get('encodings_file')
+                return cfg.get('encodings_file')
     except Exception:
         pass
-
-    if not os.path.exists(enc_file):
-        print(f"[unitrack] Encodings file not found: {enc_file}. No known faces loaded.")
-        return {}
-
-    try:
-        with open(enc_file, 'rb') as f:
-            data = pickle.load(f)
-        # ensure values are numpy arrays
-        cleaned = {k: np.array(v) for k, v in data.items()}
-        print(f"[unitrack] Loaded {len(cleaned)} known face encodings from {enc_file}")
-        return cleaned
-    except Exception as e:
-        print(f"[unitrack] Failed to load encodings file {enc_file}: {e}", file=sys.stderr)
-        return {}
+    return None
 
 
-# Load at import time; this can be reloaded later if desired
-known_faces = load_known_encodings()
+# Versioned gallery snapshot: loaded on first use, reloaded off-thread when the
+# file changes or /reload_encodings is called
+gallery_manager = GalleryManager(known_encodings_file())
+gallery_manager.watch()
 
 
 @app.route('/')
@@ -159,31 +137,26 @@ def detect():
             # Convert BGR to RGB for face_recognition
             rgb = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
             
-            # Detect faces
-            face_locations = face_recognition.face_locations(rgb, model='hog')
+            # Detect faces with the configured backend (config.FACE_DETECTION_MODEL)
+            face_locations = get_face_detector().detect(cv_img)
             if not face_locations:
                 print('[unitrack] No faces found')
                 return jsonify({'success': True, 'detections': []})
 
             face_encodings = face_recognition.face_encodings(rgb, face_locations)
+            # match all faces against the gallery in one pass
+            gallery = gallery_manager.gallery
+            matches = gallery.identify(face_encodings, tolerance=0.6)
 
-            for face_encoding, location in zip(face_encodings, face_locations):
+            for (match_name, min_dist), location in zip(matches, face_locations):
                 name = 'Unknown'
                 confidence = 0.0
 
-                if len(known_faces) > 0:
-                    encodings_list = list(known_faces.values())
-                    names_list = list(known_faces.keys())
-                    distances = face_recognition.face_distance(encodings_list, face_encoding)
+                if len(gallery) > 0:
                     # lower distance = more similar. Convert to confidence [0,1]
-                    best_idx = int(np.argmin(distances))
-                    min_dist = float(distances[best_idx])
-                    # simple confidence transform
                     confidence = max(0.0, min(1.0, 1.0 - min_dist))
-                    matches = face_recognition.compare_faces(encodings_list, face_encoding, tolerance=0.6)
-                    if True in matches:
-                        match_idx = matches.index(True)
-                        name = names_list[match_idx]
+                    if match_name is not None:
+                        name = match_name
                 
                 # Convert face_recognition bbox (top,right,bottom,left) to OpenCV style (x,y,w,h)
                 top, right, bottom, left = location
@@ -242,9 +215,10 @@ def detect():
 
 @app.route('/reload_encodings', methods=['POST'])
 def reload_encodings():
-    global known_faces
-    known_faces = load_known_encodings()
-    return jsonify({'success': True, 'loaded': len(known_faces)})
+    gallery_manager.reload('api', wait=True)
+    stats = gallery_manager.stats()
+    return jsonify({'success': True, 'loaded': stats['encodings'], 'version': stats['version'],
+                    'reload_ms': stats['reload_ms']['last']})
 
 
 if __name__ == '__main__':
@@ -7,6 +7,8 @@ import yaml
 import time
 from datetime import datetime
 
+from face_engine import FaceGallery
+
 # Load config
 def load_config():
     with open("config.yaml", "r") as f:
@@ -25,7 +27,7 @@ def load_encodings():
         with open(ENCODINGS_FILE, "rb") as f:
             data = pickle.load(f)
         print(f"Loaded {len(data)} known face encodings.")
-        return data
+        return FaceGallery.from_dict(data)
     except FileNotFoundError:
         print("Error: Encodings file not found.")
         exit(1)
@@ -90,13 +92,10 @@ def test_webcam_recognition():
             
             # Compare with known faces
             if len(known_faces) > 0:
-                distances = face_recognition.face_distance(list(known_faces.values()), face_encoding)
-                min_distance = min(distances) if len(distances) > 0 else 1.0
-                matches = face_recognition.compare_faces(list(known_faces.values()), face_encoding, tolerance=0.6)
+                match_name, min_distance = known_faces.identify([face_encoding], tolerance=0.6)[0]
                 name = "Unknown"
-                if True in matches:
-                    index = matches.index(True)
-                    name = list(known_faces.keys())[index]
+                if match_name is not None:
+                    name = match_name
                     confidence = 1.0 - min_distance
                     
                     # Display name and confidence
@@ -8,7 +8,6 @@ Usage:
 """
 import os
 import time
-import pickle
 import argparse
 from datetime import datetime
 
@@ -17,6 +16,8 @@ import numpy as np
 import sqlite3
 from concurrent.futures import ThreadPoolExecutor
 
+from face_engine import load_gallery
+
 # Optional torch to check GPU availability
 _HAS_TORCH = False
 try:
@@ -32,14 +33,12 @@ try:
 except Exception:
     face_recognition = None
 
-def load_encodings(enc_file='face_encodings.pkl'):
-    if not os.path.exists(enc_file):
-        print(f'Encodings file not found: {enc_file}')
-        return {}
-    with open(enc_file, 'rb') as f:
-        data = pickle.load(f)
-    # ensure numpy arrays
-    return {k: np.array(v) for k, v in data.items()}
+def load_encodings(enc_file=None):
+    # gallery file or legacy pickle; defaults to config.GALLERY_FILE / face_encodings.pkl
+    gallery = load_gallery(enc_file)
+    if not gallery:
+        print('No known faces loaded')
+    return gallery
 
 executor = ThreadPoolExecutor(max_workers=2)
 
@@ -68,9 +67,7 @@ def save_and_log(image, name, evidence_dir, db_path):
 
 
 def main(camera_index=0, tolerance=0.6, save_evidence=True, scale=0.5, process_every=2, model='hog'):
-    encodings = load_encodings()
-    names = list(encodings.keys())
-    encs = list(encodings.values())
+    gallery = load_encodings()
 
     cap = cv2.VideoCapture(camera_index)
     if not cap.isOpened():
@@ -217,6 +214,9 @@ def main(camera_index=0, tolerance=0.6, save_evidence=True, scale=0.5, process_e
                 boxes.append((y_orig, x_orig + w_orig, y_orig + h_orig, x_orig))
             face_encs = []
 
+        # Match all encoded faces against the gallery in one pass
+        face_matches = gallery.identify(face_encs, tolerance) if _HAS_FR and len(gallery) > 0 else []
+
         # On detection frames, match detections to existing trackers or create new ones
         for idx, box in enumerate(boxes):
             top, right, bottom, left = box
@@ -224,16 +224,11 @@ def main(camera_index=0, tolerance=0.6, save_evidence=True, scale=0.5, process_e
             name = 'Unknown'
             confidence = 0.0
 
-            if _HAS_FR and len(encs) > 0 and idx < len(face_encs):
-                enc = face_encs[idx]
-                distances = face_recognition.face_distance(encs, enc)
-                best_idx = int(np.argmin(distances))
-                min_dist = float(distances[best_idx])
+            if idx < len(face_matches):
+                match_name, min_dist = face_matches[idx]
                 confidence = max(0.0, min(1.0, 1.0 - min_dist))
-                matches = face_recognition.compare_faces(encs, enc, tolerance=tolerance)
-                if True in matches:
-                    match_idx = matches.index(True)
-                    name = names[match_idx]
+                if match_name is not None:
+                    name = match_name
 
             # Try to find matching existing tracker by IoU
             matched_id = None